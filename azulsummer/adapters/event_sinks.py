@@ -0,0 +1,262 @@
+"""Sinks that consume the events of played games
+
+A GameHandler hands each event to the sinks registered for its type.  Which
+sinks receive which event types is resolved once, by resolve_event_handlers(),
+when the sinks are registered, so dispatching an event is a dict lookup.
+"""
+from __future__ import annotations
+
+import abc
+import json
+import logging
+import queue
+import threading
+from pathlib import Path
+from typing import Callable
+from typing import Iterable
+from typing import Optional
+from typing import Type
+from typing import Union
+
+from azulsummer.models.events import Event
+from azulsummer.models.events import event_types
+
+logger = logging.getLogger(__name__)
+
+EventHandler = Callable[[Event], None]
+
+
+class AbstractEventSink(abc.ABC):
+    """Base sink for the events of played games"""
+
+    def __init__(self, events: Optional[Iterable[Type[Event]]] = None) -> None:
+        """Initialize the sink.
+
+        Args:
+            events:  The event types the sink receives.  None receives every
+                event type.
+        """
+        self.events: Optional[frozenset[Type[Event]]] = (
+            None if events is None else frozenset(events)
+        )
+
+    def __enter__(self) -> AbstractEventSink:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def accepts(self, event_type: Type[Event]) -> bool:
+        """Check if the sink receives events of event_type"""
+        return self.events is None or event_type in self.events
+
+    def handle(self, event: Event) -> None:
+        """Consume an event"""
+        self._handle(event)
+
+    def close(self) -> None:
+        """Flush and release anything held by the sink"""
+        self._close()
+
+    @abc.abstractmethod
+    def _handle(self, event: Event) -> None:
+        raise NotImplementedError
+
+    def _close(self) -> None:
+        pass
+
+
+class NullSink(AbstractEventSink):
+    """Sink that discards every event.
+
+    A GameHandler whose only sinks are NullSinks has no event handlers, so its
+    game skips creating events altogether.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(events=())
+
+    def _handle(self, event: Event) -> None:
+        pass
+
+
+class ListSink(AbstractEventSink):
+    """Sink that keeps every event it receives in a list"""
+
+    def __init__(self, events: Optional[Iterable[Type[Event]]] = None) -> None:
+        super().__init__(events)
+        self.received: list[Event] = []
+
+    def _handle(self, event: Event) -> None:
+        self.received.append(event)
+
+
+class SamplingSink(AbstractEventSink):
+    """Sink that passes every nth event to another sink"""
+
+    def __init__(
+        self,
+        sink: AbstractEventSink,
+        n: int,
+        events: Optional[Iterable[Type[Event]]] = None,
+    ) -> None:
+        """Initialize the sink.
+
+        Args:
+            sink:  The sink receiving the sampled events
+            n:  Pass 1 in n events, starting with the first
+            events:  The event types counted for sampling.  None counts every
+                event type.
+        """
+        if n < 1:
+            raise ValueError(f"Cannot sample 1 in {n} events.")
+        super().__init__(events)
+        self.sink = sink
+        self.n = n
+        self.seen = 0
+
+    def _handle(self, event: Event) -> None:
+        if self.seen % self.n == 0:
+            self.sink.handle(event)
+        self.seen += 1
+
+    def _close(self) -> None:
+        self.sink.close()
+
+
+class JsonLinesSink(AbstractEventSink):
+    """Sink that writes each event to a file as a line of JSON.
+
+    Lines are buffered and written batch_size at a time, and the file is only
+    opened while writing a batch.  See Event.to_dict() for the JSON fields.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        batch_size: int = 1024,
+        events: Optional[Iterable[Type[Event]]] = None,
+    ) -> None:
+        """Initialize the sink.
+
+        Args:
+            path:  The file the events are appended to
+            batch_size:  The number of events buffered before they are written
+            events:  The event types written.  None writes every event type.
+        """
+        super().__init__(events)
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.buffer: list[str] = []
+
+    def _handle(self, event: Event) -> None:
+        self.buffer.append(json.dumps(event.to_dict()))
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered events to the file"""
+        if not self.buffer:
+            return
+        with self.path.open("a") as file:
+            file.write("\n".join(self.buffer))
+            file.write("\n")
+        self.buffer.clear()
+
+    def _close(self) -> None:
+        self.flush()
+
+
+class ThreadedSink(AbstractEventSink):
+    """Sink that hands events to another sink on a background thread.
+
+    Events are passed through a queue of at most maxsize events.  When the
+    queue is full a blocking sink waits for the consumer to catch up, which
+    applies backpressure to the game.  A non-blocking sink drops the event
+    and counts it in dropped, so a slow consumer never holds up the game.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        sink: AbstractEventSink,
+        maxsize: int = 4096,
+        block: bool = False,
+        events: Optional[Iterable[Type[Event]]] = None,
+    ) -> None:
+        """Initialize the sink and start its thread.
+
+        Args:
+            sink:  The sink consuming the events on the background thread
+            maxsize:  The most events waiting for the consumer
+            block:  Wait for space when the queue is full instead of dropping
+                the event
+            events:  The event types passed to the thread.  None passes every
+                event type.
+        """
+        super().__init__(events)
+        self.sink = sink
+        self.block = block
+        self.dropped = 0
+        self.queue: queue.Queue = queue.Queue(maxsize)
+        self.thread = threading.Thread(target=self._consume, daemon=True)
+        self.thread.start()
+
+    def _handle(self, event: Event) -> None:
+        if self.block:
+            self.queue.put(event)
+            return
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def _consume(self) -> None:
+        while True:
+            event = self.queue.get()
+            if event is self._STOP:
+                return
+            try:
+                self.sink.handle(event)
+            except Exception:
+                logger.exception("Exception in event sink %s", self.sink)
+
+    def _close(self) -> None:
+        """Wait for the queued events to be consumed and close the sink"""
+        if self.thread.is_alive():
+            self.queue.put(self._STOP)
+            self.thread.join()
+        self.sink.close()
+
+
+def _fan_out(handlers: tuple[EventHandler, ...]) -> EventHandler:
+    def handle(event: Event) -> None:
+        for handler in handlers:
+            handler(event)
+
+    return handle
+
+
+def resolve_event_handlers(
+    sinks: Iterable[AbstractEventSink],
+) -> dict[Type[Event], EventHandler]:
+    """Map each event type to a handler calling the sinks that accept it.
+
+    Event types no sink accepts are left out of the mapping.
+
+    Args:
+        sinks:  The sinks to register
+
+    Returns:
+        Dict of {event type: handler}
+    """
+    sinks = list(sinks)
+    handlers = {}
+    for event_type in event_types():
+        accepted = tuple(sink.handle for sink in sinks if sink.accepts(event_type))
+        if len(accepted) == 1:
+            handlers[event_type] = accepted[0]
+        elif accepted:
+            handlers[event_type] = _fan_out(accepted)
+    return handlers
@@ -0,0 +1,4 @@
+"""Benchmarks for the Azul Summer Pavilion engine.
+
+Each module can be run on its own, e.g. python -m azulsummer.benchmarks.board
+"""
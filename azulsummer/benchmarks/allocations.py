@@ -0,0 +1,99 @@
+"""Benchmark of the memory taken by the actions and events of a game.
+
+Plays sample.py style games, with 4 ActionOnePlayers, keeping every action
+dispatched and every event emitted alive.  tracemalloc measures the bytes
+freed by dropping the messages once the game is over, which are the bytes
+held only by the messages, with message reuse turned off and on.  Without
+reuse every message is a separate object, so this is the bytes allocated for
+the game's messages.
+
+    python -m azulsummer.benchmarks.allocations [--games N] [--players P] [--seed S]
+"""
+from __future__ import annotations
+
+import argparse
+import tracemalloc
+
+from azulsummer.adapters.event_sinks import ListSink
+from azulsummer.models.game import Game
+from azulsummer.models.game_handler import GameHandler
+from azulsummer.models.random import game_seeds
+from azulsummer.players.actiononeplayer import ActionOnePlayer
+
+
+def _recording(handler, dispatched: list):
+    def record(action):
+        dispatched.append(action)
+        handler(action)
+
+    return record
+
+
+def play_recorded(seed, n_players: int, reuses_messages: bool) -> tuple[Game, list]:
+    """Play a game keeping a reference to every action and event"""
+    game = Game.new([ActionOnePlayer() for _ in range(n_players)], seed)
+    game.reuses_messages = reuses_messages
+    sink = ListSink()
+    handler = GameHandler(game, sinks=[sink])
+    dispatched = []
+    handler.action_handlers = {
+        action_type: _recording(action_handler, dispatched)
+        for action_type, action_handler in handler.action_handlers.items()
+    }
+    handler.play()
+    return game, dispatched + sink.received
+
+
+def measure(seeds: list, n_players: int, reuses_messages: bool) -> tuple[float, float]:
+    """Trace the messages of the games played from seeds.
+
+    Returns:
+        The mean bytes held by the messages and the mean messages per game
+    """
+    total_bytes, total_messages = 0, 0
+    tracemalloc.start()
+    for seed in seeds:
+        game, messages = play_recorded(seed, n_players, reuses_messages)
+        total_messages += len(messages)
+        held = tracemalloc.get_traced_memory()[0]
+        messages.clear()
+        del game.action_history[:]
+        game._messages.clear()
+        total_bytes += held - tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return total_bytes / len(seeds), total_messages / len(seeds)
+
+
+def benchmark(n_games: int = 20, n_players: int = 4, seed: int = 0) -> dict:
+    """Measure the bytes per game without and with message reuse.
+
+    Returns:
+        Dict of {mode: (bytes per game, messages per game)}
+    """
+    seeds = game_seeds(seed, n_games)
+    # Warm up the caches filled while playing the first games
+    measure(seeds, n_players, reuses_messages=False)
+    return {
+        "no reuse": measure(seeds, n_players, reuses_messages=False),
+        "reuse": measure(seeds, n_players, reuses_messages=True),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    results = benchmark(args.games, args.players, args.seed)
+    baseline = results["no reuse"][0]
+    for name, (n_bytes, n_messages) in results.items():
+        print(
+            f"{name:>8}: {n_bytes:>12,.0f} bytes/game  "
+            f"{n_messages:>8,.0f} messages/game  ({n_bytes / baseline:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
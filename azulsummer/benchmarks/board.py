@@ -0,0 +1,77 @@
+"""Micro-benchmark comparing the array and bitboard Board backends.
+
+Each run places tiles on fresh boards in seeded random orders until every
+space is covered, checking each space is open before placing it.
+
+    python -m azulsummer.benchmarks.board [--boards N] [--seed S]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from azulsummer.models.board import BOARD_BACKENDS
+from azulsummer.models.enums import BoardBackend
+from azulsummer.models.enums import StarColor
+
+
+def random_placement_sequences(n_boards: int, seed: int) -> list[list[tuple]]:
+    """Generate a random order of all 42 (star, tile_value) spaces per board"""
+    rng = np.random.default_rng(seed)
+    n_cells = len(StarColor) * 6
+    return [
+        [(StarColor(cell // 6), cell % 6 + 1) for cell in rng.permutation(n_cells)]
+        for _ in range(n_boards)
+    ]
+
+
+def run_placements(backend: BoardBackend, sequences: list[list[tuple]]) -> int:
+    """Play every sequence on a new board and return the total score"""
+    board_class = BOARD_BACKENDS[backend]
+    total = 0
+    for sequence in sequences:
+        board = board_class.new()
+        for star, tile_value in sequence:
+            if board.is_placement_location_open(star, tile_value):
+                total += board.place_tile(star, tile_value)
+    return total
+
+
+def benchmark(n_boards: int = 2000, seed: int = 0) -> dict[BoardBackend, float]:
+    """Time each backend on the same placement sequences.
+
+    Returns:
+        Dict of {BoardBackend: placements per second}
+    """
+    sequences = random_placement_sequences(n_boards, seed)
+    n_placements = sum(len(sequence) for sequence in sequences)
+    results = {}
+    scores = set()
+    for backend in BoardBackend:
+        start = time.perf_counter()
+        scores.add(run_placements(backend, sequences))
+        results[backend] = n_placements / (time.perf_counter() - start)
+    if len(scores) != 1:
+        raise AssertionError(f"Backends scored differently: {scores}")
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--boards", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    results = benchmark(args.boards, args.seed)
+    baseline = results[BoardBackend.array]
+    for backend, rate in results.items():
+        print(
+            f"{backend.value:>9}: {rate:>12,.0f} placements/sec"
+            f"  ({rate / baseline:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Benchmark of copying game states for search players.
+
+Plays a sample.py style game for each player count and times copying its
+final state with State.clone() and the whole game with Game.fork().
+
+    python -m azulsummer.benchmarks.clone [--clones N] [--seed S]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable
+
+from azulsummer.models.game import Game
+from azulsummer.models.game_handler import GameHandler
+from azulsummer.players.actiononeplayer import ActionOnePlayer
+
+PLAYER_COUNTS = (2, 3, 4)
+
+
+def _rate(clone: Callable[[], object], n_clones: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n_clones):
+        clone()
+    return n_clones / (time.perf_counter() - start)
+
+
+def benchmark(n_clones: int = 20000, seed: int = 0) -> dict[int, dict[str, float]]:
+    """Time each way of copying a played game.
+
+    Returns:
+        Dict of {n_players: {copy name: clones per second}}
+    """
+    results = {}
+    for n_players in PLAYER_COUNTS:
+        game = Game.new([ActionOnePlayer() for _ in range(n_players)], seed)
+        GameHandler(game, headless=True).play()
+        state = game.state
+        results[n_players] = {
+            "clone": _rate(state.clone, n_clones),
+            "fork": _rate(game.fork, n_clones),
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clones", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for n_players, rates in benchmark(args.clones, args.seed).items():
+        print(
+            f"{n_players} players: "
+            + "  ".join(f"{name} {rate:>9,.0f}/sec" for name, rate in rates.items())
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Game positions shared by the benchmarks as their inputs"""
+from __future__ import annotations
+
+from typing import Optional
+from typing import Sequence
+
+from azulsummer.models import logic_handler
+from azulsummer.models.actions import PlayPhaseOneTurn
+from azulsummer.models.actions import StartGame
+from azulsummer.models.enums import BoardBackend
+from azulsummer.models.game import Game
+from azulsummer.players.player import Player
+
+
+def run_until(game: Game, action_type: Optional[type] = None) -> None:
+    """Dispatch the game's queued actions until an action_type action is next.
+
+    Actions run headless from the game's own queue, see
+    GameHandler.play_headless().  With no action_type the queue is run
+    until it is empty.
+    """
+    queue = game.action_queue
+    handlers = logic_handler.ACTION_HANDLERS
+    while queue and (action_type is None or not isinstance(queue[0], action_type)):
+        action = queue.popleft()
+        handlers[type(action)](action)
+
+
+def first_decision(
+    n_players: int,
+    seed: int,
+    board_backend: BoardBackend = BoardBackend.array,
+    players: Optional[Sequence[Optional[Player]]] = None,
+) -> Game:
+    """Run a game's setup actions up to the first player decision"""
+    if players is None:
+        players = [None] * n_players
+    game = Game.new(players, seed, board_backend=board_backend)
+    game.emits_events = False
+    game.enqueue(StartGame)
+    run_until(game, PlayPhaseOneTurn)
+    game.action_queue.clear()
+    return game
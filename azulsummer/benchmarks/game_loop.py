@@ -0,0 +1,94 @@
+"""Benchmark of whole games played through the GameHandler.
+
+Plays sample.py style games, with 4 ActionOnePlayers, through the evented
+loop, the evented loop with a null sink and with a JSON lines file sink, and
+the headless loop on the same seeds and reports games/sec.  The evented
+loop's print output is discarded so terminal speed is not measured.
+
+    python -m azulsummer.benchmarks.game_loop [--games N] [--players P] [--seed S]
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+from typing import Optional
+
+import numpy as np
+
+from azulsummer.adapters.event_sinks import AbstractEventSink
+from azulsummer.adapters.event_sinks import JsonLinesSink
+from azulsummer.adapters.event_sinks import NullSink
+from azulsummer.models.game import Game
+from azulsummer.models.game_handler import GameHandler
+from azulsummer.models.random import game_seeds
+from azulsummer.players.actiononeplayer import ActionOnePlayer
+
+
+def play_games(
+    seeds: list,
+    n_players: int,
+    headless: bool,
+    sink: Optional[AbstractEventSink] = None,
+) -> list[Game]:
+    """Play a game for each seed and return the finished games"""
+    games = []
+    sinks = None if sink is None else [sink]
+    for seed in seeds:
+        game = Game.new([ActionOnePlayer() for _ in range(n_players)], seed)
+        GameHandler(game, headless=headless, sinks=sinks).play()
+        games.append(game)
+    return games
+
+
+def benchmark(
+    n_games: int = 200, n_players: int = 4, seed: int = 0
+) -> dict[str, float]:
+    """Time the evented loops and the headless loop on the same games.
+
+    Returns:
+        Dict of {loop name: games per second}
+    """
+    seeds = game_seeds(seed, n_games)
+    results, finished = {}, {}
+    with tempfile.TemporaryDirectory() as directory:
+        loops: list[tuple[str, bool, Callable[[], Optional[AbstractEventSink]]]] = [
+            ("evented", False, lambda: None),
+            ("null sink", False, NullSink),
+            ("json lines", False, lambda: JsonLinesSink(Path(directory) / "e.jsonl")),
+            ("headless", True, lambda: None),
+        ]
+        for name, headless, make_sink in loops:
+            sink = make_sink()
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                finished[name] = play_games(seeds, n_players, headless, sink)
+                if sink is not None:
+                    sink.close()
+            results[name] = n_games / (time.perf_counter() - start)
+    for name, games in finished.items():
+        for evented, game in zip(finished["evented"], games):
+            if not np.array_equal(evented.tiles._tiles, game.tiles._tiles):
+                raise AssertionError(f"The {name} games finished differently")
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    results = benchmark(args.games, args.players, args.seed)
+    baseline = results["evented"]
+    for name, rate in results.items():
+        print(f"{name:>10}: {rate:>10,.1f} games/sec  ({rate / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark of the engine under Monte Carlo Tree Search.
+
+Searches the first decision of a game with an MCTSPlayer for a fixed time
+and reports the iterations per second for each worker count.  Root parallel
+workers search independently, so iterations per second should scale with
+the worker count up to the number of cores.
+
+With --profile a single worker search is run under cProfile and the
+functions taking the most time are printed.
+
+    python -m azulsummer.benchmarks.mcts [--players P] [--seconds S]
+        [--workers 1 2 4] [--seed S] [--profile N]
+"""
+from __future__ import annotations
+
+import argparse
+import cProfile
+import os
+import pstats
+
+from azulsummer.benchmarks.fixtures import first_decision
+from azulsummer.players.mctsplayer import MCTSPlayer
+
+
+def benchmark(
+    n_players: int = 4,
+    seconds: float = 2.0,
+    worker_counts: tuple[int, ...] = (1, 2, 4),
+    seed: int = 0,
+) -> dict[int, float]:
+    """Time searches with each number of root parallel workers.
+
+    The process pool is started and warmed up with a first search before
+    the timed search.
+
+    Returns:
+        Dict of {n_workers: iterations per second}
+    """
+    game = first_decision(n_players, seed)
+    results = {}
+    for n_workers in worker_counts:
+        with MCTSPlayer(
+            iterations=None, time_limit=seconds, n_workers=n_workers, seed=seed
+        ) as player:
+            if n_workers > 1:
+                player.time_limit = 0.1
+                player.search(game)
+                player.time_limit = seconds
+            player.search(game)
+        results[n_workers] = player.last_search.iterations_per_second
+    return results
+
+
+def profile(n_players: int = 4, iterations: int = 2000, seed: int = 0) -> pstats.Stats:
+    """Profile a single worker search of iterations"""
+    game = first_decision(n_players, seed)
+    player = MCTSPlayer(iterations=iterations, seed=seed)
+    profiler = cProfile.Profile()
+    profiler.runcall(player.search, game)
+    return pstats.Stats(profiler)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=sorted({1, 2, 4, os.cpu_count() or 1}),
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--profile", type=int, metavar="N", default=0)
+    args = parser.parse_args()
+
+    if args.profile:
+        stats = profile(args.players, seed=args.seed)
+        stats.sort_stats("tottime").print_stats(args.profile)
+        return
+
+    print(f"{os.cpu_count()} cores")
+    results = benchmark(args.players, args.seconds, tuple(args.workers), args.seed)
+    baseline = results[min(results)]
+    for n_workers, rate in results.items():
+        print(
+            f"{n_workers:>3} workers: {rate:>10,.0f} iterations/sec"
+            f"  ({rate / baseline:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Micro-benchmark of small bag draws.
+
+Compares numpy's multivariate_hypergeometric, as RandomTileDraw used before,
+with the buffered sequential sampler for the draw sizes of a game: 1-3 tiles
+to refill the supply, 4 tiles for a factory display, and 36 tiles for the
+9 displays of a 4 player game drawn in one split.
+
+    python -m azulsummer.benchmarks.sampling [--draws N] [--seed S]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable
+
+import numpy as np
+
+from azulsummer.models.random import RandomTileDraw
+from azulsummer.models.sampling import draw_split
+from azulsummer.models.tile_array import TileArray
+
+BAG = np.array([22, 20, 18, 22, 15, 22], dtype="B")
+DRAW_SIZES = (1, 3, 4)
+
+
+def _rate(draw: Callable[[], object], n_draws: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n_draws):
+        draw()
+    return n_draws / (time.perf_counter() - start)
+
+
+def benchmark(n_draws: int = 50000, seed: int = 0) -> dict[str, tuple[float, float]]:
+    """Time numpy and the small-draw sampler for each draw size.
+
+    Returns:
+        Dict of {draw name: (numpy draws/sec, sampler draws/sec)}
+    """
+    rng = np.random.default_rng(seed)
+    random = RandomTileDraw(seed)
+    results = {}
+    for n in DRAW_SIZES:
+        results[f"{n} tiles"] = (
+            _rate(
+                lambda: TileArray(rng.multivariate_hypergeometric(BAG, n).astype("B")),
+                n_draws,
+            ),
+            _rate(lambda: random.random_tile_distribution(BAG, n), n_draws),
+        )
+
+    sizes = [4] * 9
+
+    def numpy_displays():
+        counts = BAG.astype(np.int64)
+        for size in sizes:
+            counts -= rng.multivariate_hypergeometric(counts, size)
+
+    results["9x4 displays"] = (
+        _rate(numpy_displays, n_draws // 10),
+        _rate(
+            lambda: draw_split(BAG.tolist(), sizes, random.uniforms(36)),
+            n_draws // 10,
+        ),
+    )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--draws", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for name, (before, after) in benchmark(args.draws, args.seed).items():
+        print(
+            f"{name:>13}: numpy {before:>11,.0f} draws/sec  "
+            f"sampler {after:>11,.0f} draws/sec  ({after / before:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+"""Seeded benchmark suite of the engine's hot paths, with regression checks.
+
+run times each benchmark in BENCHMARKS on inputs built from the seed and
+writes the results to a JSON file.  compare checks a results file against a
+stored baseline and exits with status 1 when a benchmark regressed beyond
+the threshold.
+
+    python -m azulsummer.benchmarks.suite run [--output PATH] [--seed S]
+        [--seconds S] [--only NAME ...]
+    python -m azulsummer.benchmarks.suite compare BASELINE RESULTS
+        [--threshold T]
+
+Each benchmark reports:
+    ops_per_sec:  Operations per second over all the timed samples
+    p50_ns, p99_ns:  Percentiles of the nanoseconds per operation.  A sample
+        times a batch of operations sized to take at least SAMPLE_NS so the
+        timer's overhead does not dominate the fastest operations.
+    peak_bytes:  Mean peak of the memory traced by tracemalloc during one
+        operation, the memory allocated by the operation at its widest
+    blocks:  Mean change in the interpreter's allocated blocks per
+        operation, memory the operation keeps alive
+
+A regression is ops_per_sec falling, or peak_bytes rising, by more than the
+threshold.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import itertools
+import json
+import math
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable
+from typing import Optional
+from typing import Sequence
+
+import numpy as np
+
+from azulsummer.benchmarks.fixtures import first_decision
+from azulsummer.models.action_space import sample_action
+from azulsummer.models.board import Board
+from azulsummer.models.bonus_spaces import BonusSpace
+from azulsummer.models.enums import Phase
+from azulsummer.models.enums import StarColor
+from azulsummer.models.game import Game
+from azulsummer.models.game_handler import GameHandler
+from azulsummer.models.logic.action_mask import legal_action_mask
+from azulsummer.models.logic.board import generate_available_player_tile_placements
+from azulsummer.models.logic.tiles import generate_acquire_tile_draws
+from azulsummer.models.random import RandomTileDraw
+from azulsummer.models.random import game_seeds
+from azulsummer.players.actiononeplayer import ActionOnePlayer
+
+# Smallest nanoseconds timed by one sample
+SAMPLE_NS = 20_000
+MIN_SAMPLES = 20
+# Operations traced to measure the allocations
+ALLOCATION_OPS = 20
+BAG = np.array([22, 20, 18, 22, 15, 22], dtype="B")
+
+Operation = Callable[[], object]
+
+
+def _placed_board(rng: np.random.Generator, n_tiles: int) -> Board:
+    board = Board.new()
+    for cell in rng.permutation(len(StarColor) * 6)[:n_tiles]:
+        board.place_tile(StarColor(cell // 6), int(cell % 6) + 1)
+    return board
+
+
+def _move_tiles(seed: int) -> Operation:
+    """Move one tile from the bag to the tower and back"""
+    tiles = first_decision(4, seed).tiles
+    bag, tower = tiles.bag_index, tiles.tower_index
+    one = np.zeros(6, "B")
+    one[int(np.argmax(tiles.view_bag()))] = 1
+
+    def operation():
+        tiles.move_tiles(bag, tower, one)
+        tiles.move_tiles(tower, bag, one)
+
+    return operation
+
+
+def _check_tile_integrity(seed: int) -> Operation:
+    return first_decision(4, seed).tiles._check_tile_integrity
+
+
+def _generate_acquire_tile_draws(seed: int) -> Operation:
+    game = first_decision(4, seed)
+    tiles, wild_tile = game.tiles, game.wild_tile
+    return lambda: list(generate_acquire_tile_draws(tiles, wild_tile))
+
+
+def _generate_available_player_tile_placements(seed: int) -> Operation:
+    """Generate the placements at the first Phase Two turn of a random line"""
+    game = first_decision(4, seed)
+    rng = np.random.default_rng(seed)
+    while game.phase != Phase.play_tiles:
+        game.apply(sample_action(legal_action_mask(game), rng))
+    return lambda: list(generate_available_player_tile_placements(game))
+
+
+def _score_tile_placement(seed: int) -> Operation:
+    """Score the open spaces of a half covered board in turn"""
+    rng = np.random.default_rng(seed)
+    board = _placed_board(rng, 21)
+    spaces = itertools.cycle(
+        [
+            (star, value)
+            for star in StarColor
+            for value in range(1, 7)
+            if board.is_placement_location_open(star, value)
+        ]
+    )
+    return lambda: board.score_tile_placement(*next(spaces))
+
+
+def _surrounded_spaces(seed: int) -> Operation:
+    """Find the surrounded bonus spaces of a mostly covered board"""
+    board = _placed_board(np.random.default_rng(seed), 30)
+    bonus_spaces = BonusSpace()
+    return lambda: list(bonus_spaces.surrounded_spaces(board))
+
+
+def _random_tile_distribution(seed: int) -> Operation:
+    """Draw a factory display of 4 tiles from a full bag"""
+    random = RandomTileDraw(seed)
+    return lambda: random.random_tile_distribution(BAG, 4)
+
+
+def _play(n_players: int) -> Callable[[int], Operation]:
+    def setup(seed: int) -> Operation:
+        seeds = itertools.cycle(game_seeds(seed, 100))
+
+        def operation():
+            game = Game.new([ActionOnePlayer() for _ in range(n_players)], next(seeds))
+            GameHandler(game, headless=True).play()
+
+        return operation
+
+    setup.__doc__ = f"Play a headless {n_players} player game"
+    return setup
+
+
+# {name: setup building the operation from the seed}
+BENCHMARKS: dict[str, Callable[[int], Operation]] = {
+    "Tiles.move_tiles": _move_tiles,
+    "Tiles._check_tile_integrity": _check_tile_integrity,
+    "generate_acquire_tile_draws": _generate_acquire_tile_draws,
+    "generate_available_player_tile_placements": (
+        _generate_available_player_tile_placements
+    ),
+    "Board.score_tile_placement": _score_tile_placement,
+    "BonusSpace.surrounded_spaces": _surrounded_spaces,
+    "RandomTileDraw.random_tile_distribution": _random_tile_distribution,
+    "GameHandler.play 2 players": _play(2),
+    "GameHandler.play 3 players": _play(3),
+    "GameHandler.play 4 players": _play(4),
+}
+
+
+def _batch_ns(operation: Operation, batch: int) -> int:
+    start = time.perf_counter_ns()
+    for _ in range(batch):
+        operation()
+    return time.perf_counter_ns() - start
+
+
+def allocations(
+    operation: Operation, n_ops: int = ALLOCATION_OPS
+) -> tuple[int, float]:
+    """Trace the memory allocated by an operation.
+
+    Returns:
+        The mean peak bytes traced during an operation and the mean change
+        in allocated blocks per operation
+    """
+    tracemalloc.start()
+    peaks = 0
+    try:
+        for _ in range(n_ops):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            operation()
+            peaks += tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    for _ in range(n_ops):
+        operation()
+    gc.collect()
+    return peaks // n_ops, (sys.getallocatedblocks() - blocks) / n_ops
+
+
+def measure(operation: Operation, seconds: float = 0.5) -> dict[str, float]:
+    """Time an operation for about seconds and trace its allocations.
+
+    Returns:
+        Dict of ops_per_sec, p50_ns, p99_ns, peak_bytes and blocks, see the
+        module docstring
+    """
+    # Warm up and size the batches from the first operation
+    batch = math.ceil(SAMPLE_NS / max(_batch_ns(operation, 1), 1))
+    batch = math.ceil(SAMPLE_NS * batch / max(_batch_ns(operation, batch), 1))
+    samples = []
+    deadline = time.perf_counter() + seconds
+    while len(samples) < MIN_SAMPLES or time.perf_counter() < deadline:
+        samples.append(_batch_ns(operation, batch) / batch)
+    peak_bytes, blocks = allocations(operation)
+    per_op = np.array(samples)
+    return {
+        "ops_per_sec": 1e9 / per_op.mean(),
+        "p50_ns": float(np.percentile(per_op, 50)),
+        "p99_ns": float(np.percentile(per_op, 99)),
+        "peak_bytes": peak_bytes,
+        "blocks": blocks,
+        "samples": len(samples),
+        "batch": batch,
+    }
+
+
+def run(
+    seed: int = 0, seconds: float = 0.5, names: Optional[Sequence[str]] = None
+) -> dict[str, object]:
+    """Run the benchmarks.
+
+    Args:
+        seed:  Seed of every benchmark's inputs
+        seconds:  The time spent timing each benchmark
+        names:  Optional names of the benchmarks to run, all by default
+
+    Returns:
+        Dict of the run's environment and its {name: measure() results}
+
+    Raises:
+        KeyError if a name is not in BENCHMARKS
+    """
+    names = list(BENCHMARKS) if names is None else names
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "seed": seed,
+            "seconds": seconds,
+        },
+        "benchmarks": {
+            name: measure(BENCHMARKS[name](seed), seconds) for name in names
+        },
+    }
+
+
+def compare(
+    baseline: dict[str, object], results: dict[str, object], threshold: float = 0.1
+) -> dict[str, dict[str, float]]:
+    """Compare results with a baseline run.
+
+    Only the benchmarks in both runs are compared.
+
+    Args:
+        baseline:  The run() results of the baseline
+        results:  The run() results checked against it
+        threshold:  The fraction ops_per_sec may fall, or peak_bytes rise,
+            before a benchmark has regressed
+
+    Returns:
+        Dict of {name: {"speed": current / baseline ops_per_sec,
+        "memory": current / baseline peak_bytes, "regressed": 0 or 1}}
+    """
+    compared = {}
+    for name, current in results["benchmarks"].items():
+        before = baseline["benchmarks"].get(name)
+        if before is None:
+            continue
+        speed = current["ops_per_sec"] / before["ops_per_sec"]
+        memory = (current["peak_bytes"] + 1) / (before["peak_bytes"] + 1)
+        compared[name] = {
+            "speed": speed,
+            "memory": memory,
+            "regressed": int(speed < 1 - threshold or memory > 1 + threshold),
+        }
+    return compared
+
+
+def _print_run(results: dict[str, object]) -> None:
+    for name, result in results["benchmarks"].items():
+        print(
+            f"{name:>42}: {result['ops_per_sec']:>12,.0f} ops/sec"
+            f"  p50 {result['p50_ns']:>12,.0f} ns  p99 {result['p99_ns']:>12,.0f} ns"
+            f"  {result['peak_bytes']:>9,} peak bytes  {result['blocks']:>6.1f} blocks"
+        )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("--output", default="benchmarks.json")
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--seconds", type=float, default=0.5)
+    run_parser.add_argument(
+        "--only", nargs="+", choices=list(BENCHMARKS), metavar="NAME"
+    )
+    compare_parser = commands.add_parser("compare", help="check for regressions")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("results")
+    compare_parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        results = run(args.seed, args.seconds, args.only)
+        _print_run(results)
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+        print(f"results written to {args.output}")
+        return
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    with open(args.results) as file:
+        results = json.load(file)
+    compared = compare(baseline, results, args.threshold)
+    for name, change in compared.items():
+        flag = "REGRESSED" if change["regressed"] else "ok"
+        print(
+            f"{name:>42}: speed {change['speed']:>6.2f}x"
+            f"  memory {change['memory']:>6.2f}x  {flag}"
+        )
+    if any(change["regressed"] for change in compared.values()):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
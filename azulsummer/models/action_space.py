@@ -0,0 +1,437 @@
+"""Module containing the fixed integer action space
+
+Every player decision maps to an integer in range(ACTION_SPACE_SIZE).  The
+space is the same for every player count and is split into contiguous
+blocks, one per ActionKind:
+
+    Acquire:  source * 6 + color for the 9 factory displays and the table
+        center (TABLE_CENTER_SOURCE), 60 actions
+    Bonus:  one action per supply tile color, 6 actions
+    Place:  one action per (star, color, tile value, wild tiles spent)
+        placement, 252 actions
+    Pass:  1 action
+    Keep:  one action per multiset of up to 4 tiles kept in reserve,
+        210 actions
+
+The lookup arrays (ACTION_KIND, ACTION_COLOR, ...) give the fields of an
+action by indexing with its integer, so whole arrays of actions can be
+decoded at once.  The *_mask functions compute which actions of a block are
+legal from the raw tile and board arrays.
+"""
+from __future__ import annotations
+
+from itertools import product
+from types import MappingProxyType
+from typing import Mapping
+from typing import NamedTuple
+
+import numpy as np
+
+from azulsummer.models.enums import PLAYER_TO_DISPLAY_RATIO
+from azulsummer.models.enums import ActionKind
+from azulsummer.models.enums import StarColor
+from azulsummer.models.enums import TileColor
+from azulsummer.models.enums import TileIndex
+from azulsummer.models.enums import WildTiles
+from azulsummer.models.position import BoardPosition
+from azulsummer.models.position import DrawPosition
+from azulsummer.models.tile_array import TileArray
+
+
+class InvalidActionError(Exception):
+    pass
+
+
+N_COLORS: int = len(TileColor)
+MAX_TILE_VALUE: int = 6
+KEEP_TILE_MAX: int = 4
+
+MAX_FACTORY_DISPLAYS: int = max(PLAYER_TO_DISPLAY_RATIO.values())
+# Acquire sources are the factory displays followed by the table center
+TABLE_CENTER_SOURCE: int = MAX_FACTORY_DISPLAYS
+N_ACQUIRE_SOURCES: int = MAX_FACTORY_DISPLAYS + 1
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.flags.writeable = False
+    return array
+
+
+def _build_placements() -> tuple[tuple[int, int, int, int], ...]:
+    """Enumerate every (star, color, tile_value, n_wild) placement.
+
+    A color star only takes its own color, the wild star takes every color.
+    n_wild wild tiles are spent alongside tile_value - n_wild tiles of color,
+    so at least one tile of the color is always paid.  Whether the color is
+    the round's wild color is only known at play time, see placement_mask().
+    """
+    placements = []
+    for star in StarColor:
+        colors = TileColor if star == StarColor.Wild else (TileColor(star),)
+        for color in colors:
+            for tile_value in range(1, MAX_TILE_VALUE + 1):
+                for n_wild in range(tile_value):
+                    placements.append((int(star), int(color), tile_value, n_wild))
+    return tuple(placements)
+
+
+def _build_keeps() -> tuple[tuple[int, ...], ...]:
+    """Enumerate every multiset of up to KEEP_TILE_MAX tiles, smallest first"""
+    keeps = [
+        counts
+        for counts in product(range(KEEP_TILE_MAX + 1), repeat=N_COLORS)
+        if sum(counts) <= KEEP_TILE_MAX
+    ]
+    return tuple(sorted(keeps, key=lambda counts: (sum(counts), counts[::-1])))
+
+
+_PLACEMENTS = _build_placements()
+_KEEPS = _build_keeps()
+
+N_ACQUIRE_ACTIONS: int = N_ACQUIRE_SOURCES * N_COLORS
+N_BONUS_ACTIONS: int = N_COLORS
+N_PLACE_ACTIONS: int = len(_PLACEMENTS)
+N_KEEP_ACTIONS: int = len(_KEEPS)
+
+ACQUIRE_OFFSET: int = 0
+BONUS_OFFSET: int = ACQUIRE_OFFSET + N_ACQUIRE_ACTIONS
+PLACE_OFFSET: int = BONUS_OFFSET + N_BONUS_ACTIONS
+PASS_ACTION: int = PLACE_OFFSET + N_PLACE_ACTIONS
+KEEP_OFFSET: int = PASS_ACTION + 1
+ACTION_SPACE_SIZE: int = KEEP_OFFSET + N_KEEP_ACTIONS
+
+# {ActionKind: (first action, number of actions)}
+ACTION_BLOCKS: Mapping[ActionKind, tuple[int, int]] = MappingProxyType(
+    {
+        ActionKind.Acquire: (ACQUIRE_OFFSET, N_ACQUIRE_ACTIONS),
+        ActionKind.Bonus: (BONUS_OFFSET, N_BONUS_ACTIONS),
+        ActionKind.Place: (PLACE_OFFSET, N_PLACE_ACTIONS),
+        ActionKind.Pass: (PASS_ACTION, 1),
+        ActionKind.Keep: (KEEP_OFFSET, N_KEEP_ACTIONS),
+    }
+)
+
+
+def _build_lookup() -> dict[str, np.ndarray]:
+    """Build the per-action field arrays.  Unused fields hold -1."""
+    fields = {
+        name: np.full(ACTION_SPACE_SIZE, -1, dtype="b")
+        for name in ("source", "color", "star", "tile_value", "n_wild")
+    }
+    kind = np.empty(ACTION_SPACE_SIZE, dtype="B")
+    for block, (offset, size) in ACTION_BLOCKS.items():
+        kind[offset : offset + size] = block
+
+    acquire = np.arange(N_ACQUIRE_ACTIONS)
+    fields["source"][acquire] = acquire // N_COLORS
+    fields["color"][acquire] = acquire % N_COLORS
+
+    fields["color"][BONUS_OFFSET : BONUS_OFFSET + N_BONUS_ACTIONS] = np.arange(
+        N_COLORS
+    )
+
+    place = slice(PLACE_OFFSET, PLACE_OFFSET + N_PLACE_ACTIONS)
+    placements = np.array(_PLACEMENTS, dtype="b")
+    fields["star"][place] = placements[:, 0]
+    fields["color"][place] = placements[:, 1]
+    fields["tile_value"][place] = placements[:, 2]
+    fields["n_wild"][place] = placements[:, 3]
+
+    keep_tiles = np.zeros((ACTION_SPACE_SIZE, N_COLORS), dtype="B")
+    keep_tiles[KEEP_OFFSET:] = np.array(_KEEPS, dtype="B")
+
+    return {
+        "kind": _read_only(kind),
+        **{name: _read_only(field) for name, field in fields.items()},
+        "keep_tiles": _read_only(keep_tiles),
+    }
+
+
+_LOOKUP = _build_lookup()
+
+# Fields of every action, indexed by the action integer
+ACTION_KIND: np.ndarray = _LOOKUP["kind"]
+ACTION_SOURCE: np.ndarray = _LOOKUP["source"]
+ACTION_COLOR: np.ndarray = _LOOKUP["color"]
+ACTION_STAR: np.ndarray = _LOOKUP["star"]
+ACTION_TILE_VALUE: np.ndarray = _LOOKUP["tile_value"]
+ACTION_N_WILD: np.ndarray = _LOOKUP["n_wild"]
+ACTION_KEEP_TILES: np.ndarray = _LOOKUP["keep_tiles"]
+
+# The Place block sliced out of the lookup arrays for placement_mask()
+_PLACE_BLOCK = slice(PLACE_OFFSET, PLACE_OFFSET + N_PLACE_ACTIONS)
+_PLACE_COLOR = _read_only(ACTION_COLOR[_PLACE_BLOCK].astype(np.intp))
+_PLACE_N_WILD = _read_only(ACTION_N_WILD[_PLACE_BLOCK].astype(np.intp))
+_PLACE_N_COLOR = _read_only(
+    ACTION_TILE_VALUE[_PLACE_BLOCK].astype(np.intp) - _PLACE_N_WILD
+)
+_PLACE_CELL = _read_only(
+    ACTION_STAR[_PLACE_BLOCK].astype(np.intp) * MAX_TILE_VALUE
+    + ACTION_TILE_VALUE[_PLACE_BLOCK]
+    - 1
+)
+_PLACE_ON_WILD_STAR = _read_only(ACTION_STAR[_PLACE_BLOCK] == StarColor.Wild)
+_KEEP_TILES = ACTION_KEEP_TILES[KEEP_OFFSET:]
+
+_PLACEMENT_INDEX: Mapping[tuple[int, int, int, int], int] = MappingProxyType(
+    {placement: PLACE_OFFSET + i for i, placement in enumerate(_PLACEMENTS)}
+)
+_KEEP_INDEX: Mapping[tuple[int, ...], int] = MappingProxyType(
+    {keep: KEEP_OFFSET + i for i, keep in enumerate(_KEEPS)}
+)
+
+
+class DecodedAction(NamedTuple):
+    """The fields of an integer action.  Fields unused by the kind are None."""
+
+    kind: ActionKind
+    source: int | None = None
+    color: TileColor | None = None
+    star: StarColor | None = None
+    tile_value: int | None = None
+    n_wild: int | None = None
+    tiles: TileArray | None = None
+
+
+def wild_color_of(wild_tile: WildTiles) -> TileColor:
+    """Get the TileColor of the round's wild tile"""
+    return TileColor[wild_tile.name]
+
+
+""" ENCODING """
+
+
+def encode_acquire(source: int, color: TileColor) -> int:
+    """Encode taking the tiles of color from a factory display or the center.
+
+    Args:
+        source:  The nth factory display or TABLE_CENTER_SOURCE
+        color:  The color taken, the wild color when only wild tiles remain
+    """
+    if not (0 <= source < N_ACQUIRE_SOURCES and 0 <= color < N_COLORS):
+        raise InvalidActionError(f"No acquire action for {source}, {color}.")
+    return ACQUIRE_OFFSET + source * N_COLORS + color
+
+
+def encode_bonus(color: TileColor) -> int:
+    """Encode taking a tile of color from the supply"""
+    if not 0 <= color < N_COLORS:
+        raise InvalidActionError(f"No bonus action for {color}.")
+    return BONUS_OFFSET + color
+
+
+def encode_placement(
+    star: StarColor, color: TileColor, tile_value: int, n_wild: int
+) -> int:
+    """Encode placing a tile of color on star, paying n_wild wild tiles"""
+    try:
+        return _PLACEMENT_INDEX[(int(star), int(color), tile_value, n_wild)]
+    except KeyError:
+        raise InvalidActionError(
+            f"No placement action for {star}, {color}, {tile_value}, {n_wild}."
+        ) from None
+
+
+def encode_keep(tiles) -> int:
+    """Encode keeping the tiles of a 6 color array in reserve"""
+    try:
+        return _KEEP_INDEX[tuple(int(count) for count in tiles)]
+    except KeyError:
+        raise InvalidActionError(f"No keep action for {tiles}.") from None
+
+
+def encode_draw(draw: DrawPosition, wild_color: TileColor) -> int:
+    """Encode a phase one DrawPosition"""
+    if draw.location == TileIndex.TableCenter:
+        source = TABLE_CENTER_SOURCE
+    else:
+        source = draw.tiles_position
+    return encode_acquire(source, _paid_color(draw.tiles, wild_color))
+
+
+def encode_board_placement(
+    board_position: BoardPosition, tile_cost, wild_color: TileColor
+) -> int:
+    """Encode a phase two placement from its BoardPosition and tile cost"""
+    color = _paid_color(tile_cost, wild_color)
+    n_wild = tile_cost[wild_color] if color != wild_color else 0
+    return encode_placement(
+        board_position.star, color, board_position.tile_value, n_wild
+    )
+
+
+def _paid_color(tiles, wild_color: TileColor) -> TileColor:
+    """Get the non-wild color of a draw or cost, else the wild color"""
+    for color, count in enumerate(tiles):
+        if count and color != wild_color:
+            return TileColor(color)
+    return wild_color
+
+
+""" DECODING """
+
+
+def decode(action: int) -> DecodedAction:
+    """Get the fields of an integer action"""
+    if not 0 <= action < ACTION_SPACE_SIZE:
+        raise InvalidActionError(f"{action} is outside the action space.")
+    kind = ActionKind(ACTION_KIND[action])
+    if kind == ActionKind.Acquire:
+        return DecodedAction(
+            kind, source=int(ACTION_SOURCE[action]), color=_color(action)
+        )
+    if kind == ActionKind.Bonus:
+        return DecodedAction(kind, color=_color(action))
+    if kind == ActionKind.Place:
+        return DecodedAction(
+            kind,
+            color=_color(action),
+            star=StarColor(ACTION_STAR[action]),
+            tile_value=int(ACTION_TILE_VALUE[action]),
+            n_wild=int(ACTION_N_WILD[action]),
+        )
+    if kind == ActionKind.Keep:
+        return DecodedAction(kind, tiles=keep_tiles(action))
+    return DecodedAction(kind)
+
+
+def _color(action: int) -> TileColor:
+    return TileColor(ACTION_COLOR[action])
+
+
+def draw_position(
+    action: int, source_tiles: np.ndarray, wild_color: TileColor
+) -> DrawPosition:
+    """Reconstruct the DrawPosition of an acquire action.
+
+    Args:
+        action:  An Acquire action
+        source_tiles:  The tile row of the action's factory display or center
+        wild_color:  The round's wild TileColor
+
+    Returns:
+        The DrawPosition generate_acquire_tile_draws() yields for the action
+    """
+    _check_kind(action, ActionKind.Acquire)
+    source = int(ACTION_SOURCE[action])
+    color = int(ACTION_COLOR[action])
+    if color == wild_color:
+        tiles = {wild_color: 1}
+    else:
+        tiles = {
+            color: source_tiles[color],
+            wild_color: min(source_tiles[wild_color], 1),
+        }
+    if source == TABLE_CENTER_SOURCE:
+        location, source = TileIndex.TableCenter, 0
+    else:
+        location = TileIndex.FactoryDisplay
+    return DrawPosition(
+        location=location,
+        tiles_position=source,
+        tiles=TileArray.from_dict({k: int(v) for k, v in tiles.items()}),
+    )
+
+
+def board_position(action: int) -> BoardPosition:
+    """Reconstruct the BoardPosition of a placement action"""
+    _check_kind(action, ActionKind.Place)
+    return BoardPosition(StarColor(ACTION_STAR[action]), int(ACTION_TILE_VALUE[action]))
+
+
+def placement_cost(action: int, wild_color: TileColor) -> TileArray:
+    """Reconstruct the TileArray cost of a placement action"""
+    _check_kind(action, ActionKind.Place)
+    color = int(ACTION_COLOR[action])
+    n_wild = int(ACTION_N_WILD[action])
+    cost = [0] * N_COLORS
+    cost[color] = int(ACTION_TILE_VALUE[action]) - n_wild
+    cost[wild_color] += n_wild
+    return TileArray(cost)
+
+
+def keep_tiles(action: int) -> TileArray:
+    """Reconstruct the TileArray kept by a keep action"""
+    _check_kind(action, ActionKind.Keep)
+    return TileArray(ACTION_KEEP_TILES[action].tolist())
+
+
+def _check_kind(action: int, kind: ActionKind) -> None:
+    # Comparing Python ints avoids numpy probing the IntEnum as an array
+    if not (0 <= action < ACTION_SPACE_SIZE and int(ACTION_KIND[action]) == kind):
+        raise InvalidActionError(f"{action} is not a {kind.name} action.")
+
+
+""" BLOCK MASKS """
+
+
+def acquire_mask(source_tiles: np.ndarray, wild_color: TileColor) -> np.ndarray:
+    """Find the legal acquire (source, color) pairs.
+
+    A color is legal when the source holds it and it is not the wild color.
+    The wild color is only legal when the source holds nothing else.
+
+    Args:
+        source_tiles:  (sources, 6) tile rows, the factory displays in order
+            followed by the table center
+        wild_color:  The round's wild TileColor
+
+    Returns:
+        (sources, 6) bool array
+    """
+    mask = source_tiles > 0
+    wild = source_tiles[:, wild_color]
+    mask[:, wild_color] = (wild > 0) & (source_tiles.sum(axis=1) == wild)
+    return mask
+
+
+def bonus_mask(supply: np.ndarray) -> np.ndarray:
+    """Find the legal bonus actions, the colors present in the supply"""
+    return supply > 0
+
+
+def placement_mask(
+    reserve: np.ndarray,
+    board: np.ndarray,
+    wild_star_tiles: np.ndarray,
+    wild_color: TileColor,
+) -> np.ndarray:
+    """Find the legal placement actions for a player.
+
+    Args:
+        reserve:  The player's reserve tile row
+        board:  The player's 7x6 Board cells
+        wild_star_tiles:  The player's tile row for the wild star, the colors
+            already played to it
+        wild_color:  The round's wild TileColor
+
+    Returns:
+        Bool array over the Place block, N_PLACE_ACTIONS long
+    """
+    wild_color = int(wild_color)
+    payable = reserve[_PLACE_COLOR] >= _PLACE_N_COLOR
+    payable &= np.where(
+        _PLACE_COLOR == wild_color,
+        _PLACE_N_WILD == 0,
+        reserve[wild_color] >= _PLACE_N_WILD,
+    )
+    payable &= board.reshape(-1)[_PLACE_CELL] == 0
+    payable &= ~(_PLACE_ON_WILD_STAR & (wild_star_tiles[_PLACE_COLOR] > 0))
+    return payable
+
+
+def keep_mask(reserve: np.ndarray) -> np.ndarray:
+    """Find the keep actions the reserve holds enough tiles for"""
+    return (_KEEP_TILES <= reserve).all(axis=1)
+
+
+def sample_action(mask: np.ndarray, rng: np.random.Generator) -> int:
+    """Draw a legal action uniformly at random from an action mask.
+
+    Raises:
+        InvalidActionError if the mask has no legal action
+    """
+    actions = np.flatnonzero(mask)
+    if not len(actions):
+        raise InvalidActionError("The action mask has no legal action.")
+    return int(actions[rng.integers(len(actions))])
@@ -12,10 +12,10 @@ from azulsummer.models.tile_array import TileArray
 
 
 class Action:
-    pass
+    __slots__ = ()
 
 
-@dataclass()
+@dataclass(slots=True)
 class SetAllPlayersActive(Action):
     game: Game
 
@@ -36,33 +36,33 @@ class SelectTilePlacement(Action):
     available_actions: list[BoardPlacement]
 
 
-@dataclass
+@dataclass(slots=True)
 class ResolvePhaseOneTurn(Action):
     game: Game
 
 
-@dataclass
+@dataclass(slots=True)
 class PlayPhaseOneTurn(Action):
     game: Game
 
 
-@dataclass
+@dataclass(slots=True)
 class PhaseTwoPreparationComplete(Action):
     game: Game
 
 
-@dataclass
+@dataclass(slots=True)
 class PlayPhaseTwoTurn(Action):
     game: Game
 
 
-@dataclass
+@dataclass(slots=True)
 class HandlePhaseOneTileDraw(Action):
     game: Game
     draw_position: DrawPosition
 
 
-@dataclass
+@dataclass(slots=True)
 class DrawFromBag(Action):
     game: Game
     n_tiles_to_draw: int
@@ -70,179 +70,179 @@ class DrawFromBag(Action):
     nth_position: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class StartGame(Action):
     game: Game
 
 
-@dataclass
+@dataclass(slots=True)
 class InitializeGameState(Action):
     game: Game
 
 
-@dataclass
+@dataclass(slots=True)
 class AssessPhaseOneTileDrawAction(Action):
     game: Game
     available_actions: list[DrawPosition]
 
 
-@dataclass
+@dataclass(slots=True)
 class AdvancePhase(Action):
     game: Game
 
 
-@dataclass
+@dataclass(slots=True)
 class PreparePhaseTwo(Action):
     game: Game
 
 
-@dataclass
+@dataclass(slots=True)
 class AdvanceToNextPlayer(Action):
     game: Game
 
 
-@dataclass
+@dataclass(slots=True)
 class AdvanceRound(Action):
     game: Game
 
 
-@dataclass
+@dataclass(slots=True)
 class ResetPhaseTurn(Action):
     game: Game
 
 
-@dataclass
+@dataclass(slots=True)
 class AdvanceTurn(Action):
     game: Game
 
 
-@dataclass
+@dataclass(slots=True)
 class AdvanceWildTileIndex(Action):
     game: Game
 
 
-@dataclass
+@dataclass(slots=True)
 class GenerateTileDraw(Action):
     game: Game
     tile_count: int
 
 
-@dataclass
+@dataclass(slots=True)
 class AssignStartPlayer(Action):
     game: Game
 
 
-@dataclass
+@dataclass(slots=True)
 class CreateGame(Action):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class PhaseOnePreparationComplete(Action):
     game: Game
 
 
-@dataclass
+@dataclass(slots=True)
 class PreparePhaseOne(Action):
     game: Game
 
 
-@dataclass
+@dataclass(slots=True)
 class PreparePhaseOneTurn(Action):
     game: Game
 
 
-@dataclass
+@dataclass(slots=True)
 class RegisterPlayer(Action):
     game: uuid.UUID
     player: uuid.UUID
 
 
-@dataclass
+@dataclass(slots=True)
 class ScoreGame(Action):
     game: Game
 
 
-@dataclass
+@dataclass(slots=True)
 class IncrementPlayerScore(Action):
     game: Game
     player: uuid.UUID
     delta: int
 
 
-@dataclass
+@dataclass(slots=True)
 class DecrementPlayerScore(Action):
     game: Game
     player: uuid.UUID
     delta: int
 
 
-@dataclass
+@dataclass(slots=True)
 class LoadBagFromTower(Action):
     game: Game
 
 
-@dataclass
+@dataclass(slots=True)
 class LoadTilesToCenter(Action):
     game: Game
 
 
-@dataclass
+@dataclass(slots=True)
 class AssignCurrentPlayerToStartPlayer(Action):
     game: Game
 
 
-@dataclass
+@dataclass(slots=True)
 class ResetStartPlayerToken(Action):
     game: Game
 
 
-@dataclass
+@dataclass(slots=True)
 class FillFactoryDisplays(Action):
     game: Game
 
 
-@dataclass
+@dataclass(slots=True)
 class FillSupply(Action):
     game: Game
 
 
-@dataclass
+@dataclass(slots=True)
 class LoadTilesToTower(Action):
     game: Game
 
 
-@dataclass
+@dataclass(slots=True)
 class ResetStartToken(Action):
     game: Game
 
 
-@dataclass
+@dataclass(slots=True)
 class DrawFromFactoryDisplay(Action):
     game: Game
 
 
-@dataclass
+@dataclass(slots=True)
 class DrawFromSupply(Action):
     game: Game
 
 
-@dataclass
+@dataclass(slots=True)
 class DrawFromMiddle(Action):
     game: Game
 
 
-@dataclass
+@dataclass(slots=True)
 class PlayTileToPlayerBoard(Action):
     game: Game
 
 
-@dataclass
+@dataclass(slots=True)
 class DiscardExcessTiles(Action):
     game: Game
 
 
-@dataclass
+@dataclass(slots=True)
 class PassTurn(Action):
     game: Game
     player: uuid.UUID
@@ -0,0 +1,186 @@
+"""Module containing the GameArena class"""
+from __future__ import annotations
+
+import numpy as np
+
+from azulsummer.models.bonus_spaces import BONUS_SPACE_SIZES
+from azulsummer.models.bonus_spaces import surrounded_space_matrix
+from azulsummer.models.enums import PLAYER_TO_DISPLAY_RATIO
+from azulsummer.models.enums import BoardBackend
+from azulsummer.models.enums import TileIndex
+from azulsummer.models.enums import TileValidation
+from azulsummer.models.state import State
+from azulsummer.models.tiles import Tiles
+
+
+class ArenaFullError(Exception):
+    pass
+
+
+class InvalidGameHandleError(Exception):
+    pass
+
+
+class GameArena:
+    """Struct-of-arrays store for the state of many games.
+
+    Each field of a game's State (tiles, boards, bonus spaces, bonus space
+    counters, scores and counters) is held in one contiguous array with a
+    leading game axis.  A game is addressed by its integer handle, which is
+    its index along that axis.  All games in an arena share the same player
+    count.
+
+    States returned by GameArena.state() are thin views into an arena slot so
+    the existing logic operates directly on the arena's memory.
+    """
+
+    def __init__(
+        self,
+        n_players: int,
+        capacity: int,
+        validation: TileValidation = TileValidation.delta,
+        board_backend: BoardBackend = BoardBackend.array,
+    ) -> None:
+        """Initialize an empty arena.
+
+        Args:
+            n_players:  The number of players in every game held by the arena
+            capacity:  The maximum number of live games
+            validation:  The TileValidation mode used by the arena's States
+            board_backend:  The Board implementation used by the arena's States
+        """
+        if n_players not in PLAYER_TO_DISPLAY_RATIO:
+            raise ValueError(f"{n_players} is not a valid number of players.")
+        self.n_players: int = n_players
+        self.capacity: int = capacity
+        self.validation: TileValidation = validation
+        self.board_backend: BoardBackend = board_backend
+        self._spec = State.slot_spec(n_players)
+        self._fields: dict[str, np.ndarray] = {
+            name: np.zeros((capacity, *shape), dtype)
+            for name, (dtype, shape) in self._spec.items()
+        }
+        self._live = np.zeros(capacity, dtype=bool)
+        # Handles are popped from the end so the lowest handle is used first
+        self._free: list[int] = list(range(capacity - 1, -1, -1))
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(n_players={self.n_players}, "
+            f"capacity={self.capacity}, n_live={self.n_live})"
+        )
+
+    def __len__(self) -> int:
+        return self.n_live
+
+    @property
+    def n_live(self) -> int:
+        """Get the number of games currently held by the arena"""
+        return self.capacity - len(self._free)
+
+    @property
+    def nbytes(self) -> int:
+        """Get the number of bytes held by the arena's arrays"""
+        return sum(field.nbytes for field in self._fields.values())
+
+    """ FIELDS """
+
+    @property
+    def tiles(self) -> np.ndarray:
+        """Tile rows for all games, shaped (capacity, rows, 6)"""
+        return self._fields["tiles"]
+
+    @property
+    def boards(self) -> np.ndarray:
+        """Board cells for all games, shaped (capacity, n_players, 7, 6)"""
+        return self._fields["boards"]
+
+    @property
+    def bonus_spaces(self) -> np.ndarray:
+        """Available bonus space flags, shaped (capacity, n_players, spaces)"""
+        return self._fields["bonus_spaces"]
+
+    @property
+    def bonus_remaining(self) -> np.ndarray:
+        """Uncovered cells next to each bonus space, shaped like bonus_spaces"""
+        return self._fields["bonus_remaining"]
+
+    @property
+    def scores(self) -> np.ndarray:
+        """Player scores for all games, shaped (capacity, n_players)"""
+        return self._fields["scores"]
+
+    @property
+    def counters(self) -> np.ndarray:
+        """Turn, phase and player counters, shaped (capacity, n_counters)"""
+        return self._fields["counters"]
+
+    def live_handles(self) -> np.ndarray:
+        """Get the handles of all live games as an integer array"""
+        return np.flatnonzero(self._live)
+
+    def surrounded_bonus_spaces(self) -> np.ndarray:
+        """Find the available surrounded bonus spaces on every board at once.
+
+        Returns:
+            Bool array shaped (capacity, n_players, spaces).  Slots that are
+            not live are always False.
+        """
+        surrounded = surrounded_space_matrix(self.boards) & self.bonus_spaces.astype(
+            bool
+        )
+        surrounded[~self._live] = False
+        return surrounded
+
+    """ SLOTS """
+
+    def allocate(self) -> int:
+        """Allocate a slot for a new game and reset it to the starting state.
+
+        Returns:
+            The integer handle of the new game
+
+        Raises:
+            ArenaFullError if every slot is in use
+        """
+        if not self._free:
+            raise ArenaFullError(f"All {self.capacity} arena slots are in use.")
+        handle = self._free.pop()
+        self._live[handle] = True
+        self.reset(handle)
+        return handle
+
+    def release(self, handle: int) -> None:
+        """Return the game's slot to the arena.
+
+        States viewing the slot must not be used after it is released.
+        """
+        self._check_handle(handle)
+        self._live[handle] = False
+        self._free.append(handle)
+
+    def reset(self, handle: int) -> None:
+        """Reset the game at handle to the starting state of a new game."""
+        self._check_handle(handle)
+        for field in self._fields.values():
+            field[handle] = 0
+        self.tiles[handle, TileIndex.Bag] = Tiles._TILE_COUNT
+        self.bonus_spaces[handle] = 1
+        self.bonus_remaining[handle] = BONUS_SPACE_SIZES
+        self.scores[handle] = 5
+        self.counters[handle] = State.initial_counters(self.n_players)
+
+    def views(self, handle: int) -> dict[str, np.ndarray]:
+        """Get the arrays backing the game at handle without copying."""
+        self._check_handle(handle)
+        return {name: field[handle] for name, field in self._fields.items()}
+
+    def state(self, handle: int) -> State:
+        """Get a State that reads and writes through the game's slot."""
+        return State.from_views(
+            self.n_players, self.views(handle), self.validation, self.board_backend
+        )
+
+    def _check_handle(self, handle: int) -> None:
+        if not (0 <= handle < self.capacity and self._live[handle]):
+            raise InvalidGameHandleError(f"{handle} is not a live game handle.")
@@ -2,10 +2,17 @@
 from __future__ import annotations
 
 from collections import deque
+from typing import Optional
 
 import numpy as np
 
+from azulsummer.models.bonus_spaces import BONUS_SPACE_SIZES
+from azulsummer.models.bonus_spaces import CELL_BONUS_SPACES
+from azulsummer.models.bonus_spaces import INCIDENCE
+from azulsummer.models.enums import BoardBackend
 from azulsummer.models.enums import StarColor
+from azulsummer.models.zobrist import BOARD_KEYS
+from azulsummer.models.zobrist import board_key
 
 
 class InvalidTilePlacement(Exception):
@@ -15,17 +22,59 @@ class InvalidTilePlacement(Exception):
 class Board:
     """
     Class representing an Azul Summer Pavilion game board
+
+    Alongside the cells, the board counts the uncovered cells adjacent to
+    each bonus space in the remaining array.  Placing a tile decrements the
+    counters of the bonus spaces it touches, so the spaces it surrounds can
+    be found without rescanning the board.
+
+    The Zobrist hash of the covered cells is kept in key and updated on every
+    placement, see models.zobrist.
     """
 
     n_tile_spaces = 6
 
-    def __init__(self, board: np.ndarray) -> None:
+    def __init__(
+        self,
+        board: Optional[np.ndarray] = None,
+        remaining: Optional[np.ndarray] = None,
+        player: int = 0,
+        key: Optional[int] = None,
+    ) -> None:
+        """Initialize a Board.
+
+        Args:
+            board:  Optional 7x6 uint8 array of covered cells
+            remaining:  Optional uint8 array holding the number of uncovered
+                cells adjacent to each bonus space.  It is computed from the
+                board when not provided.
+            player:  Index of the player owning the board, which selects the
+                Zobrist keys of its cells
+            key:  Optional Zobrist key of the board.  It is computed from the
+                board when not provided.
+        """
+        if board is None:
+            board = self.empty_board()
+        if remaining is None:
+            remaining = BONUS_SPACE_SIZES - board.reshape(-1) @ INCIDENCE
         self.board = board
+        self.remaining = remaining
+        self.player = player
+        self._cell_keys: tuple[int, ...] = BOARD_KEYS[player]
+        self.key: int = board_key(board, player) if key is None else key
+
+    def rehash(self) -> int:
+        """Recompute the Zobrist key from the board array"""
+        self.key = board_key(self.board, self.player)
+        return self.key
 
     @classmethod
     def new(cls):
-        board = np.zeros(shape=(len(StarColor), cls.n_tile_spaces), dtype="B")
-        return cls(board)
+        return cls(cls.empty_board(), BONUS_SPACE_SIZES.copy())
+
+    @classmethod
+    def empty_board(cls) -> np.ndarray:
+        return np.zeros(shape=(len(StarColor), cls.n_tile_spaces), dtype="B")
 
     def is_placement_location_open(self, star: StarColor, tile_value: int) -> bool:
         """Validate that the star location is open"""
@@ -39,11 +88,36 @@ class Board:
         """Place a tile on the board.  Returns the value of the placement."""
         if self.is_placement_location_open(star, tile_value):
             score = self.score_tile_placement(star, tile_value)
+            cell = star * 6 + tile_value - 1
             self.board[star, tile_value - 1] = 1
+            self.key ^= self._cell_keys[cell]
+            self._count_covered_cell(cell)
         else:
             raise InvalidTilePlacement(f"Cannot place a tile on {star} {tile_value}")
         return score
 
+    def surrounded_spaces_at(self, star: StarColor, tile_value: int) -> list[int]:
+        """Get the bonus spaces touching a cell that are fully surrounded.
+
+        Called after place_tile this gives the bonus spaces newly surrounded
+        by that placement, since those spaces were waiting on that cell.
+
+        Returns:
+            Integer indices of the bonus spaces, see get_bonus_space()
+        """
+        remaining = self.remaining
+        return [
+            space
+            for space in CELL_BONUS_SPACES[star * 6 + tile_value - 1]
+            if not remaining[space]
+        ]
+
+    def _count_covered_cell(self, cell: int) -> None:
+        """Decrement the remaining counters of the bonus spaces at cell"""
+        remaining = self.remaining
+        for space in CELL_BONUS_SPACES[cell]:
+            remaining[space] -= 1
+
     def score_tile_placement(self, star: StarColor, tile_value: int) -> int:
         """
         Compute the score associated with placing a tile on the provided star
@@ -79,20 +153,106 @@ class Board:
         - place at 3 -> 2 points
         - place at 5 -> 3 points
         """
-        score = 1
-        index = tile_value - 1
-        seen = {index}
-        q = deque([index])
-        while q:
-            current = q.popleft()
-            left = current - 1 if (current - 1) >= 0 else len(self.board[star]) - 1
-            right = current + 1 if (current + 1) <= (len(self.board[star]) - 1) else 0
-            if left not in seen and self.board[star, left] == 1:
-                q.append(left)
-                seen.add(left)
-                score += 1
-            if right not in seen and self.board[star, right] == 1:
-                q.append(right)
-                seen.add(right)
-                score += 1
+        return _score_ring_placement(self.board[star], tile_value - 1)
+
+
+def _score_ring_placement(ring, index: int) -> int:
+    """Score placing a tile at index of a single star's ring of spaces.
+
+    The score is 1 plus every occupied space connected to index going around
+    the ring in either direction.
+    """
+    score = 1
+    seen = {index}
+    q = deque([index])
+    while q:
+        current = q.popleft()
+        left = current - 1 if (current - 1) >= 0 else len(ring) - 1
+        right = current + 1 if (current + 1) <= (len(ring) - 1) else 0
+        if left not in seen and ring[left] == 1:
+            q.append(left)
+            seen.add(left)
+            score += 1
+        if right not in seen and ring[right] == 1:
+            q.append(right)
+            seen.add(right)
+            score += 1
+    return score
+
+
+def _build_placement_score_table() -> tuple[int, ...]:
+    """Build the placement score for every (star mask, position) pair.
+
+    The table is indexed by mask * 6 + position where bit i of the 6-bit
+    mask is set when position i of the star is covered.  Occupied positions
+    score 0.
+    """
+    n = Board.n_tile_spaces
+    table = []
+    for mask in range(1 << n):
+        ring = [(mask >> i) & 1 for i in range(n)]
+        for position in range(n):
+            table.append(0 if ring[position] else _score_ring_placement(ring, position))
+    return tuple(table)
+
+
+# Shared by every BitBoard.  A tuple is used because indexing it with a Python
+# int is much faster than indexing an ndarray.
+_PLACEMENT_SCORES: tuple[int, ...] = _build_placement_score_table()
+_STAR_MASK: int = (1 << Board.n_tile_spaces) - 1
+
+
+class BitBoard(Board):
+    """Board with the covered spaces packed into a 42-bit integer.
+
+    Each star is a 6-bit mask at bit offset star * 6, where bit tile_value - 1
+    is set once that space is covered.  Open-space checks are bit tests and
+    placement scores are looked up in a precomputed (mask, position) table.
+
+    The cell array is still written on every placement so a BitBoard can be
+    used as a view into State or GameArena storage.  The array must only be
+    modified through the BitBoard once it is created.
+    """
+
+    def __init__(
+        self,
+        board: Optional[np.ndarray] = None,
+        remaining: Optional[np.ndarray] = None,
+        player: int = 0,
+        key: Optional[int] = None,
+    ) -> None:
+        super().__init__(board, remaining, player, key)
+        flat = self.board.reshape(-1)
+        self.bits: int = sum(1 << i for i in np.flatnonzero(flat).tolist())
+
+    def is_placement_location_open(self, star: StarColor, tile_value: int) -> bool:
+        """Validate that the star location is open"""
+        return 1 <= tile_value <= 6 and not (
+            self.bits >> (star * 6 + tile_value - 1)
+        ) & 1
+
+    def place_tile(self, star: StarColor, tile_value: int) -> int:
+        """Place a tile on the board.  Returns the value of the placement."""
+        if not self.is_placement_location_open(star, tile_value):
+            raise InvalidTilePlacement(f"Cannot place a tile on {star} {tile_value}")
+        score = self.score_tile_placement(star, tile_value)
+        cell = star * 6 + tile_value - 1
+        self.bits |= 1 << cell
+        self.board[star, tile_value - 1] = 1
+        self.key ^= self._cell_keys[cell]
+        self._count_covered_cell(cell)
         return score
+
+    def score_tile_placement(self, star: StarColor, tile_value: int) -> int:
+        """Look up the score for placing a tile on the star and value.
+
+        See Board.score_tile_placement for the scoring rules.
+        """
+        mask = (self.bits >> (star * 6)) & _STAR_MASK
+        return _PLACEMENT_SCORES[mask * 6 + tile_value - 1]
+
+
+BOARD_BACKENDS: dict[BoardBackend, type[Board]] = {
+    BoardBackend.array: Board,
+    BoardBackend.bitboard: BitBoard,
+}
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Iterator, Sequence
+from typing import TYPE_CHECKING, Iterator, Optional, Sequence
+
+import numpy as np
 
-from azulsummer.models.board import Board
 from azulsummer.models.enums import StarColor
 from azulsummer.models.position import BoardPosition
 
+if TYPE_CHECKING:
+    from azulsummer.models.board import Board
+
 _PILLAR_POSITIONS: Sequence[Sequence[BoardPosition]] = (
     (
         BoardPosition(StarColor.Orange, 2),
@@ -131,29 +135,102 @@ class Window:
     draw_count: int = 3
 
 
+def _build_bonus_spaces() -> tuple[Pillar | Statue | Window, ...]:
+    """Build the bonus spaces that are shared by every player board"""
+    spaces = []
+    for _class_positions, _class in zip(
+        (_PILLAR_POSITIONS, _STATUE_POSITIONS, _WINDOW_POSITIONS),
+        (Pillar, Statue, Window),
+    ):
+        for group in _class_positions:
+            positions: tuple[int, ...] = tuple(p.flatten() for p in group)
+            spaces.append(_class(positions))
+    return tuple(spaces)
+
+
+# Bonus spaces are immutable and identical on every board so they are built
+# once and shared.  Each player only tracks which spaces remain available.
+_BONUS_SPACES: tuple[Pillar | Statue | Window, ...] = _build_bonus_spaces()
+_BONUS_SPACE_INDEX: dict[Pillar | Statue | Window, int] = {
+    space: i for i, space in enumerate(_BONUS_SPACES)
+}
+N_BONUS_SPACES: int = len(_BONUS_SPACES)
+N_BOARD_CELLS: int = len(StarColor) * 6
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.flags.writeable = False
+    return array
+
+
+# Cell-by-space incidence matrix.  INCIDENCE[cell, space] is 1 when the
+# flattened board cell is adjacent to the bonus space.
+INCIDENCE: np.ndarray = np.zeros((N_BOARD_CELLS, N_BONUS_SPACES), "B")
+for _space_index, _space in enumerate(_BONUS_SPACES):
+    INCIDENCE[list(_space.adjacent), _space_index] = 1
+_read_only(INCIDENCE)
+
+# Number of cells adjacent to each bonus space.  Each board counts down from
+# these values as its cells are covered.
+BONUS_SPACE_SIZES: np.ndarray = _read_only(INCIDENCE.sum(axis=0).astype("B"))
+
+# The bonus spaces touched by each flattened board cell
+CELL_BONUS_SPACES: tuple[tuple[int, ...], ...] = tuple(
+    tuple(np.flatnonzero(row).tolist()) for row in INCIDENCE
+)
+
+
+def get_bonus_space(index: int) -> Pillar | Statue | Window:
+    """Get the shared bonus space for its integer index"""
+    return _BONUS_SPACES[index]
+
+
+def surrounded_space_matrix(boards: np.ndarray) -> np.ndarray:
+    """Find the surrounded bonus spaces on any number of boards at once.
+
+    Args:
+        boards: uint8 array of board cells shaped (..., 7, 6), e.g. every
+            player board of a State or every board in a GameArena
+
+    Returns:
+        Bool array shaped (..., N_BONUS_SPACES) that is True where every cell
+        adjacent to the bonus space is covered
+    """
+    cells = boards.reshape(*boards.shape[:-2], N_BOARD_CELLS)
+    return cells @ INCIDENCE == BONUS_SPACE_SIZES
+
+
 class BonusSpace:
     """
     Base class to unite windows, pillars and statues bonus spaces under a
     single API
     """
 
-    _positions = [_PILLAR_POSITIONS, _STATUE_POSITIONS, _WINDOW_POSITIONS]
-    _bonus_space_classes = [Pillar, Statue, Window]
+    def __init__(self, available: Optional[np.ndarray] = None):
+        """Initialize the bonus spaces for a single player.
 
-    def __init__(self):
-        self._bonus_space: set[Pillar | Statue | Window] = set()
-        for _class_positions, _class in zip(self._positions, self._bonus_space_classes):
-            for group in _class_positions:
-                positions: tuple[int, ...] = tuple(p.flatten() for p in group)
-                self._bonus_space.add(_class(positions))
+        Args:
+            available:  Optional uint8 array of length N_BONUS_SPACES flagging
+                the spaces that have not been claimed.  A new array with all
+                spaces available is created when not provided.
+        """
+        if available is None:
+            available = np.ones(N_BONUS_SPACES, "B")
+        self.available: np.ndarray = available
 
     def surrounded_spaces(
         self, board: Board
     ) -> Iterator[Pillar | Statue | Window]:
-        for space in self._bonus_space:
-            if all(board.board.flatten().take(space.adjacent)):
-                yield space
-
-    def remove_space(self, space: Pillar| Statue | Window):
-        self._bonus_space.remove(space)
-
+        """Yield the available bonus spaces surrounded on the board.
+
+        Uses the board's remaining neighbour counters rather than rescanning
+        the board cells.
+        """
+        for i in np.flatnonzero((board.remaining == 0) & self.available):
+            yield _BONUS_SPACES[i]
+
+    def remove_space(self, space: Pillar | Statue | Window):
+        index = _BONUS_SPACE_INDEX[space]
+        if not self.available[index]:
+            raise KeyError(space)
+        self.available[index] = 0
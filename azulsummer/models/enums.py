@@ -63,6 +63,70 @@ class TileIndex(IntEnum):
     FactoryDisplay = 4
 
 
+class StateCounter(IntEnum):
+    """Indices for the scalar counters held in the State counter array.
+
+    Counters that have no value yet (e.g. the phase before the game starts)
+    are stored as -1.  The per-player active flags follow the last counter.
+    """
+
+    Turn = 0
+    Phase = 1
+    PhaseTurn = 2
+    Ply = 3
+    GameRound = 4
+    StartPlayer = 5
+    CurrentPlayer = 6
+    WildTile = 7
+    Winner = 8
+    ActivePlayers = 9
+
+
+@unique
+class ActionKind(IntEnum):
+    """Kinds of player decision in the integer action space
+
+    Acquire:  Take all tiles of a color from a factory display or the center
+    Bonus:  Take one tile of a color from the supply for a bonus space
+    Place:  Pay for and place a tile on a star
+    Pass:  Stop placing tiles for the rest of Phase Two
+    Keep:  Choose the tiles kept in reserve after passing
+    """
+
+    Acquire = 0
+    Bonus = 1
+    Place = 2
+    Pass = 3
+    Keep = 4
+
+
+@unique
+class TileValidation(Enum):
+    """Tile integrity checks applied by the Tiles class after each move.
+
+    full:  Sum every tile column and compare to the valid distribution
+    delta:  Check only that each move conserves tiles and keeps the touched
+        rows non-negative
+    off:  No validation
+    """
+
+    full = "full"
+    delta = "delta"
+    off = "off"
+
+
+@unique
+class BoardBackend(Enum):
+    """Board implementations available to the State
+
+    array:  Cells stored in a 7x6 uint8 ndarray
+    bitboard:  Cells mirrored in a 42-bit integer for table-driven scoring
+    """
+
+    array = "array"
+    bitboard = "bitboard"
+
+
 class TileTarget(Enum):
     Bag = "Bag"
     Tower = "Tower"
@@ -71,3 +135,33 @@ class TileTarget(Enum):
     FactoryDisplay = "Factory Display"
     PlayerBoard = "Player Board"
     PlayerReserve = "Player Reserve"
+
+
+@unique
+class ReplacementPolicy(Enum):
+    """Choice of entry to overwrite when a transposition table bucket is full
+
+    always:  The new entry replaces the entry in the slot picked by the
+        high bits of its key
+    depth_preferred:  The new entry replaces the shallowest entry of the
+        bucket, unless every entry was searched deeper than the new one
+    two_tier:  The last entry of each bucket is always replaced, the others
+        are depth preferred
+    """
+
+    always = "always"
+    depth_preferred = "depth_preferred"
+    two_tier = "two_tier"
+
+
+@unique
+class Instrumentation(Enum):
+    """Counters a GameHandler records for each handler
+
+    timing:  Call counts and the total and slowest wall time
+    allocations:  timing and the change in allocated blocks.  Counting the
+        blocks costs more than the timing and scales with the memory in use.
+    """
+
+    timing = "timing"
+    allocations = "allocations"
@@ -1,268 +1,355 @@
-"""Module containing the game events"""
-from dataclasses import dataclass
+"""Module containing the game events
+
+Events identify their game by game_id rather than holding the Game, so a
+queued event never keeps a finished game alive.  Payloads are indices, enums
+and small tuples.  Text is only formatted when an event is converted with
+str(), e.g. by an event handler that displays it.
+"""
+from __future__ import annotations
 
-from azulsummer.models.game import Game
+import sys
+from dataclasses import dataclass
+from dataclasses import fields
+from enum import Enum
+from typing import Type
+
+from azulsummer.models.enums import Phase
+from azulsummer.models.enums import WildTiles
+from azulsummer.models.position import BoardPosition
+from azulsummer.models.position import DrawPosition
+from azulsummer.models.position import TilePosition
 from azulsummer.models.tile_array import TileArray
 
 
+def _to_json(value):
+    """Convert an event field to JSON compatible values"""
+    if isinstance(value, Enum):
+        return value.name
+    if isinstance(value, TilePosition):
+        return [value.location.name, value.nth]
+    if isinstance(value, BoardPosition):
+        return [value.star.name, value.tile_value]
+    if isinstance(value, DrawPosition):
+        return [value.location.name, value.tiles_position, list(value.tiles)]
+    if isinstance(value, tuple):
+        return [_to_json(item) for item in value]
+    return value
+
+
+def _format(value) -> str:
+    """Format an event field for display"""
+    if isinstance(value, Enum):
+        return value.name
+    if isinstance(value, (TileArray, DrawPosition, BoardPosition, TilePosition)):
+        return str(value)
+    if isinstance(value, tuple):
+        return f"({', '.join(map(_format, value))})"
+    return repr(value)
+
+
+@dataclass(slots=True)
 class Event:
-    pass
-
-@dataclass
+    game_id: str
+
+    def __str__(self):
+        values = ", ".join(
+            f"{field.name}={_format(getattr(self, field.name))}"
+            for field in fields(self)
+            if field.name != "game_id"
+        )
+        return f"{self.__class__.__name__}({values})"
+
+    def to_dict(self) -> dict:
+        """Get the event type and fields as JSON compatible values"""
+        return {
+            "event": self.__class__.__name__,
+            **{
+                field.name: _to_json(getattr(self, field.name))
+                for field in fields(self)
+            },
+        }
+
+
+@dataclass(slots=True)
 class AllPlayersSetToActive(Event):
-    game: Game
+    pass
 
 
-@dataclass
+@dataclass(slots=True)
 class PhaseOneEndCriteriaHaveBeenMet(Event):
-    game: Game
+    pass
 
-@dataclass
+
+@dataclass(slots=True)
 class PhaseTwoPrepared(Event):
-    game: Game
+    pass
 
 
-@dataclass
+@dataclass(slots=True)
 class BeginningTurn(Event):
-    game: Game
     turn: int
     phase_turn: int
     current_player: int
 
 
-@dataclass
+@dataclass(slots=True)
 class PlayerSelectedTilesToAcquire(Event):
-    game: Game
     player: int
-    tiles_drawn: str
+    draw: DrawPosition
 
 
-@dataclass
+@dataclass(slots=True)
 class PhaseOneDrawsGenerated(Event):
-    game: Game
-    draws: list[str]
+    draws: tuple[DrawPosition, ...]
+
 
-@dataclass
+@dataclass(slots=True)
 class PhaseTwoTilePlacementsGenerated(Event):
-    game: Game
-    draws: list[str]
+    # (BoardPosition, tile cost) of each placement
+    placements: tuple[tuple[BoardPosition, TileArray], ...]
 
 
-@dataclass
+@dataclass(slots=True)
 class CurrentPlayerSet(Event):
-    game: Game
     player_index: int
 
 
-@dataclass
+@dataclass(slots=True)
 class StartPlayerTokenWasReset(Event):
-    game: Game
+    pass
 
 
-@dataclass
+@dataclass(slots=True)
 class StartPlayerTokenWasSet(Event):
-    game: Game
     player: int
 
 
-@dataclass
+@dataclass(slots=True)
 class TilesDrawnFromBag(Event):
-    game: Game
     tiles: TileArray
 
 
-@dataclass
+@dataclass(slots=True)
 class TilesMoved(Event):
-    game: Game
-    source: str
-    destination: str
-    tiles: str
+    source: TilePosition
+    destination: TilePosition
+    tiles: TileArray
+
 
+@dataclass(slots=True)
+class FactoryDisplaysFilled(Event):
+    tiles: tuple[TileArray, ...]
 
-@dataclass
+
+@dataclass(slots=True)
 class BeginningPhaseOnePreparation(Event):
-    game: Game
+    pass
 
 
-@dataclass
+@dataclass(slots=True)
 class GameCreatedWithNPlayers(Event):
-    game: Game
     n_players: int
 
 
-@dataclass
+@dataclass(slots=True)
 class GameCreatedWithNFactoryDisplays(Event):
-    game: Game
     n_factory_displays: int
 
 
-@dataclass
+@dataclass(slots=True)
 class TileDrawGenerated(Event):
-    game: Game
-    tiles: str
+    tiles: TileArray
 
 
-@dataclass
+@dataclass(slots=True)
 class BagLoadedWith132Tiles(Event):
-    game: Game
+    pass
 
 
-@dataclass
+@dataclass(slots=True)
 class StartTokenReset(Event):
-    game: Game
+    pass
 
 
-@dataclass
+@dataclass(slots=True)
 class GameStateInitialized(Event):
-    game: Game
+    pass
 
 
-@dataclass
+@dataclass(slots=True)
 class GameStarted(Event):
-    game: Game
+    pass
 
 
-@dataclass
+@dataclass(slots=True)
 class PlayerScoresInitializedAt5(Event):
-    game: Game
+    pass
 
 
-@dataclass
+@dataclass(slots=True)
 class PhaseOnePrepared(Event):
-    game: Game
+    pass
 
 
-@dataclass
+@dataclass(slots=True)
 class PhaseAdvanced(Event):
-    game: Game
-    phase: str
+    phase: Phase
 
 
-@dataclass
+@dataclass(slots=True)
 class PhaseTurnSetToZero(Event):
-    game: Game
+    pass
 
 
-@dataclass
+@dataclass(slots=True)
 class CurrentPlayerIndexAdvanced(Event):
-    game: Game
     next_player: int
 
 
-@dataclass
+@dataclass(slots=True)
 class RoundAdvanced(Event):
-    game: Game
     round: int
 
 
-@dataclass
+@dataclass(slots=True)
 class TurnIncremented(Event):
-    game: Game
+    pass
 
 
-@dataclass
+@dataclass(slots=True)
 class PhaseTurnIncremented(Event):
-    game: Game
+    pass
 
 
-@dataclass
+@dataclass(slots=True)
 class WildTileIndexAdvanced(Event):
-    game: Game
-    wild_tile: str
+    wild_tile: WildTiles
 
 
-@dataclass
+@dataclass(slots=True)
 class PlayerIsFirstToDrawFromTableCenter(Event):
-    game: Game
     player: int
 
 
-@dataclass
+@dataclass(slots=True)
 class AssignedStartPlayer(Event):
-    game: Game
+    pass
 
 
-@dataclass
+@dataclass(slots=True)
 class ScoredGame(Event):
-    game: Game
+    pass
 
 
-@dataclass
+@dataclass(slots=True)
 class IncrementedPlayerScore(Event):
-    game: Game
+    pass
 
 
-@dataclass
+@dataclass(slots=True)
 class DecrementedPlayerScore(Event):
-    game: Game
     decreased_by: int
     original_score: int
     new_score: int
 
 
-@dataclass
+@dataclass(slots=True)
+class IncrementedPlayerScore(Event):
+    increased_by: int
+    original_score: int
+    new_score: int
+
+
+@dataclass(slots=True)
+class TilesPlacedOnBoard(Event):
+    player: int
+    board_position: BoardPosition
+    tile_cost: TileArray
+
+
+@dataclass(slots=True)
+class PlayerPassed(Event):
+    player: int
+
+
+@dataclass(slots=True)
 class DiscardTilesFromFactoryDisplayToTableCenter(Event):
-    game: Game
     factory_display: int
-    tiles_moved: str
+    tiles_moved: TileArray
 
 
-@dataclass
+@dataclass(slots=True)
 class RefillBagFromTower(Event):
-    game: Game
     tiles: TileArray
 
 
-@dataclass
+@dataclass(slots=True)
 class LoadedTilesToCenter(Event):
-    game: Game
+    pass
 
 
-@dataclass
+@dataclass(slots=True)
 class LoadedTilesToFactoryDisplay(Event):
-    game: Game
+    pass
 
 
-@dataclass
+@dataclass(slots=True)
 class LoadedTilesToSupply(Event):
-    game: Game
+    pass
 
 
-@dataclass
+@dataclass(slots=True)
 class LoadedTilesToTower(Event):
-    game: Game
+    pass
 
 
-@dataclass
+@dataclass(slots=True)
 class UnAssignedStartPlayer(Event):
-    game: Game
+    pass
 
 
-@dataclass
+@dataclass(slots=True)
 class DrewFromFactoryDisplay(Event):
-    game: Game
+    pass
 
 
-@dataclass
+@dataclass(slots=True)
 class DrewFromSupply(Event):
-    game: Game
+    pass
 
 
-@dataclass
+@dataclass(slots=True)
 class DrewFromMiddle(Event):
-    game: Game
+    pass
 
 
-@dataclass
+@dataclass(slots=True)
 class PlayedTileToPlayerBoard(Event):
-    game: Game
+    pass
 
 
-@dataclass
+@dataclass(slots=True)
 class DiscardedExcessTiles(Event):
-    game: Game
+    pass
 
 
-@dataclass
+@dataclass(slots=True)
 class PassedTurn(Event):
     pass
+
+
+def event_types() -> list[Type[Event]]:
+    """Get every Event subclass.
+
+    @dataclass(slots=True) replaces the class it decorates and the replaced
+    class is listed in __subclasses__() until it is garbage collected, so
+    only the classes found in their module are kept.
+    """
+    found, stack = [], list(Event.__subclasses__())
+    while stack:
+        event_type = stack.pop()
+        module = sys.modules[event_type.__module__]
+        if getattr(module, event_type.__name__, None) is event_type:
+            found.append(event_type)
+        stack.extend(event_type.__subclasses__())
+    return found
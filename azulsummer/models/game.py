@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+from array import array
 from collections import deque
+from copy import deepcopy
+from dataclasses import replace
 from typing import Optional
 from typing import Sequence
 from uuid import uuid4
 
 from azulsummer.models.board import Board
+from azulsummer.models.enums import BoardBackend
 from azulsummer.models.enums import TileColor
+from azulsummer.models.enums import TileValidation
 from azulsummer.models.random import RandomTileDraw
+from azulsummer.models.random import Seed
 from azulsummer.models.state import State
 from azulsummer.models.tile_array import TileArray
 from azulsummer.players.player import Player
@@ -15,47 +21,203 @@ from azulsummer.players.player import Player
 
 class Game:
     def __init__(
-        self, game_id: str, players: Sequence[Optional[Player]], seed: Optional[int]
+        self,
+        game_id: str,
+        players: Sequence[Optional[Player]],
+        seed: Optional[Seed],
+        validation: TileValidation = TileValidation.delta,
+        board_backend: BoardBackend = BoardBackend.array,
     ) -> None:
         """Initiate a game
 
         Args:
             players:  A sequence of class Player.  Player at index 0 will be
                 the starting player.
-            seed:  Optional int for the random seed
+            seed:  Optional int or SeedSequence for the random seed, see
+                random.game_seeds() for seeding many games.  None seeds
+                the game from fresh entropy.
+            validation:  The TileValidation mode used for the game's tiles
+            board_backend:  The Board implementation used for player boards
         """
         self.game_id = game_id
         self.players = players
         self.seed = seed
+        self.validation = validation
+        self.board_backend = board_backend
         self.random = RandomTileDraw(seed)
-        self.action_history = []
+        # The integer action chosen at each decision, see action_space
+        self.action_history: array = array("H")
         self.action_queue = deque()
         self.event_queue = deque()
+        # Headless games run without subscribers and skip creating events
+        self.emits_events: bool = True
+        # Actions carrying only the game and events carrying only the game_id
+        # are created once per game and reused, see enqueue() and emit()
+        self.reuses_messages: bool = True
+        self._messages: dict[type, object] = {}
 
         # state must be created with Game.make_state() after assigning players
         # to the game
         self.state = None
+        self.layout = None
 
     def __repr__(self):
         return f"{self.__class__.__name__}()"
 
     @classmethod
     def new(
-        cls, players: Optional[Sequence[Player]] = None, seed: Optional[int] = None
+        cls,
+        players: Optional[Sequence[Player]] = None,
+        seed: Optional[Seed] = None,
+        validation: TileValidation = TileValidation.delta,
+        board_backend: BoardBackend = BoardBackend.array,
     ):
         """Instantiate a game without player information"""
         players = players if players else []
-        seed = seed if seed else None
-        return cls(str(uuid4()), players, seed)
+        return cls(str(uuid4()), players, seed, validation, board_backend)
 
     def make_state(self):
         """Create the initial game state for the game"""
-        self.state = State.new(len(self.players))
+        self.state = State.new(
+            len(self.players), self.validation, self.board_backend
+        )
+        self.layout = self.state.tiles.layout
+
+    def fork(self, seed: Optional[Seed] = None) -> Game:
+        """Create a copy of the game that is played independently of it.
+
+        The fork has a clone of the game's state, see State.clone(), and
+        shares the players and tile layout.  It starts with empty queues and
+        history and draws tiles from its own stream.
+
+        Args:
+            seed:  Seed for the fork's tile draws.  None spawns a child of the
+                game's seed, so the forks of a seeded game are reproducible.
+
+        Returns:
+            The forked Game
+        """
+        if seed is None:
+            seed = self.random.seed_sequence.spawn(1)[0]
+        game = Game(
+            str(uuid4()), self.players, seed, self.validation, self.board_backend
+        )
+        game.emits_events = self.emits_events
+        game.reuses_messages = self.reuses_messages
+        if self.state is not None:
+            game.state = self.state.clone()
+            game.layout = self.layout
+        return game
+
+    def copy(self, players: Optional[Sequence[Optional[Player]]] = None) -> Game:
+        """Create an exact copy of the game.
+
+        Unlike fork(), the copy continues the game's tile stream from its
+        current position and has the game's action history and queued
+        actions, rebound to the copy, so playing the copy on from its queue
+        plays the same game as playing on this one.
+
+        Args:
+            players:  The players of the copy.  The game's players by default.
+
+        Returns:
+            The copied Game
+        """
+        game = Game(
+            self.game_id,
+            self.players if players is None else players,
+            self.random.seed_sequence,
+            self.validation,
+            self.board_backend,
+        )
+        game.random = deepcopy(self.random)
+        game.action_history = array("H", self.action_history)
+        game.emits_events = self.emits_events
+        game.reuses_messages = self.reuses_messages
+        if self.state is not None:
+            game.state = self.state.clone()
+            game.layout = self.layout
+        game.action_queue.extend(
+            replace(action, game=game)
+            if getattr(action, "game", None) is self
+            else action
+            for action in self.action_queue
+        )
+        game.event_queue.extend(self.event_queue)
+        return game
+
+    def __reduce__(self):
+        # The state pickles as State.to_bytes().  Players and queued messages
+        # are pickled after the game, so actions may refer back to it.
+        return (
+            _restore_game,
+            (
+                self.game_id,
+                self.validation,
+                self.board_backend,
+                self.random,
+                None if self.state is None else self.state.to_bytes(),
+            ),
+            {
+                "players": self.players,
+                "action_history": self.action_history,
+                "action_queue": self.action_queue,
+                "event_queue": self.event_queue,
+                "emits_events": self.emits_events,
+                "reuses_messages": self.reuses_messages,
+            },
+        )
+
+    def apply(self, action: int, check: bool = True) -> "UndoToken":
+        """Apply an integer action in place, see logic.journal.apply_action()"""
+        # The logic modules import Game, so they are imported when used
+        from azulsummer.models.logic.journal import apply_action
+
+        return apply_action(self, action, check)
+
+    def undo(self, token: "UndoToken") -> None:
+        """Undo an applied action, see logic.journal.undo_action()"""
+        from azulsummer.models.logic.journal import undo_action
+
+        undo_action(self, token)
 
     def enqueue_action(self, action: "Action") -> None:
         self.action_queue.append(action)
 
+    def enqueue(self, action_type: type, **kwargs) -> None:
+        """Queue an action_type action for the game.
+
+        The action is created with the game and kwargs.  An action without
+        kwargs carries only the game, so it is created once per game and the
+        same action is queued each time when the game reuses messages.
+        """
+        if kwargs or not self.reuses_messages:
+            self.action_queue.append(action_type(game=self, **kwargs))
+            return
+        action = self._messages.get(action_type)
+        if action is None:
+            action = self._messages[action_type] = action_type(game=self)
+        self.action_queue.append(action)
+
     def enqueue_event(self, event: "Event") -> None:
+        if self.emits_events:
+            self.event_queue.append(event)
+
+    def emit(self, event_type: type, *args, **kwargs) -> None:
+        """Queue an event_type event for the game.
+
+        The event is created with the game's id followed by args and kwargs,
+        and only when the game emits events.  An event without args or kwargs
+        is created once per game and reused, like the actions of enqueue().
+        """
+        if not self.emits_events:
+            return
+        if args or kwargs or not self.reuses_messages:
+            self.event_queue.append(event_type(self.game_id, *args, **kwargs))
+            return
+        event = self._messages.get(event_type)
+        if event is None:
+            event = self._messages[event_type] = event_type(self.game_id)
         self.event_queue.append(event)
 
     @property
@@ -104,23 +266,27 @@ class Game:
 
     @property
     def player_board_index(self):
-        return self.state.tiles.player_board_index
+        return self.layout.player_board_index
 
     @property
     def player_reserve_index(self):
-        return self.state.tiles.player_reserve_index
+        return self.layout.player_reserve_index
 
     @property
     def phase(self):
         return self.state.phase
 
+    @property
+    def hash_key(self) -> int:
+        return self.state.hash_key
+
     @phase.setter
     def phase(self, value):
         self.state.phase = value
 
     @property
     def n_factory_displays(self):
-        return self.state.tiles.n_factory_displays
+        return self.layout.n_factory_displays
 
     @property
     def supply_deficit(self):
@@ -217,3 +383,19 @@ class Game:
 
     def reset_active_players(self):
         self.state.reset_active_players()
+
+
+def _restore_game(
+    game_id: str,
+    validation: TileValidation,
+    board_backend: BoardBackend,
+    random: RandomTileDraw,
+    state: Optional[bytes],
+) -> Game:
+    """Rebuild a pickled game, before its players and queues are set"""
+    game = Game(game_id, [], random.seed_sequence, validation, board_backend)
+    game.random = random
+    if state is not None:
+        game.state = State.from_bytes(state)
+        game.layout = game.state.tiles.layout
+    return game
@@ -1,11 +1,16 @@
 import logging
 from collections import deque
+from typing import Iterable
 from typing import Optional
 
+from azulsummer.adapters.event_sinks import AbstractEventSink
+from azulsummer.adapters.event_sinks import resolve_event_handlers
 from azulsummer.models import actions
 from azulsummer.models import events
 from azulsummer.models import logic_handler
+from azulsummer.models.enums import Instrumentation
 from azulsummer.models.game import Game
+from azulsummer.models.instrumentation import HandlerStats
 
 logger = logging.getLogger(__name__)
 
@@ -13,14 +18,53 @@ Message = actions.Action | events.Event
 
 
 class GameHandler:
-    def __init__(self, game: Optional[Game] = None) -> None:
+    def __init__(
+        self,
+        game: Optional[Game] = None,
+        headless: bool = False,
+        sinks: Optional[Iterable[AbstractEventSink]] = None,
+        instrument: Optional[Instrumentation] = None,
+    ) -> None:
+        """Initialize the handler for a game.
+
+        Args:
+            game:  The Game to play
+            headless:  Play without events.  The game's logic skips creating
+                events and actions are dispatched straight from the game's
+                action queue.
+            sinks:  The sinks receiving the game's events in place of the
+                default handlers, see register_sinks().
+            instrument:  Optional Instrumentation level recording the calls
+                and time, or allocations, of every handler by message type.
+                See stats() and report().
+        """
         self.game: Optional[Game] = game
+        self.headless = headless
         self.action_queue = deque()
         self.event_queue = deque()
         self.action_handlers = logic_handler.ACTION_HANDLERS
         self.event_handlers = logic_handler.EVENT_HANDLERS
+        self.handler_stats: Optional[HandlerStats] = (
+            None if instrument is None else HandlerStats(instrument)
+        )
+        if sinks is not None:
+            self.register_sinks(sinks)
+
+    def register_sinks(self, sinks: Iterable[AbstractEventSink]) -> None:
+        """Send the game's events to sinks in place of the current handlers.
+
+        The sinks receiving each event type are resolved here, once.  Events
+        of a type no sink accepts are dropped, and when no sink accepts any
+        event type the game skips creating events.
+        """
+        self.event_handlers = resolve_event_handlers(sinks)
 
     def play(self):
+        if self.headless:
+            self.play_headless()
+            return
+        if not self.event_handlers:
+            self.game.emits_events = False
         self.action_queue.append(actions.StartGame(game=self.game))
         while self.action_queue:
             action = self.action_queue.popleft()
@@ -30,6 +74,34 @@ class GameHandler:
             if self.event_queue:
                 self.handle_events()
 
+    def play_headless(self):
+        """Play the game without creating or handling events.
+
+        Actions run in the same order as play() since each handler appends
+        the actions that follow it to the end of the game's action queue.
+        """
+        game = self.game
+        game.emits_events = False
+        game.event_queue.clear()
+        queue = game.action_queue
+        handlers = self.action_handlers
+        queue.append(actions.StartGame(game=game))
+        handler_stats = self.handler_stats
+        action = None
+        try:
+            if handler_stats is None:
+                while queue:
+                    action = queue.popleft()
+                    handlers[type(action)](action)
+            else:
+                call = handler_stats.call
+                while queue:
+                    action = queue.popleft()
+                    call(handlers[type(action)], action)
+        except Exception:
+            logger.exception("Exception handling action %s", action)
+            raise
+
     def transfer_actions(self):
         """Transfer actions from game.action_queue to GameHandler.action_queue"""
         self.action_queue.extend(self.game.action_queue)
@@ -44,7 +116,10 @@ class GameHandler:
         logger.debug("handle action %s", action)
         try:
             handler = self.action_handlers[type(action)]
-            handler(action)
+            if self.handler_stats is None:
+                handler(action)
+            else:
+                self.handler_stats.call(handler, action)
         except Exception:
             logger.exception("Exception handling action %s", action)
             raise
@@ -52,10 +127,36 @@ class GameHandler:
     def handle_events(self):
         while self.event_queue:
             event = self.event_queue.popleft()
-            logger.debug("handle event %s with handler %s", event)
+            handler = self.event_handlers.get(type(event))
+            if handler is None:
+                continue
+            logger.debug("handle event %s with handler %s", event, handler)
             try:
-                handler = self.event_handlers[type(event)]
-                handler(event)
+                if self.handler_stats is None:
+                    handler(event)
+                else:
+                    self.handler_stats.call(handler, event)
             except Exception:
                 logger.exception("Exception handle event %s", event)
                 raise
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Get the handler counters by message type, see HandlerStats.stats().
+
+        Raises:
+            RuntimeError if the handler was not created with an Instrumentation level
+        """
+        return self._instrumentation().stats()
+
+    def report(self, limit: int = 20) -> str:
+        """Format the slowest handlers as a table, see HandlerStats.report().
+
+        Raises:
+            RuntimeError if the handler was not created with an Instrumentation level
+        """
+        return self._instrumentation().report(limit)
+
+    def _instrumentation(self) -> HandlerStats:
+        if self.handler_stats is None:
+            raise RuntimeError("The GameHandler is not instrumented.")
+        return self.handler_stats
@@ -0,0 +1,162 @@
+"""Timing and allocation counters for the handlers dispatched by GameHandler.
+
+HandlerStats keeps a slot per action and event type in preallocated arrays,
+so recording a handler call is a dict lookup and a few list updates.
+GameHandler only records calls when it is created with an Instrumentation
+level; the uninstrumented loops are unchanged.
+"""
+from __future__ import annotations
+
+import sys
+import time
+from typing import Callable
+from typing import Type
+
+from azulsummer.models import actions
+from azulsummer.models.enums import Instrumentation
+from azulsummer.models.events import event_types
+
+_perf_counter_ns = time.perf_counter_ns
+_allocated_blocks = sys.getallocatedblocks
+
+
+def message_types() -> list[type]:
+    """Get every Action and Event subclass"""
+    action_types = [
+        value
+        for value in vars(actions).values()
+        if isinstance(value, type)
+        and issubclass(value, actions.Action)
+        and value is not actions.Action
+    ]
+    return [*action_types, *event_types()]
+
+
+class HandlerStats:
+    """Call counts, wall time and allocations of handlers by message type.
+
+    For each action and event type:
+        calls:  The number of messages handled
+        total_ns:  The nanoseconds spent in the handler
+        max_ns:  The slowest call in nanoseconds
+        blocks:  The change in the interpreter's allocated blocks over the
+            calls, with Instrumentation.allocations.  This counts the objects
+            the handlers left alive, e.g. queued messages, less the objects
+            they freed.
+    """
+
+    def __init__(self, level: Instrumentation = Instrumentation.timing) -> None:
+        self.level = level
+        # call(handler, message) calls the handler and records the call
+        self.call: Callable[[Callable, object], None] = (
+            self._call_counting_allocations
+            if level == Instrumentation.allocations
+            else self._call
+        )
+        self.types: list[type] = message_types()
+        self.index: dict[type, int] = {
+            message_type: i for i, message_type in enumerate(self.types)
+        }
+        n_types = len(self.types)
+        self.calls: list[int] = [0] * n_types
+        self.total_ns: list[int] = [0] * n_types
+        self.max_ns: list[int] = [0] * n_types
+        self.blocks: list[int] = [0] * n_types
+
+    def _add_type(self, message_type: type) -> int:
+        """Give a message type defined outside the messages modules a slot"""
+        self.index[message_type] = len(self.types)
+        self.types.append(message_type)
+        for counters in (self.calls, self.total_ns, self.max_ns, self.blocks):
+            counters.append(0)
+        return self.index[message_type]
+
+    def _call(self, handler: Callable, message: object) -> None:
+        index = self.index.get(type(message))
+        if index is None:
+            index = self._add_type(type(message))
+        start = _perf_counter_ns()
+        handler(message)
+        elapsed = _perf_counter_ns() - start
+        self.calls[index] += 1
+        self.total_ns[index] += elapsed
+        if elapsed > self.max_ns[index]:
+            self.max_ns[index] = elapsed
+
+    def _call_counting_allocations(self, handler: Callable, message: object) -> None:
+        index = self.index.get(type(message))
+        if index is None:
+            index = self._add_type(type(message))
+        blocks = _allocated_blocks()
+        start = _perf_counter_ns()
+        handler(message)
+        elapsed = _perf_counter_ns() - start
+        self.blocks[index] += _allocated_blocks() - blocks
+        self.calls[index] += 1
+        self.total_ns[index] += elapsed
+        if elapsed > self.max_ns[index]:
+            self.max_ns[index] = elapsed
+
+    def reset(self) -> None:
+        """Zero every counter"""
+        for counters in (self.calls, self.total_ns, self.max_ns, self.blocks):
+            counters[:] = [0] * len(counters)
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Get the counters of the message types that were handled.
+
+        Returns:
+            Dict of {message type name: {"calls", "total_seconds",
+            "mean_us", "max_us"}}, slowest total first.  "blocks" is added
+            with Instrumentation.allocations.
+        """
+        counts_blocks = self.level == Instrumentation.allocations
+        handled = [i for i, calls in enumerate(self.calls) if calls]
+        handled.sort(key=self.total_ns.__getitem__, reverse=True)
+        stats = {}
+        for i in handled:
+            counters = stats[self.types[i].__name__] = {
+                "calls": self.calls[i],
+                "total_seconds": self.total_ns[i] / 1e9,
+                "mean_us": self.total_ns[i] / self.calls[i] / 1e3,
+                "max_us": self.max_ns[i] / 1e3,
+            }
+            if counts_blocks:
+                counters["blocks"] = self.blocks[i]
+        return stats
+
+    def report(self, limit: int = 20) -> str:
+        """Format the slowest message types as a table.
+
+        Args:
+            limit:  The most message types listed
+
+        Returns:
+            The table, one line per message type and a line of totals
+        """
+        counts_blocks = self.level == Instrumentation.allocations
+        header = f"{'message':<36} {'calls':>8} {'total ms':>10} {'mean us':>9}"
+        header += f" {'max us':>9}"
+        lines = [header + (f" {'blocks':>8}" if counts_blocks else "")]
+        for name, counters in list(self.stats().items())[:limit]:
+            line = (
+                f"{name:<36} {counters['calls']:>8,}"
+                f" {counters['total_seconds'] * 1e3:>10.3f}"
+                f" {counters['mean_us']:>9.2f} {counters['max_us']:>9.2f}"
+            )
+            lines.append(line + (f" {counters['blocks']:>8,}" if counts_blocks else ""))
+        total = f"{'total':<36} {sum(self.calls):>8,} {sum(self.total_ns) / 1e6:>10.3f}"
+        total += f" {'':>9} {'':>9}"
+        lines.append(total + (f" {sum(self.blocks):>8,}" if counts_blocks else ""))
+        lines[-1] = lines[-1].rstrip()
+        return "\n".join(lines)
+
+    def __getitem__(self, message_type: Type) -> dict[str, int]:
+        """Get the raw counters of a message type"""
+        index = self.index[message_type]
+        return {
+            "calls": self.calls[index],
+            "total_ns": self.total_ns[index],
+            "max_ns": self.max_ns[index],
+            "blocks": self.blocks[index],
+        }
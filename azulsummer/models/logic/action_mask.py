@@ -0,0 +1,64 @@
+"""Module containing the legal action mask over the fixed action space"""
+from __future__ import annotations
+
+import numpy as np
+
+from azulsummer.models.action_space import ACQUIRE_OFFSET
+from azulsummer.models.action_space import ACTION_SPACE_SIZE
+from azulsummer.models.action_space import N_ACQUIRE_ACTIONS
+from azulsummer.models.action_space import N_ACQUIRE_SOURCES
+from azulsummer.models.action_space import N_COLORS
+from azulsummer.models.action_space import N_PLACE_ACTIONS
+from azulsummer.models.action_space import PASS_ACTION
+from azulsummer.models.action_space import PLACE_OFFSET
+from azulsummer.models.action_space import acquire_mask
+from azulsummer.models.action_space import placement_mask
+from azulsummer.models.enums import Phase
+from azulsummer.models.enums import StarColor
+from azulsummer.models.enums import TileColor
+from azulsummer.models.game import Game
+
+
+def legal_action_mask(game: Game) -> np.ndarray:
+    """Get the actions available to the current player as a bool array.
+
+    The mask is indexed by the integer actions of action_space and is built
+    from the Tiles array, the player's Board and the wild color without
+    creating DrawPosition or BoardPlacement objects.
+
+    Phase One allows the Acquire actions.  Phase Two allows the Place
+    actions and Pass.  No action is legal in any other phase.
+
+    Returns:
+        Bool array of ACTION_SPACE_SIZE
+    """
+    mask = np.zeros(ACTION_SPACE_SIZE, dtype=bool)
+    if game.phase == Phase.acquire_tile:
+        _set_acquire_mask(mask, game)
+    elif game.phase == Phase.play_tiles:
+        _set_placement_mask(mask, game)
+        mask[PASS_ACTION] = True
+    return mask
+
+
+def _set_acquire_mask(mask: np.ndarray, game: Game) -> None:
+    tiles = game.tiles
+    sources = acquire_mask(
+        tiles.get_acquire_sources(), TileColor[game.wild_tile.name]
+    )
+    acquire = mask[ACQUIRE_OFFSET : ACQUIRE_OFFSET + N_ACQUIRE_ACTIONS].reshape(
+        N_ACQUIRE_SOURCES, N_COLORS
+    )
+    # The table center is the last source row and the last acquire source
+    acquire[: tiles.n_factory_displays] = sources[:-1]
+    acquire[-1] = sources[-1]
+
+
+def _set_placement_mask(mask: np.ndarray, game: Game) -> None:
+    player = game.current_player_index
+    mask[PLACE_OFFSET : PLACE_OFFSET + N_PLACE_ACTIONS] = placement_mask(
+        reserve=game.tiles.view_player_reserve_n(player),
+        board=game.get_player_board(player).board,
+        wild_star_tiles=game.tiles.view_player_board_n(player)[StarColor.Wild],
+        wild_color=TileColor[game.wild_tile.name],
+    )
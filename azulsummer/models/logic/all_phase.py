@@ -20,17 +20,17 @@ from azulsummer.models.game import Game
 
 def increment_turn(game: Game) -> None:
     game.turn += 1
-    game.enqueue_event(TurnIncremented(game))
+    game.emit(TurnIncremented)
 
 
 def increment_phase_turn(game: Game) -> None:
     game.phase_turn += 1
-    game.enqueue_event(PhaseTurnIncremented(game))
+    game.emit(PhaseTurnIncremented)
 
 
 def advance_to_next_player(game):
     game.current_player_index = (game.current_player_index + 1) % game.n_players
-    game.enqueue_event(CurrentPlayerIndexAdvanced(game, game.current_player_index))
+    game.emit(CurrentPlayerIndexAdvanced, game.current_player_index)
 
 
 def advance_phase(action: AdvancePhase) -> None:
@@ -40,7 +40,7 @@ def advance_phase(action: AdvancePhase) -> None:
         action.game.phase = Phase.acquire_tile
     else:
         action.game.phase = Phase((current_phase + 1) % len(Phase))
-    action.game.enqueue_event(PhaseAdvanced(action.game, str(action.game.phase)))
+    action.game.emit(PhaseAdvanced, action.game.phase)
 
 
 def assign_current_player_to_start_player(
@@ -59,12 +59,12 @@ def assign_current_player_to_start_player(
 
 def assign_current_player(game: Game, player_index: int) -> None:
     game.current_player_index = player_index
-    game.enqueue_event(CurrentPlayerSet(game=game, player_index=player_index))
+    game.emit(CurrentPlayerSet, player_index=player_index)
 
 
 def reset_start_player_index_value(action: ResetStartPlayerToken) -> None:
     action.game.start_player_index = None
-    action.game.enqueue_event(StartPlayerTokenWasReset(game=action.game))
+    action.game.emit(StartPlayerTokenWasReset)
 
 
 def advance_round(action: AdvanceRound) -> None:
@@ -74,9 +74,7 @@ def advance_round(action: AdvanceRound) -> None:
         action.game.state.game_round = 1
     else:
         action.game.state.game_round += 1
-    action.game.event_queue.append(
-        RoundAdvanced(game=action.game, round=action.game.state.game_round)
-    )
+    action.game.emit(RoundAdvanced, round=action.game.state.game_round)
 
 
 def advance_wild_tile_index(action: AdvanceWildTileIndex) -> None:
@@ -86,15 +84,13 @@ def advance_wild_tile_index(action: AdvanceWildTileIndex) -> None:
         action.game.state.wild_tile = WildTiles(0)
     else:
         action.game.state.wild_tile = WildTiles(current_wild_tile + 1)
-    action.game.event_queue.append(
-        WildTileIndexAdvanced(action.game, str(action.game.state.wild_tile))
-    )
+    action.game.emit(WildTileIndexAdvanced, action.game.state.wild_tile)
 
 
 def reset_phase_turn(action: ResetPhaseTurn):
     """Reset the Phase Turn to 1 at the start of a phase"""
     action.game.state.phase_turn = 1
-    action.game.event_queue.append(PhaseTurnSetToZero(action.game))
+    action.game.emit(PhaseTurnSetToZero)
 
 
 def acquire_tile(action):
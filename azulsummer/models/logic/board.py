@@ -2,6 +2,10 @@
 from itertools import product
 from typing import Generator
 
+import numpy as np
+
+from azulsummer.models.action_space import PLACE_OFFSET
+from azulsummer.models.action_space import placement_mask
 from azulsummer.models.actions import BoardPlacement
 from azulsummer.models.board import Board
 from azulsummer.models.enums import StarColor
@@ -121,6 +125,23 @@ def generate_available_player_tile_placements(
                 )
 
 
+def generate_available_player_tile_placement_actions(game: Game) -> np.ndarray:
+    """Get the current player's available placements as integer actions.
+
+    The actions are the same placements generate_available_player_tile_placements()
+    yields, in action space order.  See action_space.
+    """
+    player = game.current_player_index
+    board_tiles = game.tiles.view_player_board_n(player)
+    mask = placement_mask(
+        reserve=game.tiles.view_player_reserve_n(player),
+        board=game.get_player_board(player).board,
+        wild_star_tiles=board_tiles[StarColor.Wild],
+        wild_color=getattr(TileColor, game.wild_tile.name),
+    )
+    return PLACE_OFFSET + np.flatnonzero(mask)
+
+
 def color_star_space_is_valid(board: Board, color: StarColor, cost: int) -> bool:
     """Check if a color star tile placement is valid"""
     return star_space_is_empty(board, color, cost)
@@ -15,35 +15,29 @@ from azulsummer.models.events import PlayerScoresInitializedAt5
 
 
 def start_game(action: StartGame):
-    action.game.enqueue_action(InitializeGameState(game=action.game))
-    action.game.enqueue_event(GameStarted(game=action.game))
+    action.game.enqueue(InitializeGameState)
+    action.game.emit(GameStarted)
 
 
 def initialize_game_state(action: InitializeGameState):
     action.game.make_state()  # Creates the new game state
 
-    events = [
-        GameStateInitialized(game=action.game),
-        GameCreatedWithNPlayers(
-            game=action.game, n_players=len(action.game.players)
-        ),
-        BagLoadedWith132Tiles(game=action.game),
-        GameCreatedWithNFactoryDisplays(
-            game=action.game,
-            n_factory_displays=action.game.n_factory_displays,
-        ),
-        PlayerScoresInitializedAt5(game=action.game),
-    ]
-    actions = [
-        AdvancePhase(game=action.game),
-        AdvanceRound(game=action.game),
-        AdvanceWildTileIndex(game=action.game),
-        ResetPhaseTurn(game=action.game),
-        PreparePhaseOne(game=action.game),
-    ]
+    action.game.emit(GameStateInitialized)
+    action.game.emit(GameCreatedWithNPlayers, n_players=len(action.game.players))
+    action.game.emit(BagLoadedWith132Tiles)
+    action.game.emit(
+        GameCreatedWithNFactoryDisplays,
+        n_factory_displays=action.game.n_factory_displays,
+    )
+    action.game.emit(PlayerScoresInitializedAt5)
 
-    for event in events:
-        action.game.enqueue_event(event)
+    action_types = [
+        AdvancePhase,
+        AdvanceRound,
+        AdvanceWildTileIndex,
+        ResetPhaseTurn,
+        PreparePhaseOne,
+    ]
 
-    for action_ in actions:
-        action.game.enqueue_action(action_)
+    for action_type in action_types:
+        action.game.enqueue(action_type)
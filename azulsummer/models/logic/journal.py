@@ -0,0 +1,183 @@
+"""Module containing the make/unmake move logic for searching a game in place
+
+apply_action() plays an integer action of action_space straight onto the
+game's State and returns an UndoToken journaling a copy of every array region
+the action can touch: tile rows, board cells, bonus space counters, scores
+and the counters (turn, phase, phase_turn, current and start player, wild
+tile and active players), along with the Zobrist keys of the Tiles and Board
+changed.  undo_action() writes the copies back, restoring the State byte for
+byte, so a depth first search can explore moves on one game without cloning
+it.
+
+Actions are applied without emitting events or queueing actions, and the
+turn is resolved as the game loop would up to the next player decision.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+from typing import Union
+
+import numpy as np
+
+from azulsummer.models.action_space import ACTION_KIND
+from azulsummer.models.action_space import ACTION_SOURCE
+from azulsummer.models.action_space import ACTION_SPACE_SIZE
+from azulsummer.models.action_space import ACTION_STAR
+from azulsummer.models.action_space import TABLE_CENTER_SOURCE
+from azulsummer.models.action_space import InvalidActionError
+from azulsummer.models.action_space import board_position
+from azulsummer.models.action_space import draw_position
+from azulsummer.models.action_space import placement_cost
+from azulsummer.models.action_space import wild_color_of
+from azulsummer.models.actions import AdvancePhase
+from azulsummer.models.actions import AssignCurrentPlayerToStartPlayer
+from azulsummer.models.actions import ResetPhaseTurn
+from azulsummer.models.board import BitBoard
+from azulsummer.models.board import Board
+from azulsummer.models.enums import ActionKind
+from azulsummer.models.enums import TileIndex
+from azulsummer.models.game import Game
+from azulsummer.models.logic import all_phase
+from azulsummer.models.logic import phase_one
+from azulsummer.models.logic import phase_two
+from azulsummer.models.logic.action_mask import legal_action_mask
+from azulsummer.models.tiles import Tiles
+
+
+@dataclass(slots=True)
+class UndoToken:
+    """Journal of the State regions an applied action could change.
+
+    Tokens must be undone in the reverse order their actions were applied.
+    """
+
+    action: int
+    # (view into the State, copy of the view before the action)
+    regions: list[tuple[np.ndarray, np.ndarray]]
+    # (Tiles or Board, its Zobrist key before the action)
+    keys: list[tuple[Union[Tiles, Board], int]]
+    # (BitBoard, its bits before the action) for BitBoard placements
+    bits: Optional[tuple[BitBoard, int]] = None
+
+
+def apply_action(game: Game, action: int, check: bool = True) -> UndoToken:
+    """Apply a player decision to the game in place.
+
+    Acquire actions take tiles in Phase One, Place actions play tiles and
+    Pass leaves Phase Two.  The turn then passes to the next player, or at
+    the end of Phase One the game moves to Phase Two.
+
+    Args:
+        game:  The Game, changed in place
+        action:  A legal integer action for the current player
+        check:  Check the action against the legal action mask.  Searches
+            choosing actions from the mask themselves can skip the check.
+
+    Returns:
+        The UndoToken restoring the game, see undo_action()
+
+    Raises:
+        InvalidActionError if check is set and the action is not legal for
+        the current player
+    """
+    if check and not (
+        0 <= action < ACTION_SPACE_SIZE and legal_action_mask(game)[action]
+    ):
+        raise InvalidActionError(f"{action} is not a legal action.")
+    kind = int(ACTION_KIND[action])
+    state = game.state
+    player = game.current_player_index
+    regions = [_save(state._counters), _save(state.score)]
+    token = UndoToken(action, regions, [(state.tiles, state.tiles.key)])
+
+    emits_events = game.emits_events
+    game.emits_events = False
+    try:
+        if kind == ActionKind.Acquire:
+            _apply_acquire(game, action, player, regions)
+        elif kind == ActionKind.Place:
+            _apply_place(game, action, player, token)
+        else:
+            phase_two.pass_turn(game)
+            _advance_phase_two_turn(game)
+    finally:
+        game.emits_events = emits_events
+    return token
+
+
+def undo_action(game: Game, token: UndoToken) -> None:
+    """Restore the game to its state before the token's action was applied"""
+    for view, saved in token.regions:
+        view[...] = saved
+    for owner, key in token.keys:
+        owner.key = key
+    if token.bits is not None:
+        board, bits = token.bits
+        board.bits = bits
+
+
+def _save(view: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    return view, view.copy()
+
+
+def _apply_acquire(game: Game, action: int, player: int, regions: list) -> None:
+    tiles = game.tiles._tiles
+    layout = game.layout
+    source = int(ACTION_SOURCE[action])
+    if source == TABLE_CENTER_SOURCE:
+        source_row = TileIndex.TableCenter
+    else:
+        source_row = layout.factory_display_rows[source]
+        regions.append(_save(tiles[source_row]))
+    regions.append(_save(tiles[TileIndex.TableCenter]))
+    regions.append(_save(tiles[layout.player_reserve_rows[player]]))
+
+    draw = draw_position(action, tiles[source_row], wild_color_of(game.wild_tile))
+    phase_one.handle_tile_acquisition(game, draw)
+    if game.phase_one_end_criteria_are_met():
+        _begin_phase_two(game)
+    else:
+        all_phase.increment_turn(game)
+        all_phase.increment_phase_turn(game)
+        all_phase.advance_to_next_player(game)
+
+
+def _begin_phase_two(game: Game) -> None:
+    """Move to Phase Two as the AdvancePhase and PreparePhaseTwo actions do"""
+    all_phase.advance_phase(AdvancePhase(game))
+    all_phase.reset_phase_turn(ResetPhaseTurn(game))
+    game.reset_active_players()
+    all_phase.assign_current_player_to_start_player(
+        AssignCurrentPlayerToStartPlayer(game)
+    )
+
+
+def _apply_place(game: Game, action: int, player: int, token: UndoToken) -> None:
+    tiles = game.tiles._tiles
+    layout = game.layout
+    star = int(ACTION_STAR[action])
+    board = game.get_player_board(player)
+    token.regions += [
+        _save(tiles[layout.player_reserve_rows[player]]),
+        _save(tiles[layout.player_board_rows[player] + star]),
+        _save(tiles[TileIndex.Tower]),
+        _save(board.board[star]),
+        _save(board.remaining),
+    ]
+    token.keys.append((board, board.key))
+    if isinstance(board, BitBoard):
+        token.bits = (board, board.bits)
+
+    phase_two.place_tiles(
+        game,
+        board_position(action),
+        placement_cost(action, wild_color_of(game.wild_tile)),
+    )
+    _advance_phase_two_turn(game)
+
+
+def _advance_phase_two_turn(game: Game) -> None:
+    all_phase.increment_turn(game)
+    all_phase.increment_phase_turn(game)
+    phase_two.advance_to_next_active_player(game)
@@ -1,5 +1,7 @@
 """Module containing the logic for Phase One of an Azul Summer Pavilion game"""
 
+from azulsummer.models.action_space import encode_draw
+from azulsummer.models.action_space import wild_color_of
 from azulsummer.models.actions import AdvancePhase
 from azulsummer.models.actions import AssessPhaseOneTileDrawAction
 from azulsummer.models.actions import AssignCurrentPlayerToStartPlayer
@@ -40,16 +42,16 @@ def prepare_phase_one(action: PreparePhaseOne):
     - Set current_player to first_player
     - Reset first_player flag
     """
-    action.game.enqueue_event(BeginningPhaseOnePreparation(game=action.game))
-    actions = [
-        FillSupply(game=action.game),
-        FillFactoryDisplays(game=action.game),
-        AssignCurrentPlayerToStartPlayer(game=action.game),
-        ResetStartPlayerToken(game=action.game),
-        PhaseOnePreparationComplete(game=action.game),
+    action.game.emit(BeginningPhaseOnePreparation)
+    action_types = [
+        FillSupply,
+        FillFactoryDisplays,
+        AssignCurrentPlayerToStartPlayer,
+        ResetStartPlayerToken,
+        PhaseOnePreparationComplete,
     ]
-    for action_ in actions:
-        action.game.enqueue_action(action_)
+    for action_type in action_types:
+        action.game.enqueue(action_type)
 
 
 def phase_one_preparation_complete(action: PhaseOnePreparationComplete) -> None:
@@ -59,8 +61,8 @@ def phase_one_preparation_complete(action: PhaseOnePreparationComplete) -> None:
 
     Once phase one preparation is complete the game enters into the first turn.
     """
-    action.game.enqueue_event(PhaseOnePrepared(game=action.game))
-    action.game.enqueue_action(PlayPhaseOneTurn(game=action.game))
+    action.game.emit(PhaseOnePrepared)
+    action.game.enqueue(PlayPhaseOneTurn)
 
 
 def prepare_phase_one_turn(action: PreparePhaseOneTurn):
@@ -73,7 +75,7 @@ def prepare_phase_one_turn(action: PreparePhaseOneTurn):
     all_phase.increment_turn(action.game)
     all_phase.increment_phase_turn(action.game)
     all_phase.advance_to_next_player(action.game)
-    action.game.enqueue_action(PlayPhaseOneTurn(game=action.game))
+    action.game.enqueue(PlayPhaseOneTurn)
 
 
 def play_phase_one_turn(action: PlayPhaseOneTurn):
@@ -83,40 +85,45 @@ def play_phase_one_turn(action: PlayPhaseOneTurn):
     - Transfer the tiles drawn to the player reserve, move the rest to the center
     - Resolve the turn
     """
-    action.game.enqueue_event(
-        BeginningTurn(action.game, action.game.turn, action.game.phase_turn, action.game.current_player_index))
+    action.game.emit(
+        BeginningTurn,
+        action.game.turn,
+        action.game.phase_turn,
+        action.game.current_player_index,
+    )
     draws = [
         *tiles.generate_acquire_tile_draws(
             tiles=action.game.tiles, wild_color=action.game.wild_tile
         )
     ]
-    action.game.enqueue_event(PhaseOneDrawsGenerated(action.game, [*map(str, draws)]))
+    action.game.emit(PhaseOneDrawsGenerated, tuple(draws))
 
     draw_to_play = action.game.current_player.assess(
         AssessPhaseOneTileDrawAction(action.game, draws)
     )
-    action.game.enqueue_event(
-        PlayerSelectedTilesToAcquire(
-            action.game, action.game.current_player_index, str(draw_to_play)
-        )
+    action.game.action_history.append(
+        encode_draw(draw_to_play, wild_color_of(action.game.wild_tile))
+    )
+    action.game.emit(
+        PlayerSelectedTilesToAcquire, action.game.current_player_index, draw_to_play
     )
 
     handle_tile_acquisition(game=action.game, draw_position=draw_to_play)
-    action.game.enqueue_action(ResolvePhaseOneTurn(action.game))
+    action.game.enqueue(ResolvePhaseOneTurn)
 
 
 def resolve_phase_one_turn(action) -> None:
     if phase_one_end_criteria_are_met(action.game):
-        action.game.enqueue_action(AdvancePhase(action.game))
-        action.game.enqueue_action(PreparePhaseTwo(action.game))
+        action.game.enqueue(AdvancePhase)
+        action.game.enqueue(PreparePhaseTwo)
     else:
-        action.game.enqueue_action(PreparePhaseOneTurn(action.game))
+        action.game.enqueue(PreparePhaseOneTurn)
 
 
 def phase_one_end_criteria_are_met(game: Game) -> bool:
     """Verify if the criteria to end phase one have been met"""
     if game.phase_one_end_criteria_are_met():
-        game.enqueue_event(PhaseOneEndCriteriaHaveBeenMet(game))
+        game.emit(PhaseOneEndCriteriaHaveBeenMet)
         return True
 
 
@@ -125,8 +132,7 @@ def handle_tile_acquisition(game: Game, draw_position: DrawPosition) -> None:
     Handles the tile acquisition process for Phase One
     - Transfers the selected tile(s) to the player
     - Handle if the player is the first to draw from the center
-    - Transfer tiles to the middle from the factory display
-    - Enqueue turn resolution action
+    - Transfer the rest of a factory display's tiles to the middle
     """
     source: TilePosition = draw_position.as_tile_position()
     destination: TilePosition = TilePosition(
@@ -141,9 +147,10 @@ def handle_tile_acquisition(game: Game, draw_position: DrawPosition) -> None:
     ):
         handle_first_draw_from_table_center(game=game, draw_position=draw_position)
 
-    discard_from_factory_display_to_table_center(
-        game=game, factory_display_n=draw_position.tiles_position
-    )
+    if draw_position.location is TileIndex.FactoryDisplay:
+        discard_from_factory_display_to_table_center(
+            game=game, factory_display_n=draw_position.tiles_position
+        )
 
 
 def player_is_first_to_draw_from_table_center(
@@ -157,9 +164,7 @@ def player_is_first_to_draw_from_table_center(
         draw_position.location is TileIndex.TableCenter
         and game.start_player_index is None
     ):
-        game.enqueue_event(
-            PlayerIsFirstToDrawFromTableCenter(game, game.current_player_index)
-        )
+        game.emit(PlayerIsFirstToDrawFromTableCenter, game.current_player_index)
         return True
 
 
@@ -182,7 +187,7 @@ def set_starting_player(game: Game, player_index: int) -> None:
     Set the starting player for the subsequent play_tile and acquire_tile phases.
     """
     game.start_player_index = player_index
-    game.enqueue_event(StartPlayerTokenWasSet(game=game, player=player_index))
+    game.emit(StartPlayerTokenWasSet, player=player_index)
 
 
 def discard_from_factory_display_to_table_center(
@@ -191,18 +196,18 @@ def discard_from_factory_display_to_table_center(
     """
     Un-drawn tiles in a factory display are discarded to the table center.
     """
-    moved_tiles = TileArray(
-        game.factory_display_tile_distribution(factory_display_n=factory_display_n)
-    )
-    game.discard_from_factory_display_to_center(factory_display_n)
-    game.enqueue_event(
-        DiscardTilesFromFactoryDisplayToTableCenter(
-            game=game, factory_display=factory_display_n, tiles_moved=str(moved_tiles)
+    if game.emits_events:
+        moved_tiles = TileArray(
+            game.factory_display_tile_distribution(factory_display_n).tolist()
         )
-    )
+        game.emit(
+            DiscardTilesFromFactoryDisplayToTableCenter,
+            factory_display=factory_display_n,
+            tiles_moved=moved_tiles,
+        )
+    game.discard_from_factory_display_to_center(factory_display_n)
 
 
 def fill_factory_displays(action: FillFactoryDisplays) -> None:
     """Fills all factory displays at start of Phase One"""
-    for display in range(action.game.n_factory_displays):
-        tiles.fill_factory_display(game=action.game, nth=display)
+    tiles.fill_factory_displays(game=action.game)
@@ -1,36 +1,49 @@
 """Module containing the logic for Phase Two of an Azul Summer Pavilion game"""
 
+from azulsummer.models.action_space import PASS_ACTION
+from azulsummer.models.action_space import encode_board_placement
+from azulsummer.models.action_space import wild_color_of
 from azulsummer.models.actions import AssignCurrentPlayerToStartPlayer
+from azulsummer.models.actions import BoardPlacement
 from azulsummer.models.actions import PhaseTwoPreparationComplete
 from azulsummer.models.actions import PlayPhaseTwoTurn
 from azulsummer.models.actions import ResetPhaseTurn
 from azulsummer.models.actions import SelectTilePlacement
 from azulsummer.models.actions import SetAllPlayersActive
+from azulsummer.models.enums import StarColor
+from azulsummer.models.enums import TileColor
 from azulsummer.models.events import AllPlayersSetToActive
+from azulsummer.models.events import CurrentPlayerIndexAdvanced
 from azulsummer.models.events import PhaseTwoPrepared
 from azulsummer.models.events import PhaseTwoTilePlacementsGenerated
+from azulsummer.models.events import PlayerPassed
+from azulsummer.models.events import TilesPlacedOnBoard
+from azulsummer.models.game import Game
+from azulsummer.models.logic import score
 from azulsummer.models.logic.board import generate_available_player_tile_placements
+from azulsummer.models.position import BoardPosition
+from azulsummer.models.tile_array import TileArray
 
 
 def prepare_phase_two(action):
-    actions = [
-        ResetPhaseTurn(game=action.game),
-        SetAllPlayersActive(game=action.game),
-        AssignCurrentPlayerToStartPlayer(game=action.game),
-        PhaseTwoPreparationComplete(game=action.game),
+    action_types = [
+        ResetPhaseTurn,
+        SetAllPlayersActive,
+        AssignCurrentPlayerToStartPlayer,
+        PhaseTwoPreparationComplete,
     ]
-    for action_ in actions:
-        action.game.enqueue_action(action_)
+    for action_type in action_types:
+        action.game.enqueue(action_type)
 
 
 def phase_two_preparation_complete(action: PhaseTwoPreparationComplete) -> None:
-    action.game.enqueue_event(PhaseTwoPrepared(game=action.game))
-    action.game.enqueue_action(PlayPhaseTwoTurn(game=action.game))
+    action.game.emit(PhaseTwoPrepared)
+    action.game.enqueue(PlayPhaseTwoTurn)
 
 
 def set_all_players_active(action: SetAllPlayersActive) -> None:
     action.game.reset_active_players()
-    action.game.enqueue_event(AllPlayersSetToActive(action.game))
+    action.game.emit(AllPlayersSetToActive)
 
 
 def prepare_phase_two_turn(action):
@@ -41,32 +54,84 @@ def prepare_phase_two_turn(action):
 
 def play_phase_two_turn(action: PlayPhaseTwoTurn):
     board_placements = [*generate_available_player_tile_placements(action.game)]
-    action.game.enqueue_event(PhaseTwoTilePlacementsGenerated(action.game, [*map(str, board_placements)]))
+    if action.game.emits_events:
+        action.game.emit(
+            PhaseTwoTilePlacementsGenerated,
+            tuple(
+                (placement.board_position, placement.tile_cost)
+                for placement in board_placements
+            ),
+        )
     tile_placement = action.game.current_player.assess(
         SelectTilePlacement(action.game, board_placements)
     )
-    # action.game.enqueue_event()
+    action.game.action_history.append(encode_tile_placement(tile_placement))
     handle_player_action(tile_placement)
-    # enqueue_
 
-    pass
-
-
-def handle_player_action(action):
-    # if player_action is Pass:
-    #   handle_passing
-    # else:
-    #    play_tile(action)
-    pass
 
-
-def play_tile(action):
-    # Play tile to board
-    # Move tiles from hand to board
-    # Update score
-    # evaluate_bonus_space()
-
-    pass
+def encode_tile_placement(action) -> int:
+    """Encode the action chosen in a phase two turn, see action_space"""
+    if isinstance(action, BoardPlacement):
+        return encode_board_placement(
+            action.board_position,
+            action.tile_cost,
+            wild_color_of(action.game.wild_tile),
+        )
+    return PASS_ACTION
+
+
+def handle_player_action(action) -> None:
+    """Play the tile placement selected by the current player"""
+    if isinstance(action, BoardPlacement):
+        place_tiles(action.game, action.board_position, action.tile_cost)
+
+
+def place_tiles(game: Game, board_position: BoardPosition, tile_cost: TileArray) -> int:
+    """Play tiles from the current player's reserve to a space on their board.
+
+    One tile of the placed color covers the space and the rest of the cost,
+    the other tiles of that color and any wild tiles, is discarded to the
+    tower.  A colored star takes tiles of its own color and the wild star
+    takes the non-wild color of the cost, or the wild color if the cost is
+    only wild tiles.  The player scores the placement, see Board.place_tile().
+
+    Surrounded bonus spaces are not claimed here.
+
+    Args:
+        game:  The Game
+        board_position:  The star and tile value of the space
+        tile_cost:  The tiles paid from the reserve
+
+    Returns:
+        The points scored
+    """
+    player = game.current_player_index
+    star = board_position.star
+    color = _placed_color(star, tile_cost, game.wild_tile.name)
+    points = game.get_player_board(player).place_tile(star, board_position.tile_value)
+
+    layout = game.layout
+    reserve_row = layout.player_reserve_rows[player]
+    placed = [0] * 6
+    placed[color] = 1
+    discarded = list(tile_cost)
+    discarded[color] -= 1
+    game.move_tiles(reserve_row, layout.player_board_rows[player] + star, placed)
+    game.move_tiles(reserve_row, game.tower_index, discarded)
+    game.emit(TilesPlacedOnBoard, player, board_position, TileArray(tile_cost))
+    score.increment_score(game, points)
+    return points
+
+
+def _placed_color(star: StarColor, tile_cost, wild_name: str) -> TileColor:
+    """Get the color of the tile covering a space"""
+    if star != StarColor.Wild:
+        return TileColor(star)
+    wild_color = TileColor[wild_name]
+    for color, count in enumerate(tile_cost):
+        if count and color != wild_color:
+            return TileColor(color)
+    return wild_color
 
 
 def handle_player_passing(action):
@@ -95,10 +160,6 @@ def set_start_player():
     pass
 
 
-def increment_score():
-    pass
-
-
 def generate_available_plays():
     pass
 
@@ -123,8 +184,25 @@ def draw_from_supply_space():
     pass
 
 
-def pass_turn():
-    pass
+def pass_turn(game: Game) -> None:
+    """Remove the current player from the players still playing tiles"""
+    game.state.active_players[game.current_player_index] = 0
+    game.emit(PlayerPassed, game.current_player_index)
+
+
+def advance_to_next_active_player(game: Game) -> None:
+    """Advance to the next player still playing tiles.
+
+    The current player is kept when no other player is active.
+    """
+    active = game.active_players
+    n_players = game.n_players
+    for step in range(1, n_players + 1):
+        player = (game.current_player_index + step) % n_players
+        if active[player]:
+            game.current_player_index = player
+            game.emit(CurrentPlayerIndexAdvanced, player)
+            return
 
 
 def generate_saved_tiles_options():
@@ -1,5 +1,6 @@
 from azulsummer.models.enums import StarColor
 from azulsummer.models.events import DecrementedPlayerScore
+from azulsummer.models.events import IncrementedPlayerScore
 from azulsummer.models.game import Game
 
 # TODO:  Are these value objects really in the right place?
@@ -30,15 +31,26 @@ def evaluate_complete_stars_score(tiles, star: StarColor) -> int:
 
 
 def decrement_score(game: Game, points: int) -> None:
+    """Reduce the current player's score by points, down to a minimum of 0"""
     player_index = game.current_player_index
-    original_score = game.score[player_index]
-    game.score[player_index] -= points
-    decreased_by = original_score - game.score[player_index]
-    game.enqueue_event(
-        DecrementedPlayerScore(
-            game=game,
-            decreased_by=decreased_by,
-            original_score=original_score,
-            new_score=game.score[player_index],
-        )
+    original_score = int(game.score[player_index])
+    game.score[player_index] = max(original_score - points, 0)
+    game.emit(
+        DecrementedPlayerScore,
+        decreased_by=original_score - int(game.score[player_index]),
+        original_score=original_score,
+        new_score=int(game.score[player_index]),
+    )
+
+
+def increment_score(game: Game, points: int) -> None:
+    """Increase the current player's score by points"""
+    player_index = game.current_player_index
+    original_score = int(game.score[player_index])
+    game.score[player_index] = original_score + points
+    game.emit(
+        IncrementedPlayerScore,
+        increased_by=points,
+        original_score=original_score,
+        new_score=original_score + points,
     )
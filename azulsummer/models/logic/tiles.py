@@ -6,11 +6,16 @@ from typing import Generator
 
 import numpy as np
 
+from azulsummer.models.action_space import ACQUIRE_OFFSET
+from azulsummer.models.action_space import N_COLORS
+from azulsummer.models.action_space import TABLE_CENTER_SOURCE
+from azulsummer.models.action_space import acquire_mask
 from azulsummer.models.actions import FillSupply
 from azulsummer.models.enums import TileColor
 from azulsummer.models.enums import TileIndex
 from azulsummer.models.enums import TileTarget
 from azulsummer.models.enums import WildTiles
+from azulsummer.models.events import FactoryDisplaysFilled
 from azulsummer.models.events import RefillBagFromTower
 from azulsummer.models.events import TilesMoved
 from azulsummer.models.game import Game
@@ -26,7 +31,9 @@ def generate_draws(
     nth_tile_position: int,
     wild_position: TileColor,
 ) -> Generator[DrawPosition, None, None]:
-    if tile_distribution.sum() == 0:
+    tile_distribution = tile_distribution.tolist()
+    n_tiles = sum(tile_distribution)
+    if n_tiles == 0:
         return
     wild_value: int = min(tile_distribution[wild_position], 1)
     for tile_position, tile_value in enumerate(tile_distribution):
@@ -41,11 +48,9 @@ def generate_draws(
                 ),
             )
         else:
-            if (tile_position == wild_position) and (
-                tile_distribution.sum() == tile_value
-            ):
+            if (tile_position == wild_position) and (n_tiles == tile_value):
                 yield DrawPosition(
-                    location=TileIndex.FactoryDisplay,
+                    location=tile_index,
                     tiles_position=nth_tile_position,
                     tiles=TileArray.from_dict({wild_position: wild_value}),
                 )
@@ -85,6 +90,20 @@ def generate_acquire_tile_draws(
     )
 
 
+def generate_acquire_tile_draw_actions(
+    tiles: Tiles, wild_color: WildTiles
+) -> np.ndarray:
+    """Get the Acquire Tile draws as integer actions, see action_space.
+
+    The actions are in the order generate_acquire_tile_draws() yields them.
+    """
+    wild_position: TileColor = TileColor[wild_color.name]
+    mask = acquire_mask(tiles.get_acquire_sources(), wild_position)
+    rows, colors = np.nonzero(mask)
+    sources = np.where(rows == tiles.n_factory_displays, TABLE_CENTER_SOURCE, rows)
+    return ACQUIRE_OFFSET + sources * N_COLORS + colors
+
+
 def fill_factory_display(game: Game, nth: int):
     """Load a single factory display"""
     draw_from_bag(
@@ -94,6 +113,43 @@ def fill_factory_display(game: Game, nth: int):
     )
 
 
+def fill_factory_displays(game: Game) -> None:
+    """Load every factory display from the bag with a single draw.
+
+    The tiles are dealt as if each display were filled in turn with
+    fill_factory_display().  When the bag runs out, every tile left in it is
+    dealt, the bag is refilled from the tower and dealing continues with the
+    same display.  Displays are left short once the bag and tower are both
+    empty.
+    """
+    sizes = [game.factory_display_tile_max] * game.n_factory_displays
+    bag = game.bag_tiles
+    bag_quantity = int(bag.sum())
+    if bag_quantity >= sum(sizes):
+        tiles = game.random.random_tile_split(bag, sizes)
+    else:
+        from_bag = _deal_sizes(sizes, bag_quantity)
+        tiles = game.random.random_tile_split(bag, from_bag)
+        tower = game.tower_tiles.copy()
+        refill_bag_from_tower(game)
+        from_tower = _deal_sizes(
+            [size - dealt for size, dealt in zip(sizes, from_bag)], int(tower.sum())
+        )
+        tiles += game.random.random_tile_split(tower, from_tower)
+    game.state.tiles.deal_to_factory_displays(game.bag_index, tiles)
+    if game.emits_events:
+        game.emit(FactoryDisplaysFilled, tuple(map(TileArray, tiles.tolist())))
+
+
+def _deal_sizes(sizes: list[int], n_tiles: int) -> list[int]:
+    """Split n_tiles across groups of at most sizes, filling groups in order"""
+    dealt = []
+    for size in sizes:
+        dealt.append(min(size, n_tiles))
+        n_tiles -= dealt[-1]
+    return dealt
+
+
 def fill_supply(action: FillSupply) -> None:
     tiles_to_draw: int = action.game.supply_deficit
     draw_from_bag(
@@ -147,42 +203,28 @@ def move_tiles(
     """Move an array of tiles from the source to the destination."""
     source_index = parse_position(game, source)
     destination_index = parse_position(game, destination)
+    if not game.emits_events:
+        game.move_tiles(source_index, destination_index, tiles)
+        return
+    # Copied before the move since tiles may be a view of the source row
+    moved = TileArray(np.asarray(tiles).tolist())
     game.move_tiles(source_index, destination_index, tiles)
-    # TODO:  Update TilesMoved event handler to make the source, destination
-    #  and array strings rather than doing this at the logic level.  This will
-    #  ensure the complete information set will transfer with the event rather
-    #  than the stringified version.
-    game.enqueue_event(
-        TilesMoved(game, str(source), str(destination), str(TileArray(tiles)))
-    )
+    game.emit(TilesMoved, source, destination, moved)
 
 
 def refill_bag_from_tower(game):
     """Refill the bag with the tower's tiles"""
     if game.tower_quantity:
+        tower_tiles = TileArray(game.tower_tiles.tolist())
         move_tiles(
             game,
             source=TilePosition(TileTarget.Tower),
             destination=TilePosition(TileTarget.Bag),
-            tiles=game.tower_tiles,
+            tiles=tower_tiles,
         )
-        game.enqueue_event(RefillBagFromTower(game, game.tower_tiles))
+        game.emit(RefillBagFromTower, tower_tiles)
 
 
 def parse_position(game, position: TilePosition) -> int:
-    if position.location == TileTarget.Bag:
-        return game.bag_index
-    elif position.location == TileTarget.Tower:
-        return game.tower_index
-    elif position.location == TileTarget.TableCenter:
-        return game.table_center_index
-    elif position.location == TileTarget.Supply:
-        return game.supply_index
-    elif position.location == TileTarget.FactoryDisplay:
-        return game.factory_display_index + position.nth
-    elif position.location == TileTarget.PlayerBoard:
-        return game.player_board_index + (game.player_board_row_count * position.nth)
-    elif position.location == TileTarget.PlayerReserve:
-        return game.player_reserve_index + position.nth
-    else:
-        raise ValueError("Position not found")
\ No newline at end of file
+    """Get the tile row index of a TilePosition from the game's TileLayout"""
+    return game.layout.row(position.location, position.nth)
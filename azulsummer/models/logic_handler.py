@@ -1,5 +1,4 @@
 """Contains the mapping for action/event messages and the associated function """
-import pprint
 from typing import Callable
 from typing import Type
 
@@ -32,10 +31,12 @@ from azulsummer.models.events import CurrentPlayerIndexAdvanced
 from azulsummer.models.events import CurrentPlayerSet
 from azulsummer.models.events import DecrementedPlayerScore
 from azulsummer.models.events import DiscardTilesFromFactoryDisplayToTableCenter
+from azulsummer.models.events import FactoryDisplaysFilled
 from azulsummer.models.events import GameCreatedWithNFactoryDisplays
 from azulsummer.models.events import GameCreatedWithNPlayers
 from azulsummer.models.events import GameStarted
 from azulsummer.models.events import GameStateInitialized
+from azulsummer.models.events import IncrementedPlayerScore
 from azulsummer.models.events import LoadedTilesToFactoryDisplay
 from azulsummer.models.events import LoadedTilesToSupply
 from azulsummer.models.events import PhaseAdvanced
@@ -47,6 +48,7 @@ from azulsummer.models.events import PhaseTurnSetToZero
 from azulsummer.models.events import PhaseTwoPrepared
 from azulsummer.models.events import PhaseTwoTilePlacementsGenerated
 from azulsummer.models.events import PlayerIsFirstToDrawFromTableCenter
+from azulsummer.models.events import PlayerPassed
 from azulsummer.models.events import PlayerScoresInitializedAt5
 from azulsummer.models.events import PlayerSelectedTilesToAcquire
 from azulsummer.models.events import RefillBagFromTower
@@ -57,6 +59,7 @@ from azulsummer.models.events import StartTokenReset
 from azulsummer.models.events import TileDrawGenerated
 from azulsummer.models.events import TilesDrawnFromBag
 from azulsummer.models.events import TilesMoved
+from azulsummer.models.events import TilesPlacedOnBoard
 from azulsummer.models.events import TurnIncremented
 from azulsummer.models.events import WildTileIndexAdvanced
 from azulsummer.models.logic import all_phase
@@ -118,7 +121,7 @@ ACTION_HANDLERS: dict[Type[actions.Action], Callable] = {
 
 
 def DEFAULT_EVENT_HANDLER(args):
-    pprint.pprint(args)
+    print(args)
 
 
 EVENT_HANDLERS = {
@@ -140,6 +143,7 @@ EVENT_HANDLERS = {
     GameCreatedWithNFactoryDisplays: DEFAULT_EVENT_HANDLER,
     TileDrawGenerated: DEFAULT_EVENT_HANDLER,
     TilesMoved: DEFAULT_EVENT_HANDLER,
+    FactoryDisplaysFilled: DEFAULT_EVENT_HANDLER,
     RefillBagFromTower: DEFAULT_EVENT_HANDLER,
     TilesDrawnFromBag: DEFAULT_EVENT_HANDLER,
     CurrentPlayerSet: DEFAULT_EVENT_HANDLER,
@@ -148,6 +152,9 @@ EVENT_HANDLERS = {
     PlayerSelectedTilesToAcquire: DEFAULT_EVENT_HANDLER,
     StartPlayerTokenWasSet: DEFAULT_EVENT_HANDLER,
     DecrementedPlayerScore: DEFAULT_EVENT_HANDLER,
+    IncrementedPlayerScore: DEFAULT_EVENT_HANDLER,
+    TilesPlacedOnBoard: DEFAULT_EVENT_HANDLER,
+    PlayerPassed: DEFAULT_EVENT_HANDLER,
     PlayerIsFirstToDrawFromTableCenter: DEFAULT_EVENT_HANDLER,
     DiscardTilesFromFactoryDisplayToTableCenter: DEFAULT_EVENT_HANDLER,
     TurnIncremented: DEFAULT_EVENT_HANDLER,
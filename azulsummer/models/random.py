@@ -1,30 +1,170 @@
 from __future__ import annotations
 
+from array import array
 from typing import Optional
+from typing import Union
 
 import numpy as np
 
-from models.tile_array import TileArray
+from azulsummer.models.sampling import draw_small
+from azulsummer.models.sampling import draw_split
+from azulsummer.models.tile_array import TileArray
+
+Seed = Union[int, np.random.SeedSequence]
+
+
+def game_seeds(seed: Optional[Seed], n_games: int) -> list[np.random.SeedSequence]:
+    """Spawn independent seeds for n_games from a single master seed.
+
+    The same master seed always gives the same game seeds.  Spawning from a
+    spawned seed again gives nested streams, so a pool can hand each worker
+    one seed and have the worker spawn the seeds for its own games.
+
+    Args:
+        seed:  Master int seed or SeedSequence.  None draws fresh entropy.
+        n_games:  The number of seeds to spawn
+
+    Returns:
+        A SeedSequence per game, each accepted as a Game or RandomTileDraw seed
+    """
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return seed.spawn(n_games)
 
 
 class RandomTileDraw:
-    """Class used for randomly generating tile draws"""
+    """Class used for randomly generating tile draws
+
+    Uniform variates are generated buffer_size at a time and handed out from
+    the buffer, so each tile drawn costs a list lookup rather than a call into
+    the Generator.  The draws depend only on the seed, not on buffer_size.
 
-    def __init__(self, seed: Optional[int] = None) -> None:
-        if seed is None:
-            seed = 0
-        self.seed = seed
+    Setting draw_log to an array("B") logs the 6 color counts of every draw,
+    each group of a split being a draw, e.g. to verify a replay.
+
+    A stream pickles as the Generator state of its last buffer refill rather
+    than the buffered variates, and unpickles continuing from its position.
+    """
+
+    def __init__(self, seed: Optional[Seed] = None, buffer_size: int = 1024) -> None:
+        """Initialize the tile draw stream.
+
+        Args:
+            seed:  Int seed or a SeedSequence such as one from game_seeds().
+                None draws fresh entropy, which is kept in seed_sequence so
+                the stream can still be reproduced.
+            buffer_size:  The number of uniform variates generated at a time
+        """
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        self.seed_sequence: np.random.SeedSequence = seed
+        self.seed: int = seed.entropy
+        self.buffer_size = buffer_size
         self.rng: np.random.Generator = np.random.default_rng(seed)
+        self._buffer: list[float] = []
+        self._position: int = 0
+        # The Generator state before the last refill and the variates carried
+        # over into the refilled buffer, see __reduce__()
+        self._refill: Optional[tuple[dict, list[float]]] = None
+        self.draw_log: Optional[array] = None
 
     def __repr__(self):
-        return f"{self.__class__.__name__}(seed={self.seed})"
+        return (
+            f"{self.__class__.__name__}(seed={self.seed}, "
+            f"spawn_key={self.seed_sequence.spawn_key})"
+        )
 
     def __eq__(self, other):
-        return self.seed == other.seed
+        return (self.seed, self.seed_sequence.spawn_key) == (
+            other.seed,
+            other.seed_sequence.spawn_key,
+        )
+
+    def __reduce__(self):
+        if self._refill is None:
+            refill = (self.rng.bit_generator.state, [], 0)
+        else:
+            state, carried = self._refill
+            refill = (state, carried, len(self._buffer) - len(carried))
+        return (
+            _restore_tile_draw,
+            (self.seed_sequence, self.buffer_size, *refill, self._position),
+            {"draw_log": self.draw_log},
+        )
+
+    def spawn(self, n: int) -> list[RandomTileDraw]:
+        """Create n independent child streams of this stream"""
+        return [
+            RandomTileDraw(child, self.buffer_size)
+            for child in self.seed_sequence.spawn(n)
+        ]
+
+    def uniforms(self, n: int) -> list[float]:
+        """Take the next n uniform variates in [0, 1) from the buffer"""
+        end = self._position + n
+        if end > len(self._buffer):
+            carried = self._buffer[self._position :]
+            self._refill = (self.rng.bit_generator.state, carried)
+            self._buffer = carried + self.rng.random(max(self.buffer_size, n)).tolist()
+            self._position, end = 0, n
+        values = self._buffer[self._position : end]
+        self._position = end
+        return values
 
     def random_tile_distribution(
         self, tiles: np.ndarray, n_tiles_to_draw: int
     ) -> TileArray:
-        return TileArray(
-            self.rng.multivariate_hypergeometric(tiles, n_tiles_to_draw).astype("B")
-        )
+        """Draw tiles without replacement, see sampling.draw_small().
+
+        Args:
+            tiles:  The count of each color available to draw
+            n_tiles_to_draw:  The number of tiles to draw
+
+        Returns:
+            TileArray of the count of each color drawn
+
+        Raises:
+            ValueError if there are fewer than n_tiles_to_draw tiles
+        """
+        counts = tiles.tolist() if isinstance(tiles, np.ndarray) else list(tiles)
+        drawn = draw_small(counts, n_tiles_to_draw, self.uniforms(n_tiles_to_draw))
+        if self.draw_log is not None:
+            self.draw_log.extend(drawn)
+        return TileArray(drawn)
+
+    def random_tile_split(self, tiles: np.ndarray, sizes: list[int]) -> np.ndarray:
+        """Draw consecutive groups of tiles without replacement.
+
+        See sampling.draw_split().
+
+        Args:
+            tiles:  The count of each color available to draw
+            sizes:  The number of tiles to draw for each group
+
+        Returns:
+            (len(sizes), 6) uint8 array of the count of each color per group
+        """
+        counts = tiles.tolist() if isinstance(tiles, np.ndarray) else list(tiles)
+        groups = draw_split(counts, sizes, self.uniforms(sum(sizes)))
+        if self.draw_log is not None:
+            for group in groups:
+                self.draw_log.extend(group)
+        return np.array(groups, dtype="B").reshape(len(sizes), len(counts))
+
+
+def _restore_tile_draw(
+    seed_sequence: np.random.SeedSequence,
+    buffer_size: int,
+    state: dict,
+    carried: list[float],
+    n_generated: int,
+    position: int,
+) -> RandomTileDraw:
+    """Rebuild a pickled stream by redoing its last buffer refill"""
+    random = RandomTileDraw(seed_sequence, buffer_size)
+    random.rng.bit_generator.state = state
+    if n_generated:
+        random._refill = (state, carried)
+        random._buffer = carried + random.rng.random(n_generated).tolist()
+    random._position = position
+    return random
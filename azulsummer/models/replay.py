@@ -0,0 +1,240 @@
+"""Deterministic replay of recorded games.
+
+A Replay rebuilds the Game of a GameRecord at any decision by running the
+game's logic from the record's seed, without events, with every decision
+taken from the record rather than asking a Player.  Decision n is the point
+where the game is about to ask its current player for the record's action
+n, i.e. after n recorded actions, with the player's turn at the front of
+the action queue.
+
+An exact copy of the game, see Game.copy(), is kept every snapshot_interval
+decisions as the replay passes them, so seeking to a decision replays at
+most snapshot_interval decisions from the nearest snapshot before it.
+
+With verify=True every tile draw of the replay is checked against the draws
+of the record, see adapters.records, so a replay diverging from the recorded
+game, e.g. after a change to the logic, fails at the first differing draw.
+"""
+from __future__ import annotations
+
+from array import array
+from typing import Optional
+from typing import Sequence
+
+from azulsummer.adapters.records import GameRecord
+from azulsummer.models import logic_handler
+from azulsummer.models.action_space import PASS_ACTION
+from azulsummer.models.action_space import encode_draw
+from azulsummer.models.action_space import wild_color_of
+from azulsummer.models.actions import AssessPhaseOneTileDrawAction
+from azulsummer.models.actions import PlayPhaseOneTurn
+from azulsummer.models.actions import PlayPhaseTwoTurn
+from azulsummer.models.actions import SelectTilePlacement
+from azulsummer.models.actions import StartGame
+from azulsummer.models.enums import BoardBackend
+from azulsummer.models.enums import TileValidation
+from azulsummer.models.game import Game
+from azulsummer.models.logic.phase_two import encode_tile_placement
+from azulsummer.players.player import Player
+
+# Actions asking the current player for a decision
+DECISION_ACTIONS: tuple[type, ...] = (PlayPhaseOneTurn, PlayPhaseTwoTurn)
+
+
+class ReplayDivergedError(ValueError):
+    """Raised when a replayed game does not follow its record"""
+
+
+class _RecordedPlayer(Player):
+    """Plays the available action encoded by the record at each decision"""
+
+    def __init__(self, actions: array) -> None:
+        super().__init__()
+        self.actions = actions
+
+    def _assess(self, action):
+        game = action.game
+        n = len(game.action_history)
+        recorded = self.actions[n]
+        if isinstance(action, AssessPhaseOneTileDrawAction):
+            wild_color = wild_color_of(game.wild_tile)
+            encoded = (
+                encode_draw(draw, wild_color) for draw in action.available_actions
+            )
+        else:
+            encoded = map(encode_tile_placement, action.available_actions)
+        for available, available_action in zip(action.available_actions, encoded):
+            if available_action == recorded:
+                return available
+        if recorded == PASS_ACTION and isinstance(action, SelectTilePlacement):
+            # A pass has no available action object
+            return None
+        raise ReplayDivergedError(
+            f"The recorded action {recorded} of decision {n} is not available."
+        )
+
+
+class Replay:
+    """Rebuilds the Game of a GameRecord at any decision"""
+
+    def __init__(
+        self,
+        record: GameRecord,
+        snapshot_interval: int = 16,
+        verify: bool = False,
+        validation: TileValidation = TileValidation.delta,
+        board_backend: BoardBackend = BoardBackend.array,
+    ) -> None:
+        """Start a replay, running the game's setup up to decision 0.
+
+        Args:
+            record:  The GameRecord to replay
+            snapshot_interval:  The number of decisions between snapshots
+            verify:  Check every tile draw against the record's draws
+            validation:  The TileValidation mode of the replayed game
+            board_backend:  The Board implementation of the replayed game
+
+        Raises:
+            ValueError if snapshot_interval is below 1, or verify is set and
+            the record has no draws
+            ReplayDivergedError if verifying and the setup's draws differ
+        """
+        if snapshot_interval < 1:
+            raise ValueError(f"{snapshot_interval} is not a snapshot interval.")
+        if verify and record.draws is None:
+            raise ValueError("The record has no draws to verify.")
+        self.record = record
+        self.snapshot_interval = snapshot_interval
+        self.verify = verify
+        # The number of decisions replayed, from snapshots included
+        self.n_replayed: int = 0
+        self._players = [_RecordedPlayer(record.actions)] * record.n_players
+        game = Game.new(self._players, record.seed, validation, board_backend)
+        game.emits_events = False
+        game.random.draw_log = array("B")
+        game.enqueue(StartGame)
+        self._game = game
+        self._snapshots: dict[int, Game] = {}
+        # The number of logged draw counts checked against the record
+        self._n_checked: int = 0
+        self._advance(0)
+
+    @property
+    def n_decisions(self) -> int:
+        """The number of recorded decisions"""
+        return len(self.record.actions)
+
+    def seek(
+        self, decision: int, players: Optional[Sequence[Optional[Player]]] = None
+    ) -> Game:
+        """Rebuild the game at a decision.
+
+        Args:
+            decision:  The number of recorded actions played, from 0 to
+                n_decisions.  The game at n_decisions is finished, or waits
+                on a decision the record does not have.
+            players:  The players of the returned game, e.g. to play on
+                from the decision with play_on().  None players by default.
+
+        Returns:
+            A copy of the game at the decision, see Game.copy().  The replay
+            is not changed by playing on the copy.
+
+        Raises:
+            IndexError if the decision is not in the record
+            ReplayDivergedError if the game does not follow the record
+        """
+        if not 0 <= decision <= self.n_decisions:
+            raise IndexError(f"{decision} is not a decision of the record.")
+        current = len(self._game.action_history)
+        nearest = max(n for n in self._snapshots if n <= decision)
+        if current > decision or nearest > current:
+            self._game = self._snapshots[nearest].copy()
+            self._n_checked = len(self._game.random.draw_log)
+        self._advance(decision)
+        if players is None:
+            players = [None] * self.record.n_players
+        game = self._game.copy(players)
+        game.random.draw_log = None
+        return game
+
+    def _advance(self, decision: int) -> None:
+        """Replay the working game up to a later decision"""
+        game = self._game
+        queue = game.action_queue
+        history = game.action_history
+        handlers = logic_handler.ACTION_HANDLERS
+        while True:
+            n = len(history)
+            if queue and isinstance(queue[0], DECISION_ACTIONS):
+                if n % self.snapshot_interval == 0 and n not in self._snapshots:
+                    self._snapshots[n] = game.copy()
+                if n == decision:
+                    return
+                self.n_replayed += 1
+            elif not queue:
+                if n == decision:
+                    return
+                raise ReplayDivergedError(
+                    f"The game ended after {n} of {self.n_decisions} decisions."
+                )
+            action = queue.popleft()
+            handlers[type(action)](action)
+            if self.verify:
+                self._verify_draws(n)
+
+    def _verify_draws(self, decision: int) -> None:
+        """Check the draws made since the last check against the record"""
+        log, recorded = self._game.random.draw_log, self.record.draws
+        checked, n = self._n_checked, len(log)
+        if n == checked:
+            return
+        self._n_checked = n
+        if log[checked:] == recorded[checked:n]:
+            return
+        if n > len(recorded) and log[checked : len(recorded)] == recorded[checked:]:
+            raise ReplayDivergedError(
+                f"The replay drew more than the {len(recorded) // 6} recorded "
+                f"draws before decision {decision}."
+            )
+        first = next(
+            i for i in range(checked, min(n, len(recorded))) if log[i] != recorded[i]
+        )
+        draw = first // 6 * 6
+        raise ReplayDivergedError(
+            f"Draw {first // 6} before decision {decision} drew "
+            f"{log[draw : draw + 6].tolist()}, the record drew "
+            f"{recorded[draw : draw + 6].tolist()}."
+        )
+
+
+def verify_record(record: GameRecord, snapshot_interval: int = 16) -> Game:
+    """Replay a whole record checking every decision and tile draw.
+
+    Returns:
+        The replayed game at the end of the record
+
+    Raises:
+        ValueError if the record has no draws
+        ReplayDivergedError if the replay does not follow the record, or
+        ends before drawing every recorded draw
+    """
+    replay = Replay(record, snapshot_interval, verify=True)
+    game = replay.seek(replay.n_decisions)
+    n_drawn = len(replay._game.random.draw_log)
+    if n_drawn != len(record.draws):
+        raise ReplayDivergedError(
+            f"The replay drew {n_drawn // 6} of the {len(record.draws) // 6} "
+            "recorded draws."
+        )
+    return game
+
+
+def play_on(game: Game) -> None:
+    """Play a game on from its action queue with its players, without events"""
+    game.emits_events = False
+    queue = game.action_queue
+    handlers = logic_handler.ACTION_HANDLERS
+    while queue:
+        action = queue.popleft()
+        handlers[type(action)](action)
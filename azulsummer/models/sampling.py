@@ -0,0 +1,93 @@
+"""Module containing samplers for drawing a few tiles from the bag
+
+The bag holds at most 132 tiles of 6 colors and almost every draw takes 1 to
+4 tiles.  At that size numpy's multivariate_hypergeometric is dominated by
+call overhead, so these samplers draw tiles one at a time in plain Python
+from caller supplied uniform variates, see RandomTileDraw.uniforms().
+
+Each tile is drawn by scaling a uniform variate to an index into the
+remaining tiles and walking the cumulative color counts, which samples the
+multivariate hypergeometric distribution exactly.
+"""
+from __future__ import annotations
+
+from typing import Sequence
+
+
+def draw_small(counts: list[int], n: int, uniforms: Sequence[float]) -> list[int]:
+    """Draw n tiles without replacement from the color counts.
+
+    counts is updated in place to hold the tiles left after the draw.
+
+    Args:
+        counts:  The count of each color available to draw
+        n:  The number of tiles to draw
+        uniforms:  At least n uniform variates in [0, 1).  Only the first n
+            are used.
+
+    Returns:
+        The count of each color drawn
+
+    Raises:
+        ValueError if there are fewer than n tiles
+    """
+    remaining = sum(counts)
+    if n > remaining:
+        raise ValueError(f"Cannot draw {n} tiles from {remaining} tiles.")
+    drawn = [0] * len(counts)
+    _draw_tiles(counts, remaining, uniforms[:n], drawn)
+    return drawn
+
+
+def draw_split(
+    counts: list[int], sizes: Sequence[int], uniforms: Sequence[float]
+) -> list[list[int]]:
+    """Draw consecutive groups of tiles without replacement.
+
+    This is the same as calling draw_small() once per group with the counts
+    left by the previous group, e.g. filling the factory displays one after
+    another, but walks the uniforms once.
+
+    Args:
+        counts:  The count of each color available, updated in place
+        sizes:  The number of tiles in each group
+        uniforms:  At least sum(sizes) uniform variates in [0, 1)
+
+    Returns:
+        The count of each color drawn, per group
+    """
+    total = sum(sizes)
+    remaining = sum(counts)
+    if total > remaining:
+        raise ValueError(f"Cannot draw {total} tiles from {remaining} tiles.")
+    n_colors = len(counts)
+    groups = []
+    i = 0
+    for size in sizes:
+        drawn = [0] * n_colors
+        remaining = _draw_tiles(counts, remaining, uniforms[i : i + size], drawn)
+        groups.append(drawn)
+        i += size
+    return groups
+
+
+def _draw_tiles(
+    counts: list[int], remaining: int, uniforms: Sequence[float], drawn: list[int]
+) -> int:
+    """Draw a tile per uniform, updating counts and adding to drawn.
+
+    Returns:
+        The number of tiles left in counts
+    """
+    for u in uniforms:
+        pick = int(u * remaining)
+        color = 0
+        count = counts[0]
+        while pick >= count:
+            pick -= count
+            color += 1
+            count = counts[color]
+        counts[color] = count - 1
+        drawn[color] += 1
+        remaining -= 1
+    return remaining
@@ -1,18 +1,80 @@
 """Module containing the State class"""
 from __future__ import annotations
 
+import struct
+from functools import lru_cache
 from typing import Optional
 
+import numpy as np
+
+from azulsummer.models.board import BOARD_BACKENDS
 from azulsummer.models.board import Board
+from azulsummer.models.bonus_spaces import BONUS_SPACE_SIZES
+from azulsummer.models.bonus_spaces import N_BONUS_SPACES
 from azulsummer.models.bonus_spaces import BonusSpace
+from azulsummer.models.enums import BoardBackend
 from azulsummer.models.enums import Phase
+from azulsummer.models.enums import StateCounter
+from azulsummer.models.enums import StarColor
+from azulsummer.models.enums import TileIndex
+from azulsummer.models.enums import TileValidation
+from azulsummer.models.enums import WildTiles
 from azulsummer.models.score import Score
 from azulsummer.models.tiles import Tiles
+from azulsummer.models.zobrist import board_key
+from azulsummer.models.zobrist import counters_key
+from azulsummer.models.zobrist import tiles_key
+
+# Value stored in the counter array for counters that are not yet set
+_UNSET: int = -1
+
+# Flat byte layout of State.to_bytes(), little endian:
+#     magic            2 bytes    b"AS"
+#     version          uint8      STATE_VERSION
+#     n_players        uint8
+#     validation       uint8      index into TileValidation
+#     board_backend    uint8      index into BoardBackend
+#     padding          2 bytes
+#     keys             uint64 * (n_players + 1)  Zobrist keys of tiles, boards
+#     buffer           uint8 * nbytes            see State.buffer_layout()
+STATE_MAGIC: bytes = b"AS"
+STATE_VERSION: int = 1
+_STATE_HEADER = struct.Struct("<2sBBBBxx")
+_VALIDATIONS: tuple[TileValidation, ...] = tuple(TileValidation)
+_BOARD_BACKENDS: tuple[BoardBackend, ...] = tuple(BoardBackend)
+
+
+def _counter(index: StateCounter, enum=None) -> property:
+    """Build a property that reads and writes a single State counter.
+
+    Counters are stored in the int16 State._counters array so the state can
+    live inside a GameArena slot.  None is stored as -1.
+    """
+
+    def getter(self):
+        value = self._counters.item(index)
+        if value == _UNSET:
+            return None
+        return enum(value) if enum is not None else value
+
+    def setter(self, value):
+        self._counters[index] = _UNSET if value is None else value
+
+    return property(getter, setter)
 
 
 class State:
     """The State class manages the state for an Azul Summer Pavilion game.  All
     actions that affect the game state are applied via the State class's methods.
+
+    All mutable state is held in numpy arrays (tiles, boards, bonus spaces,
+    score and counters) so that a State may either own its data or act as a
+    view into a GameArena slot.  A State created with State.new() holds all
+    of its arrays in one contiguous byte buffer, so State.clone() copies the
+    whole game in a single array copy.
+
+    to_bytes() packs the buffer behind a small header and from_bytes() views
+    packed bytes in place, which is also how States pickle.
     """
 
     def __init__(
@@ -30,7 +92,7 @@ class State:
         game_round: Optional[int],
         start_player_index: Optional[int],
         current_player_index: Optional[int],
-            active_players: Optional[list[int]],
+        active_players: Optional[list[int]],
         winner: Optional[int],
     ) -> None:
         self.n_players = n_players
@@ -38,6 +100,7 @@ class State:
         self.score = score
         self.boards = boards
         self.bonus_spaces = bonus_spaces
+        self._counters: np.ndarray = self.initial_counters(n_players)
         self.wild_tile = wild_tile
 
         # Phase, order, turn values
@@ -52,38 +115,334 @@ class State:
         self.winner = winner
 
     @classmethod
-    def new(cls, n_players: int) -> State:
-        tiles = Tiles.new(n_players)
-        score = Score(n_players)
-        board = [Board.new() for _ in range(n_players)]
-        bonus_spaces = [BonusSpace() for _ in range(n_players)]
-        wild_tile = None
-
-        turn = 1
-        phase = None
-        phase_turn = 1
-        ply = 0
-        game_round = None
-        start_player_index = None
-        current_player_index = None
-        active_players = None
-        winner = None
-        return cls(
+    def new(
+        cls,
+        n_players: int,
+        validation: TileValidation = TileValidation.delta,
+        board_backend: BoardBackend = BoardBackend.array,
+    ) -> State:
+        buffer = np.zeros(cls.buffer_layout(n_players)[1], "B")
+        views = cls.buffer_views(n_players, buffer)
+        views["tiles"][TileIndex.Bag] = Tiles._TILE_COUNT
+        views["bonus_spaces"][:] = 1
+        views["bonus_remaining"][:] = BONUS_SPACE_SIZES
+        views["scores"][:] = 5
+        views["counters"][:] = cls.initial_counters(n_players)
+        return cls.from_buffer(n_players, buffer, validation, board_backend)
+
+    @classmethod
+    def from_views(
+        cls,
+        n_players: int,
+        views: dict[str, np.ndarray],
+        validation: TileValidation = TileValidation.delta,
+        board_backend: BoardBackend = BoardBackend.array,
+        keys: Optional[list[int]] = None,
+    ) -> State:
+        """Create a State that reads and writes through the given arrays.
+
+        No data is copied.  The views must match the shapes given by
+        State.slot_spec(n_players).
+
+        Args:
+            n_players: The number of players
+            views: Mapping of slot field name to the array backing it
+            validation: The TileValidation mode used by the State's Tiles
+            board_backend: The Board implementation used for player boards
+            keys: Optional Zobrist keys of the tiles followed by each board.
+                They are computed from the views when not provided.
+
+        Returns:
+            A State backed by the views
+        """
+        if keys is None:
+            keys = [None] * (n_players + 1)
+        state = cls.__new__(cls)
+        state.n_players = n_players
+        state.tiles = Tiles(n_players, views["tiles"], validation, keys[0])
+        state.score = views["scores"].view(Score)
+        board_class = BOARD_BACKENDS[board_backend]
+        state.boards = [
+            board_class(board, remaining, player, key)
+            for player, (board, remaining, key) in enumerate(
+                zip(views["boards"], views["bonus_remaining"], keys[1:])
+            )
+        ]
+        state.bonus_spaces = [
+            BonusSpace(available) for available in views["bonus_spaces"]
+        ]
+        state._counters = views["counters"]
+        return state
+
+    @classmethod
+    def from_buffer(
+        cls,
+        n_players: int,
+        buffer: np.ndarray,
+        validation: TileValidation = TileValidation.delta,
+        board_backend: BoardBackend = BoardBackend.array,
+        keys: Optional[list[int]] = None,
+    ) -> State:
+        """Create a State that reads and writes through a contiguous buffer.
+
+        No data is copied and the State keeps the buffer, see clone().
+
+        Args:
+            n_players: The number of players
+            buffer: The uint8 array laid out by State.buffer_layout(n_players)
+            validation: The TileValidation mode used by the State's Tiles
+            board_backend: The Board implementation used for player boards
+            keys: Optional Zobrist keys of the tiles followed by each board.
+                They are computed from the buffer when not provided.
+
+        Returns:
+            A State backed by the buffer
+        """
+        state = cls.from_views(
+            n_players,
+            cls.buffer_views(n_players, buffer),
+            validation,
+            board_backend,
+            keys,
+        )
+        state._buffer = buffer
+        return state
+
+    @staticmethod
+    @lru_cache
+    def buffer_layout(
+        n_players: int,
+    ) -> tuple[dict[str, tuple[int, str, tuple[int, ...]]], int]:
+        """Get where each of a State's arrays sits in a contiguous buffer.
+
+        Fields are ordered by decreasing item size, so every field is aligned.
+
+        Args:
+            n_players: The number of players
+
+        Returns:
+            Dict of {field name: (byte offset, dtype, shape)} and the size of
+            the buffer in bytes
+        """
+        spec = State.slot_spec(n_players)
+        layout, offset = {}, 0
+        for name in sorted(spec, key=lambda name: -np.dtype(spec[name][0]).itemsize):
+            dtype, shape = spec[name]
+            layout[name] = (offset, dtype, shape)
+            offset += np.dtype(dtype).itemsize * int(np.prod(shape))
+        return layout, offset
+
+    @staticmethod
+    def buffer_views(n_players: int, buffer: np.ndarray) -> dict[str, np.ndarray]:
+        """Get each of a State's arrays as a view into a contiguous buffer"""
+        layout, _ = State.buffer_layout(n_players)
+        return {
+            name: np.ndarray(shape, dtype, buffer, offset)
+            for name, (offset, dtype, shape) in layout.items()
+        }
+
+    def clone(self) -> State:
+        """Create an independent copy of the State.
+
+        A State owning a contiguous buffer is copied with a single copy of
+        the buffer.  A State viewing a GameArena slot copies its fields into
+        a new buffer.  The tile layout and bonus space tables are shared,
+        and the Zobrist keys are carried over rather than recomputed.
+
+        Returns:
+            A new State backed by its own buffer
+        """
+        buffer = getattr(self, "_buffer", None)
+        if buffer is not None:
+            buffer = buffer.copy()
+        else:
+            buffer = np.empty(self.buffer_layout(self.n_players)[1], "B")
+            views = self.buffer_views(self.n_players, buffer)
+            views["tiles"][:] = self.tiles._tiles
+            views["boards"][:] = [board.board for board in self.boards]
+            views["bonus_remaining"][:] = [board.remaining for board in self.boards]
+            views["bonus_spaces"][:] = [space.available for space in self.bonus_spaces]
+            views["scores"][:] = self.score
+            views["counters"][:] = self._counters
+        return self.from_buffer(
+            self.n_players,
+            buffer,
+            self.tiles.validation,
+            self.board_backend,
+            [self.tiles.key, *(board.key for board in self.boards)],
+        )
+
+    def __deepcopy__(self, memo: dict) -> State:
+        # Copying the views one by one would detach them from the buffer
+        return self.clone()
+
+    def __reduce__(self):
+        # Pickle the flat bytes rather than each array and Board
+        return State.from_bytes, (self.to_bytes(),)
+
+    def to_bytes(self) -> bytes:
+        """Pack the State into a flat byte string, see from_bytes().
+
+        The bytes are a header, the Zobrist keys and the State's buffer, see
+        the layout at the top of the module.  A State viewing a GameArena
+        slot is packed as its clone would be.
+
+        Returns:
+            The packed State
+        """
+        state = self if getattr(self, "_buffer", None) is not None else self.clone()
+        header = _STATE_HEADER.pack(
+            STATE_MAGIC,
+            STATE_VERSION,
+            self.n_players,
+            _VALIDATIONS.index(self.tiles.validation),
+            _BOARD_BACKENDS.index(self.board_backend),
+        )
+        keys = np.array([self.tiles.key, *(board.key for board in self.boards)], "<u8")
+        return b"".join([header, keys.tobytes(), state._buffer.tobytes()])
+
+    @classmethod
+    def from_bytes(cls, data: bytes | bytearray | memoryview) -> State:
+        """Create a State from the bytes packed by to_bytes().
+
+        The State's arrays are np.frombuffer() views into the data, so a
+        writable buffer such as a bytearray, a writable memoryview or shared
+        memory is used in place without copying, and the State writes
+        through to it.  Read-only data such as bytes is copied once.
+
+        Args:
+            data:  The packed State, and nothing after it
+
+        Returns:
+            The unpacked State
+
+        Raises:
+            ValueError if the data is not a State packed by this version
+        """
+        if len(data) < _STATE_HEADER.size:
+            raise ValueError("The data is too short to be a packed State.")
+        magic, version, n_players, validation, board_backend = (
+            _STATE_HEADER.unpack_from(data)
+        )
+        if magic != STATE_MAGIC:
+            raise ValueError(f"{magic!r} is not a packed State.")
+        if version != STATE_VERSION:
+            raise ValueError(f"Version {version} States are not supported.")
+        offset = _STATE_HEADER.size + 8 * (n_players + 1)
+        _, nbytes = cls.buffer_layout(n_players)
+        if len(data) != offset + nbytes:
+            raise ValueError(
+                f"A packed {n_players} player State is {offset + nbytes} bytes, "
+                f"not {len(data)}."
+            )
+        keys = np.frombuffer(data, "<u8", n_players + 1, _STATE_HEADER.size)
+        buffer = np.frombuffer(data, "B", nbytes, offset)
+        if not buffer.flags.writeable:
+            buffer = buffer.copy()
+        return cls.from_buffer(
             n_players,
-            tiles,
-            score,
-            board,
-            bonus_spaces,
-            wild_tile,
-            turn,
-            phase,
-            phase_turn,
-            ply,
-            game_round,
-            start_player_index,
-            current_player_index,
-            active_players,
-            winner,
+            buffer,
+            _VALIDATIONS[validation],
+            _BOARD_BACKENDS[board_backend],
+            keys.tolist(),
+        )
+
+    @property
+    def hash_key(self) -> int:
+        """Get the 64-bit Zobrist hash of the State.
+
+        The tile and board parts of the hash are kept up to date by Tiles
+        and Board as tiles move, and the counters are hashed on each call.
+        Turn counters and scores are not hashed, so states reached by
+        different move orders share a key.  See models.zobrist.
+        """
+        key = self.tiles.key ^ counters_key(self._counters)
+        for board in self.boards:
+            key ^= board.key
+        return key
+
+    def compute_hash_key(self) -> int:
+        """Compute the Zobrist hash of the State from scratch.
+
+        Equal to hash_key as long as the arrays were only changed through
+        Tiles and Board, see rehash().
+        """
+        key = tiles_key(self.tiles._tiles) ^ counters_key(self._counters)
+        for player, board in enumerate(self.boards):
+            key ^= board_key(board.board, player)
+        return key
+
+    def rehash(self) -> int:
+        """Recompute the incremental keys after writing to the arrays directly.
+
+        Returns:
+            The State's hash_key
+        """
+        self.tiles.rehash()
+        for board in self.boards:
+            board.rehash()
+        return self.hash_key
+
+    @property
+    def board_backend(self) -> BoardBackend:
+        """Get the BoardBackend of the State's boards"""
+        board_type = type(self.boards[0])
+        return next(
+            backend
+            for backend, backend_type in BOARD_BACKENDS.items()
+            if backend_type is board_type
+        )
+
+    @staticmethod
+    def slot_spec(n_players: int) -> dict[str, tuple[str, tuple[int, ...]]]:
+        """Get the dtype and shape of each array holding a State's data.
+
+        Args:
+            n_players: The number of players
+
+        Returns:
+            Dict of {field name: (dtype, shape)}
+        """
+        return {
+            "tiles": ("B", (Tiles.row_count(n_players), Tiles.n_colors)),
+            "boards": ("B", (n_players, len(StarColor), Board.n_tile_spaces)),
+            "bonus_spaces": ("B", (n_players, N_BONUS_SPACES)),
+            "bonus_remaining": ("B", (n_players, N_BONUS_SPACES)),
+            "scores": ("<u2", (n_players,)),
+            "counters": ("<i2", (StateCounter.ActivePlayers + n_players,)),
+        }
+
+    @staticmethod
+    def initial_counters(n_players: int) -> np.ndarray:
+        """Get the counter array for a new game."""
+        counters = np.full(StateCounter.ActivePlayers + n_players, _UNSET, "<i2")
+        counters[StateCounter.Turn] = 1
+        counters[StateCounter.PhaseTurn] = 1
+        counters[StateCounter.Ply] = 0
+        return counters
+
+    wild_tile = _counter(StateCounter.WildTile, WildTiles)
+    turn = _counter(StateCounter.Turn)
+    phase = _counter(StateCounter.Phase, Phase)
+    phase_turn = _counter(StateCounter.PhaseTurn)
+    ply = _counter(StateCounter.Ply)
+    game_round = _counter(StateCounter.GameRound)
+    start_player_index = _counter(StateCounter.StartPlayer)
+    current_player_index = _counter(StateCounter.CurrentPlayer)
+    winner = _counter(StateCounter.Winner)
+
+    @property
+    def active_players(self) -> Optional[np.ndarray]:
+        """Per-player active flags as a view, or None if they are not set."""
+        active = self._counters[StateCounter.ActivePlayers :]
+        if active[0] == _UNSET:
+            return None
+        return active
+
+    @active_players.setter
+    def active_players(self, value: Optional[list[int]]) -> None:
+        self._counters[StateCounter.ActivePlayers :] = (
+            _UNSET if value is None else value
         )
 
     def phase_one_end_criteria_are_met(self) -> bool:
@@ -143,4 +502,4 @@ class State:
 
     def reset_active_players(self):
         """Reset all players to be active.  This is used in Phase 2."""
-        self.active_players = [1 for _ in range(self.n_players)]
\ No newline at end of file
+        self.active_players = [1 for _ in range(self.n_players)]
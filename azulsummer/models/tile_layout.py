@@ -0,0 +1,138 @@
+"""Module containing the TileLayout class"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping
+
+import numpy as np
+
+from azulsummer.models.enums import PLAYER_TO_DISPLAY_RATIO
+from azulsummer.models.enums import TileIndex
+from azulsummer.models.enums import TileTarget
+
+# 7 rows of 6 are assigned for each player's board which is
+#   1 row for each color and 1 row for the 'wild' color
+PLAYER_BOARD_ROW_COUNT: int = 7
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.flags.writeable = False
+    return array
+
+
+@dataclass(frozen=True, eq=False)
+class TileLayout:
+    """Row layout of the Tiles array for a given number of players.
+
+    The layout is immutable and built once per player count, see
+    TILE_LAYOUTS.  It holds the row indices, slices and index arrays for
+    every tile location so that callers never need to recompute them.
+
+    Rows are ordered bag, tower, table center, supply, factory displays,
+    player boards (7 rows per player) and player reserves.
+    """
+
+    n_players: int
+    n_factory_displays: int
+    n_rows: int
+    player_board_index: int
+    player_reserve_index: int
+
+    factory_displays: slice
+    player_boards: slice
+    player_reserves: slice
+
+    # Row index of each factory display, each player's first board row and
+    # each player reserve
+    factory_display_rows: np.ndarray
+    player_board_rows: np.ndarray
+    player_reserve_rows: np.ndarray
+    # Factory display rows followed by the table center row
+    acquire_source_rows: np.ndarray
+
+    # {TileTarget: (first row, rows per nth position)}
+    target_rows: Mapping[TileTarget, tuple[int, int]]
+
+    # Layouts are shared rather than copied, and unpickle as the shared
+    # layout for the same number of players
+    def __copy__(self) -> TileLayout:
+        return self
+
+    def __deepcopy__(self, memo: dict) -> TileLayout:
+        return self
+
+    def __reduce__(self):
+        return _shared_layout, (self.n_players,)
+
+    @classmethod
+    def build(cls, n_players: int) -> TileLayout:
+        """Compute the layout for n_players"""
+        n_factory_displays = PLAYER_TO_DISPLAY_RATIO[n_players]
+        player_board_index = TileIndex.FactoryDisplay + n_factory_displays
+        player_reserve_index = (
+            player_board_index + n_players * PLAYER_BOARD_ROW_COUNT
+        )
+        n_rows = player_reserve_index + n_players
+        return cls(
+            n_players=n_players,
+            n_factory_displays=n_factory_displays,
+            n_rows=n_rows,
+            player_board_index=player_board_index,
+            player_reserve_index=player_reserve_index,
+            factory_displays=slice(TileIndex.FactoryDisplay, player_board_index),
+            player_boards=slice(player_board_index, player_reserve_index),
+            player_reserves=slice(player_reserve_index, n_rows),
+            factory_display_rows=_read_only(
+                np.arange(TileIndex.FactoryDisplay, player_board_index)
+            ),
+            player_board_rows=_read_only(
+                np.arange(
+                    player_board_index, player_reserve_index, PLAYER_BOARD_ROW_COUNT
+                )
+            ),
+            player_reserve_rows=_read_only(np.arange(player_reserve_index, n_rows)),
+            acquire_source_rows=_read_only(
+                np.append(
+                    np.arange(TileIndex.FactoryDisplay, player_board_index),
+                    TileIndex.TableCenter,
+                )
+            ),
+            target_rows=MappingProxyType(
+                {
+                    TileTarget.Bag: (TileIndex.Bag, 0),
+                    TileTarget.Tower: (TileIndex.Tower, 0),
+                    TileTarget.TableCenter: (TileIndex.TableCenter, 0),
+                    TileTarget.Supply: (TileIndex.Supply, 0),
+                    TileTarget.FactoryDisplay: (TileIndex.FactoryDisplay, 1),
+                    TileTarget.PlayerBoard: (
+                        player_board_index,
+                        PLAYER_BOARD_ROW_COUNT,
+                    ),
+                    TileTarget.PlayerReserve: (player_reserve_index, 1),
+                }
+            ),
+        )
+
+    def row(self, location: TileTarget, nth: int = 0) -> int:
+        """Get the tile row index for the nth position of a tile location.
+
+        Args:
+            location: The TileTarget location
+            nth: The 0-indexed factory display, player board or player reserve
+
+        Returns:
+            The integer row index in the Tiles array
+        """
+        first_row, stride = self.target_rows[location]
+        return first_row + stride * nth
+
+
+def _shared_layout(n_players: int) -> TileLayout:
+    return TILE_LAYOUTS[n_players]
+
+
+# Layouts are shared by every game with the same number of players
+TILE_LAYOUTS: Mapping[int, TileLayout] = MappingProxyType(
+    {n_players: TileLayout.build(n_players) for n_players in PLAYER_TO_DISPLAY_RATIO}
+)
@@ -1,20 +1,31 @@
 """Module containing the Tile class"""
 from __future__ import annotations
 
+from typing import Optional
 from typing import Union
 
 import numpy as np
 
-from azulsummer.models.enums import PLAYER_TO_DISPLAY_RATIO
 from azulsummer.models.enums import StarColor
 from azulsummer.models.enums import TileColor
 from azulsummer.models.enums import TileIndex
+from azulsummer.models.enums import TileValidation
+from azulsummer.models.tile_layout import PLAYER_BOARD_ROW_COUNT
+from azulsummer.models.tile_layout import TILE_LAYOUTS
+from azulsummer.models.tile_layout import TileLayout
+from azulsummer.models.zobrist import TILE_KEYS
+from azulsummer.models.zobrist import tile_row_key
+from azulsummer.models.zobrist import tiles_key
 
 # Referenced in the Tiles.validate_tiles() method
 # This is created here to avoid instantiating a new object every time the Tile
 # class self validates.
 _VALID_TILE_DISTRIBUTION = np.array([22, 22, 22, 22, 22, 22], "B")
 
+# Single tile of each color, used to move one tile at a time.  Row i is the
+# tile array for TileColor(i).
+_SINGLE_TILES = np.eye(len(TileColor), dtype="B")
+
 
 class Tiles:
     """Class to manage the distribution of all game tiles.
@@ -27,7 +38,15 @@ class Tiles:
     class.
 
     Each group of tiles is represented as a 6-wide row in the 2D numpy
-    array _tiles.
+    array _tiles.  Row indices come from the shared TileLayout for the
+    player count, and the views of each location are built once when the
+    Tiles is created.  The _tiles array must therefore only be modified in
+    place.
+
+    The Zobrist hash of the tile rows is kept in key and updated on every
+    move, see models.zobrist.  It is computed from the array when the Tiles
+    is created, so after that the array must only be modified through the
+    Tiles methods or the key rehashed with rehash().
     """
 
     # TODO:  Add properties and methods to Tiles docstring
@@ -44,7 +63,7 @@ class Tiles:
 
     # 7 rows of 6 are assigned for each player's board which is
     #   1 row for each color and 1 row for the 'wild' color
-    player_board_row_count: int = 7
+    player_board_row_count: int = PLAYER_BOARD_ROW_COUNT
 
     # Max number of tiles held in the Supply row
     _SUPPLY_TILE_MAX: int = 10
@@ -52,54 +71,86 @@ class Tiles:
     # Number of tiles held on each factory display
     factory_display_tile_max: int = 4
 
-    def __init__(self, n_players: int, tile_array: np.ndarray) -> None:
+    # Width of each tile row, one column per tile color
+    n_colors: int = len(TileColor)
+
+    def __init__(
+        self,
+        n_players: int,
+        tile_array: np.ndarray,
+        validation: TileValidation = TileValidation.delta,
+        key: Optional[int] = None,
+    ) -> None:
         """Initialize a Tile class.
 
         Tiles begin with the 132 available tiles assigned to the bag.
 
         Args:
             n_players:  The number of players as an integer
+            tile_array:  The 2D uint8 array holding every tile row
+            validation:  The TileValidation mode applied to each move
+            key:  Optional Zobrist key of tile_array.  It is computed from
+                the array when not provided.
 
         """
         self.n_players: int = n_players
         self._tiles: np.array = tile_array
+        self.validation: TileValidation = validation
+
+        layout: TileLayout = TILE_LAYOUTS[n_players]
+        self.layout: TileLayout = layout
+        self.n_factory_displays: int = layout.n_factory_displays
+        self.player_board_index: int = layout.player_board_index
+        self.player_reserve_index: int = layout.player_reserve_index
+
+        # Views are cached so the hot paths never rebuild slices
+        self._bag: np.ndarray = tile_array[self.bag_index]
+        self._tower: np.ndarray = tile_array[self.tower_index]
+        self._table_center: np.ndarray = tile_array[self.table_center_index]
+        self._supply: np.ndarray = tile_array[self.supply_index]
+        self._factory_displays: np.ndarray = tile_array[layout.factory_displays]
+        self._factory_display_views: tuple[np.ndarray, ...] = tuple(
+            self._factory_displays
+        )
+        self._player_boards: np.ndarray = tile_array[layout.player_boards]
+        self._player_board_views: tuple[np.ndarray, ...] = tuple(
+            tile_array[row : row + self.player_board_row_count]
+            for row in layout.player_board_rows
+        )
+        self._player_reserves: np.ndarray = tile_array[layout.player_reserves]
+        self._player_reserve_views: tuple[np.ndarray, ...] = tuple(
+            self._player_reserves
+        )
+        self.key: int = tiles_key(tile_array) if key is None else key
 
     @classmethod
-    def new(cls, n_players: int) -> Tiles:
+    def new(
+        cls, n_players: int, validation: TileValidation = TileValidation.delta
+    ) -> Tiles:
         """Create a new tile array for n_players"""
-        n_factory_displays = PLAYER_TO_DISPLAY_RATIO[n_players]
-
         # Instantiate the tile array
-        n_tile_rows = (
-            4 + n_factory_displays + n_players * cls.player_board_row_count + n_players
+        tiles_array: np.ndarray = np.zeros(
+            (cls.row_count(n_players), cls.n_colors), "B"
         )
-        tiles_array: np.ndarray = np.zeros((n_tile_rows, len(TileColor)), "B")
 
         # Create the initial distribution of 22 tiles * 6 tile colors
         tiles_array[cls.bag_index] += np.array([cls._TILE_COUNT] * len(TileColor), "B")
 
-        return cls(n_players, tiles_array)
+        return cls(n_players, tiles_array, validation)
+
+    @classmethod
+    def row_count(cls, n_players: int) -> int:
+        """Get the number of tile rows required for n_players"""
+        return TILE_LAYOUTS[n_players].n_rows
 
     def __repr__(self):
         return f"{self.__class__.__name__}(n_players={self.n_players}, tile_array={self._tiles})"
 
-    @property
-    def player_board_index(self) -> int:
-        return self.factory_display_index + self.n_factory_displays
-
-    @property
-    def n_factory_displays(self) -> int:
-        return PLAYER_TO_DISPLAY_RATIO[self.n_players]
-
-    @property
-    def player_reserve_index(self) -> int:
-        return self.player_board_index + (self.n_players * self.player_board_row_count)
-
     """ VIEWS """
 
     def view_bag(self) -> np.ndarray:
         """Get the distribution of tiles in the bag."""
-        return self._tiles[self.bag_index]
+        return self._bag
 
     def get_bag_quantity(self) -> int:
         """Get the total number of tiles in the bag"""
@@ -107,7 +158,7 @@ class Tiles:
 
     def view_tower(self) -> np.ndarray:
         """Get the distribution of tiles in the tower."""
-        return self._tiles[self.tower_index]
+        return self._tower
 
     def get_tower_quantity(self) -> int:
         """Get the total number of tiles in the tower"""
@@ -115,7 +166,7 @@ class Tiles:
 
     def view_table_center(self) -> np.ndarray:
         """Get the distribution of tiles in the center of the table."""
-        return self._tiles[self.table_center_index]
+        return self._table_center
 
     def get_table_center_quantity(self) -> int:
         """Get the number of tiles currently in the table center"""
@@ -123,7 +174,7 @@ class Tiles:
 
     def view_supply(self) -> np.ndarray:
         """Get the distribution of tiles in the supply."""
-        return self._tiles[self.supply_index]
+        return self._supply
 
     def get_supply_quantity(self) -> int:
         """Get the total number of tiles held in supply."""
@@ -135,7 +186,7 @@ class Tiles:
         Returns:
              The tile distributions as a 2D numpy array.
         """
-        return self._tiles[self.factory_display_index : self.player_board_index]
+        return self._factory_displays
 
     def get_factory_displays_quantity(self) -> int:
         """Get the total number of tiles across all factory displays."""
@@ -150,11 +201,19 @@ class Tiles:
         Returns:
              The tile distribution as a numpy array.
         """
-        return self.view_factory_displays()[factory_display_n]
+        return self._factory_display_views[factory_display_n]
+
+    def get_acquire_sources(self) -> np.ndarray:
+        """Get a copy of the factory display rows followed by the table center.
+
+        Returns:
+            The tile distributions as a (factory displays + 1, 6) array
+        """
+        return self._tiles[self.layout.acquire_source_rows]
 
     def view_player_boards(self) -> np.ndarray:
         """Get the distribution of tiles across all players' boards."""
-        return self._tiles[self.player_board_index : self.player_reserve_index]
+        return self._player_boards
 
     def view_player_board_n(self, player_n: int) -> np.ndarray:
         """Get the distribution of tiles for the given player board.
@@ -165,22 +224,15 @@ class Tiles:
         Returns:
             The player board as a 2D 7x6 numpy array
         """
-        return self.view_player_boards()[
-            player_n
-            * self.player_board_row_count : player_n
-            * self.player_board_row_count
-            + self.player_board_row_count
-        ]
+        return self._player_board_views[player_n]
 
     def view_player_reserves(self) -> np.ndarray:
         """Get the distribution of tiles across all player reserves"""
-        return self._tiles[
-            self.player_reserve_index : self.player_reserve_index + self.n_players
-        ]
+        return self._player_reserves
 
     def view_player_reserve_n(self, player_n: int) -> np.ndarray:
         """Get the distribution of tiles in reserve that are held by player n."""
-        return self.view_player_reserves()[player_n]
+        return self._player_reserve_views[player_n]
 
     def supply_is_full(self) -> bool:
         """Check if the supply is filled to 10 tiles.
@@ -195,6 +247,15 @@ class Tiles:
         """Get the number of tiles missing from the supply"""
         return self._SUPPLY_TILE_MAX - self.get_supply_quantity()
 
+    def rehash(self) -> int:
+        """Recompute the Zobrist key from the tile array.
+
+        Returns:
+            The recomputed key, which is also stored in key
+        """
+        self.key = tiles_key(self._tiles)
+        return self.key
+
     # Move Tiles
 
     def move_tiles(
@@ -214,10 +275,70 @@ class Tiles:
 
         Returns:
             None
+
+        Raises:
+            ValueError if the move breaks tile integrity under the Tiles
+            validation mode.
+        """
+        tiles = np.asarray(tiles, dtype="B")
+        if self.validation is TileValidation.delta:
+            self._check_move_integrity(source_index, destination_index, tiles)
+        # Read before moving, as tiles may be a view of the source row
+        moved = tiles.tolist()
+        self._tiles[destination_index] += tiles
+        self._tiles[source_index] -= tiles
+        if self.validation is TileValidation.full:
+            self._check_tile_integrity()
+        if source_index != destination_index:
+            self._hash_move(source_index, destination_index, moved)
+
+    def _hash_move(
+        self, source_index: int, destination_index: int, moved: list[int]
+    ) -> None:
+        """Update the key for tiles moved from source to destination.
+
+        Called after the move, so the counts before it are recovered from
+        the counts after it, wrapping as the uint8 rows do.
         """
-        self._tiles[destination_index] += np.asarray(tiles, dtype="B")
-        self._tiles[source_index] -= np.asarray(tiles, dtype="B")
-        self._check_tile_integrity()
+        source_keys = TILE_KEYS[source_index]
+        target_keys = TILE_KEYS[destination_index]
+        source = self._tiles[source_index].tolist()
+        destination = self._tiles[destination_index].tolist()
+        key = self.key
+        for color, n in enumerate(moved):
+            if n:
+                count_keys, count = source_keys[color], source[color]
+                key ^= count_keys[(count + n) & 0xFF] ^ count_keys[count]
+                count_keys, count = target_keys[color], destination[color]
+                key ^= count_keys[(count - n) & 0xFF] ^ count_keys[count]
+        self.key = key
+
+    def deal_to_factory_displays(self, source_index: int, tiles: np.ndarray) -> None:
+        """Move tiles from a source row to every factory display at once.
+
+        Args:
+            source_index:  Integer tile index from which tiles are sent
+            tiles:  (n_factory_displays, 6) unsigned int ndarray of the tiles
+                each factory display receives
+
+        Raises:
+            ValueError if the move breaks tile integrity under the Tiles
+            validation mode.
+        """
+        tiles = np.asarray(tiles, dtype="B")
+        total = tiles.sum(axis=0, dtype="B")
+        if self.validation is TileValidation.delta:
+            self._check_move_integrity(source_index, self.factory_display_index, total)
+        rows = [source_index, *self.layout.factory_display_rows.tolist()]
+        before = self._tiles[rows].tolist()
+        self._factory_displays += tiles
+        self._tiles[source_index] -= total
+        if self.validation is TileValidation.full:
+            self._check_tile_integrity()
+        key = self.key
+        for row, counts, updated in zip(rows, before, self._tiles[rows].tolist()):
+            key ^= tile_row_key(row, counts) ^ tile_row_key(row, updated)
+        self.key = key
 
     def refill_bag_from_tower(self) -> None:
         """Move all tiles from the Tower to the Bag.
@@ -298,9 +419,14 @@ class Tiles:
         Returns:
             None
         """
-        self.view_player_board_n(player)[cost - 1][color] += 1
-        self.view_player_reserve_n(player)[color] -= 1
-        self._check_tile_integrity()
+        self.move_tiles(
+            source_index=self.player_reserve_index + player,
+            destination_index=self.player_board_index
+            + player * self.player_board_row_count
+            + cost
+            - 1,
+            tiles=_SINGLE_TILES[color],
+        )
 
     def _play_tile_to_wild_star(
         self,
@@ -321,9 +447,13 @@ class Tiles:
         Returns:
             None
         """
-        self.view_player_board_n(player)[StarColor.Wild][color] += 1
-        self.view_player_reserve_n(player)[color] -= 1
-        self._check_tile_integrity()
+        self.move_tiles(
+            source_index=self.player_reserve_index + player,
+            destination_index=self.player_board_index
+            + player * self.player_board_row_count
+            + StarColor.Wild,
+            tiles=_SINGLE_TILES[color],
+        )
 
     def play_tile(
         self,
@@ -370,5 +500,30 @@ class Tiles:
             f" are allowed per tile type."
         )
 
+    def _check_move_integrity(
+        self, source_index: int, destination_index: int, tiles: np.ndarray
+    ) -> None:
+        """Validate that moving tiles from the source to the destination
+        conserves tiles.
+
+        Only the source row is checked.  Every move adds to the destination
+        exactly what it removes from the source, so column totals stay at 22
+        as long as no row goes negative, which also means no row can
+        overflow.  A move from a row to itself is a no-op.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError if the move would take more tiles than the source holds.
+        """
+        if source_index == destination_index:
+            return
+        if (tiles > self._tiles[source_index]).any():
+            raise ValueError(
+                f"Cannot move {tiles} from row {source_index} holding"
+                f" {self._tiles[source_index]}.  Rows cannot hold negative tiles."
+            )
+
     def color_is_played_in_wild_star(self, player: int, color: TileColor) -> bool:
         return self.view_player_board_n(player)[StarColor.Wild][color]
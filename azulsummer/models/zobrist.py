@@ -0,0 +1,133 @@
+"""Module containing the Zobrist keys used to hash game states
+
+Each feature of a State is given a random 64-bit key, and the hash of a State
+is the XOR of the keys of the features it holds:
+
+    * (tile row, color, count) for every tile row, see TILE_KEYS
+    * (player, star, position) for every covered board cell, see BOARD_KEYS
+    * the wild tile, phase, current player and start player counters
+    * the active flag of every player in Phase Two
+
+A change to one feature is hashed by XORing out its old key and XORing in its
+new one, so Tiles and Board keep their part of the key up to date as tiles
+move rather than rehashing every row.  The keys are drawn from a fixed seed
+so hashes are equal across processes and runs.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from azulsummer.models.enums import PLAYER_TO_DISPLAY_RATIO
+from azulsummer.models.enums import Phase
+from azulsummer.models.enums import StarColor
+from azulsummer.models.enums import StateCounter
+from azulsummer.models.enums import TileColor
+from azulsummer.models.enums import WildTiles
+from azulsummer.models.tile_layout import TILE_LAYOUTS
+
+ZOBRIST_SEED: int = 0x5A0B_2157
+
+MAX_PLAYERS: int = max(PLAYER_TO_DISPLAY_RATIO)
+MAX_TILE_ROWS: int = max(layout.n_rows for layout in TILE_LAYOUTS.values())
+# A row holds at most the 22 tiles of a color, but every uint8 count is given
+# a key so rows corrupted under TileValidation.off can still be hashed
+N_TILE_COUNTS: int = 256
+N_CELLS: int = len(StarColor) * 6
+
+
+def _draw_keys(rng: np.random.Generator, shape: tuple[int, ...]) -> np.ndarray:
+    return rng.integers(0, 2**64, size=shape, dtype=np.uint64)
+
+
+def _build_keys() -> dict[str, np.ndarray]:
+    rng = np.random.default_rng(ZOBRIST_SEED)
+    tile_keys = _draw_keys(rng, (MAX_TILE_ROWS, len(TileColor), N_TILE_COUNTS))
+    # Empty cells hash to 0 so the hash only depends on the tiles held
+    tile_keys[:, :, 0] = 0
+    # Unset counters (-1) are looked up at index 0, see counters_key()
+    return {
+        "tiles": tile_keys,
+        "board": _draw_keys(rng, (MAX_PLAYERS, N_CELLS)),
+        "wild_tile": _draw_keys(rng, (len(WildTiles) + 1,)),
+        "phase": _draw_keys(rng, (len(Phase) + 1,)),
+        "current_player": _draw_keys(rng, (MAX_PLAYERS + 1,)),
+        "start_player": _draw_keys(rng, (MAX_PLAYERS + 1,)),
+        "active_player": _draw_keys(rng, (MAX_PLAYERS,)),
+    }
+
+
+_KEYS: dict[str, np.ndarray] = _build_keys()
+for _keys in _KEYS.values():
+    _keys.flags.writeable = False
+
+# Python int tables for the incremental updates.  Indexing a nested tuple with
+# Python ints is much faster than indexing an ndarray.
+
+# TILE_KEYS[row][color][count]
+TILE_KEYS: tuple[tuple[tuple[int, ...], ...], ...] = tuple(
+    tuple(tuple(counts) for counts in row) for row in _KEYS["tiles"].tolist()
+)
+# BOARD_KEYS[player][star * 6 + tile_value - 1]
+BOARD_KEYS: tuple[tuple[int, ...], ...] = tuple(
+    tuple(cells) for cells in _KEYS["board"].tolist()
+)
+WILD_TILE_KEYS: tuple[int, ...] = tuple(_KEYS["wild_tile"].tolist())
+PHASE_KEYS: tuple[int, ...] = tuple(_KEYS["phase"].tolist())
+CURRENT_PLAYER_KEYS: tuple[int, ...] = tuple(_KEYS["current_player"].tolist())
+START_PLAYER_KEYS: tuple[int, ...] = tuple(_KEYS["start_player"].tolist())
+ACTIVE_PLAYER_KEYS: tuple[int, ...] = tuple(_KEYS["active_player"].tolist())
+
+
+def _xor_all(keys: np.ndarray) -> int:
+    return int(np.bitwise_xor.reduce(keys, axis=None)) if keys.size else 0
+
+
+def tiles_key(tile_array: np.ndarray) -> int:
+    """Hash every tile row from scratch.
+
+    Args:
+        tile_array:  The 2D uint8 array of a Tiles
+
+    Returns:
+        The XOR of the key of every (row, color, count)
+    """
+    rows, colors = tile_array.shape
+    return _xor_all(
+        _KEYS["tiles"][
+            np.arange(rows)[:, None], np.arange(colors)[None, :], tile_array
+        ]
+    )
+
+
+def tile_row_key(row: int, counts: list[int]) -> int:
+    """Hash a single tile row holding counts tiles of each color"""
+    key = 0
+    for color_keys, count in zip(TILE_KEYS[row], counts):
+        key ^= color_keys[count]
+    return key
+
+
+def board_key(board: np.ndarray, player: int) -> int:
+    """Hash the covered cells of a player's 7x6 board from scratch"""
+    return _xor_all(_KEYS["board"][player][board.reshape(-1) != 0])
+
+
+def counters_key(counters: np.ndarray) -> int:
+    """Hash the wild tile, phase, player and active player counters.
+
+    Args:
+        counters:  The int16 counter array of a State
+
+    Returns:
+        The XOR of the key of each counter
+    """
+    key = (
+        WILD_TILE_KEYS[counters.item(StateCounter.WildTile) + 1]
+        ^ PHASE_KEYS[counters.item(StateCounter.Phase) + 1]
+        ^ CURRENT_PLAYER_KEYS[counters.item(StateCounter.CurrentPlayer) + 1]
+        ^ START_PLAYER_KEYS[counters.item(StateCounter.StartPlayer) + 1]
+    )
+    for player, active in enumerate(counters[StateCounter.ActivePlayers :].tolist()):
+        if active == 1:
+            key ^= ACTIVE_PLAYER_KEYS[player]
+    return key
@@ -0,0 +1,354 @@
+"""Module containing the MCTSPlayer class.  This player chooses its actions
+with a Monte Carlo Tree Search over the integer action space."""
+
+from __future__ import annotations
+
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Optional
+
+import numpy as np
+
+from azulsummer.models.action_space import PASS_ACTION
+from azulsummer.models.action_space import encode_board_placement
+from azulsummer.models.action_space import encode_draw
+from azulsummer.models.action_space import sample_action
+from azulsummer.models.action_space import wild_color_of
+from azulsummer.models.enums import Phase
+from azulsummer.models.game import Game
+from azulsummer.models.logic.action_mask import legal_action_mask
+from azulsummer.models.random import Seed
+from azulsummer.models.state import State
+from azulsummer.players.player import Player
+
+
+@dataclass(slots=True)
+class _DecisionNode:
+    """A State where the player to move chooses an action"""
+
+    player: int
+    untried: list[int]
+    terminal: bool
+    visits: int = 0
+    # {action: chance node of the action's outcomes}
+    edges: dict[int, _ChanceNode] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class _ChanceNode:
+    """The outcomes of taking an action, keyed by the State.hash_key reached.
+
+    An action drawing tiles from the bag reaches a different State for each
+    draw, so each draw sampled by the search game's RandomTileDraw grows its
+    own outcome.  Deterministic actions have a single outcome.
+    """
+
+    # Reward summed over the visits for each player
+    rewards: list[float]
+    visits: int = 0
+    outcomes: dict[int, _DecisionNode] = field(default_factory=dict)
+
+
+@dataclass(frozen=True, slots=True)
+class SearchResult:
+    """Root statistics of a search, merged over the workers"""
+
+    # {action: visits} of the root's actions
+    visits: dict[int, int]
+    iterations: int
+    seconds: float
+    n_workers: int
+
+    @property
+    def best_action(self) -> int:
+        """The most visited action, the lowest action on ties"""
+        return max(sorted(self.visits), key=self.visits.__getitem__)
+
+    @property
+    def iterations_per_second(self) -> float:
+        return self.iterations / self.seconds if self.seconds else 0.0
+
+
+class MCTSPlayer(Player):
+    """Player choosing actions by Monte Carlo Tree Search.
+
+    Each iteration walks down the tree by UCT, expands one action, plays
+    uniformly random actions to the end of the round and backs up the round's
+    result: a reward of 1 shared by the players with the highest score.
+    Actions are applied to one copy of the game and undone afterwards, see
+    Game.apply().
+
+    Root parallelisation:  with n_workers > 1 each worker process searches
+    its own tree from the same root, and the visit counts of the root's
+    actions are summed over the workers to choose the action.  The process
+    pool is created on the first parallel search and kept until close().
+
+    The search is limited by iterations, by time_limit seconds, or by
+    whichever comes first when both are given.  Iterations are split between
+    the workers while time_limit applies to each worker.
+    """
+
+    def __init__(
+        self,
+        iterations: Optional[int] = 1000,
+        time_limit: Optional[float] = None,
+        n_workers: int = 1,
+        exploration: float = math.sqrt(2),
+        max_rollout_plies: int = 200,
+        seed: Optional[Seed] = None,
+    ) -> None:
+        """Initialize an MCTSPlayer.
+
+        Args:
+            iterations:  Optional number of iterations per search
+            time_limit:  Optional seconds per search
+            n_workers:  The number of processes searching in parallel
+            exploration:  The UCT exploration constant
+            max_rollout_plies:  The most random actions played per rollout
+            seed:  Int seed or SeedSequence for the rollouts and tile draws.
+                None draws fresh entropy.
+
+        Raises:
+            ValueError if neither budget is given or n_workers is below 1
+        """
+        super().__init__()
+        if iterations is None and time_limit is None:
+            raise ValueError("An iteration or time budget is required.")
+        if n_workers < 1:
+            raise ValueError(f"{n_workers} is not a valid number of workers.")
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.n_workers = n_workers
+        self.exploration = exploration
+        self.max_rollout_plies = max_rollout_plies
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        self.seed_sequence: np.random.SeedSequence = seed
+        self.last_search: Optional[SearchResult] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> MCTSPlayer:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the worker processes, if any were started"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _assess(self, action: "Action") -> Optional["Action"]:
+        """Search the message's game and play the matching available action.
+
+        Returns:
+            The available action, or None to pass
+        """
+        game = action.game
+        best = self.search(game)
+        if best == PASS_ACTION:
+            # Passing has no available action object to play
+            return None
+        wild_color = wild_color_of(game.wild_tile)
+        for available in action.available_actions:
+            if game.phase == Phase.acquire_tile:
+                encoded = encode_draw(available, wild_color)
+            else:
+                encoded = encode_board_placement(
+                    available.board_position, available.tile_cost, wild_color
+                )
+            if encoded == best:
+                return available
+        raise ValueError(f"The searched action {best} is not available.")
+
+    def search(self, game: Game) -> int:
+        """Search the game for its current player's action.
+
+        The game is not changed.  The root statistics are kept in
+        last_search.
+
+        Args:
+            game:  The Game, at a decision of its current player
+
+        Returns:
+            The integer action with the most root visits
+        """
+        seeds = self.seed_sequence.spawn(self.n_workers)
+        iterations = self.iterations
+        if iterations is not None:
+            iterations = -(-iterations // self.n_workers)
+        job = (
+            game.state.to_bytes(),
+            iterations,
+            self.time_limit,
+            self.exploration,
+            self.max_rollout_plies,
+        )
+        start = time.perf_counter()
+        if self.n_workers == 1:
+            results = [_search_worker(*job, seeds[0])]
+        else:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(self.n_workers)
+            futures = [self._pool.submit(_search_worker, *job, seed) for seed in seeds]
+            results = [future.result() for future in futures]
+        seconds = time.perf_counter() - start
+
+        visits: dict[int, int] = {}
+        for root_visits, _ in results:
+            for root_action, count in root_visits.items():
+                visits[root_action] = visits.get(root_action, 0) + count
+        self.last_search = SearchResult(
+            visits,
+            sum(n_iterations for _, n_iterations in results),
+            seconds,
+            self.n_workers,
+        )
+        return self.last_search.best_action
+
+
+def _search_worker(
+    packed_state: bytes,
+    iterations: Optional[int],
+    time_limit: Optional[float],
+    exploration: float,
+    max_rollout_plies: int,
+    seed: np.random.SeedSequence,
+) -> tuple[dict[int, int], int]:
+    """Search a State, packed by State.to_bytes(), in a worker.
+
+    Returns:
+        The {action: visits} of the root and the number of iterations run
+    """
+    draw_seed, rollout_seed = seed.spawn(2)
+    state = State.from_bytes(packed_state)
+    game = Game(
+        "search",
+        [None] * state.n_players,
+        draw_seed,
+        state.tiles.validation,
+        state.board_backend,
+    )
+    game.emits_events = False
+    game.state = state
+    game.layout = game.state.tiles.layout
+    rng = np.random.default_rng(rollout_seed)
+    tree = _Tree(game, exploration, max_rollout_plies, rng)
+
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    n_iterations = 0
+    while iterations is None or n_iterations < iterations:
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        tree.iterate()
+        n_iterations += 1
+    return {
+        action: edge.visits for action, edge in tree.root.edges.items()
+    }, n_iterations
+
+
+def round_is_over(game: Game) -> bool:
+    """Check if every player has passed, ending the searched round"""
+    return game.phase == Phase.play_tiles and not game.active_players.any()
+
+
+def round_rewards(game: Game) -> list[float]:
+    """Share a reward of 1 between the players with the highest score"""
+    scores = game.score.tolist()
+    best = max(scores)
+    n_best = scores.count(best)
+    return [1 / n_best if score == best else 0.0 for score in scores]
+
+
+class _Tree:
+    """Search tree over a game that is changed in place and restored"""
+
+    def __init__(
+        self,
+        game: Game,
+        exploration: float,
+        max_rollout_plies: int,
+        rng: np.random.Generator,
+    ) -> None:
+        self.game = game
+        self.exploration = exploration
+        self.max_rollout_plies = max_rollout_plies
+        self.rng = rng
+        self.n_players = game.n_players
+        self.root = self._node()
+
+    def _node(self) -> _DecisionNode:
+        game = self.game
+        if round_is_over(game):
+            return _DecisionNode(game.current_player_index, [], True)
+        untried = np.flatnonzero(legal_action_mask(game)).tolist()
+        return _DecisionNode(game.current_player_index, untried, not untried)
+
+    def iterate(self) -> None:
+        """Run one selection, expansion, rollout and backup"""
+        game = self.game
+        node = self.root
+        path = [node]
+        edges = []
+        tokens = []
+        while not node.terminal:
+            if node.untried:
+                action = node.untried.pop(self.rng.integers(len(node.untried)))
+                edge = node.edges[action] = _ChanceNode([0.0] * self.n_players)
+            else:
+                action, edge = self._select(node)
+            tokens.append(game.apply(action, check=False))
+            edges.append(edge)
+            key = game.hash_key
+            child = edge.outcomes.get(key)
+            if child is None:
+                node = edge.outcomes[key] = self._node()
+                path.append(node)
+                break
+            node = child
+            path.append(node)
+
+        rewards = self._rollout()
+        for node in path:
+            node.visits += 1
+        for edge in edges:
+            edge.visits += 1
+            edge.rewards = [
+                total + reward for total, reward in zip(edge.rewards, rewards)
+            ]
+        for token in reversed(tokens):
+            game.undo(token)
+
+    def _select(self, node: _DecisionNode) -> tuple[int, _ChanceNode]:
+        """Choose the edge with the highest UCT score for the node's player"""
+        player = node.player
+        log_visits = math.log(node.visits)
+        exploration = self.exploration
+        best, best_score = None, -math.inf
+        for action, edge in node.edges.items():
+            score = edge.rewards[player] / edge.visits + exploration * math.sqrt(
+                log_visits / edge.visits
+            )
+            if score > best_score:
+                best, best_score = action, score
+        return best, node.edges[best]
+
+    def _rollout(self) -> list[float]:
+        """Play random actions to the end of the round and score it"""
+        game = self.game
+        tokens = []
+        for _ in range(self.max_rollout_plies):
+            if round_is_over(game):
+                break
+            mask = legal_action_mask(game)
+            if not mask.any():
+                break
+            tokens.append(game.apply(sample_action(mask, self.rng), check=False))
+        rewards = round_rewards(game)
+        for token in reversed(tokens):
+            game.undo(token)
+        return rewards
@@ -5,6 +5,8 @@ from __future__ import annotations
 import abc
 from abc import ABC
 
+import numpy as np
+
 
 class Player(ABC):
     def __init__(self):
@@ -21,6 +23,15 @@ class Player(ABC):
         """
         pass
 
+    def select_action(self, mask: np.ndarray) -> int:
+        """Choose an integer action from a legal action mask.
+
+        See action_space for the integer actions and
+        logic.action_mask.legal_action_mask() for building the mask.  The
+        lowest legal action is chosen by default.
+        """
+        return int(np.flatnonzero(mask)[0])
+
     def handle_event(self, message):
         pass
 
@@ -1,20 +1,30 @@
-"""Module containing the ActionOnePlayer class.  This player always plays the
-first action in the action list."""
+"""Module containing the RandomPlayer class.  This player plays a random
+available action."""
 
 from __future__ import annotations
 
-import random
 from typing import Optional
 
+import numpy as np
+
+from azulsummer.models.action_space import sample_action
+from azulsummer.models.random import Seed
 from azulsummer.players.player import Player
 
 
 class RandomPlayer(Player):
     """Player class that randomly chooses an available action."""
 
-    def __init__(self, seed: Optional[int] = None) -> None:
+    def __init__(self, seed: Optional[Seed] = None) -> None:
         super().__init__()
         self.seed = seed if seed else 1
+        self.rng = np.random.default_rng(self.seed)
 
     def _assess(self, action):
-        return random.choice(action.available_actions)
+        # Drawn from the player's own stream so seeded games repeat
+        available = action.available_actions
+        return available[self.rng.integers(len(available))]
+
+    def select_action(self, mask: np.ndarray) -> int:
+        """Choose a legal action without creating the action objects"""
+        return sample_action(mask, self.rng)
@@ -0,0 +1,234 @@
+"""Module containing the TranspositionTable used by search players.
+
+Search results are stored by the Zobrist key of the searched State, see
+State.hash_key, so a position reached by different move orders is searched
+once.  The table is a single numpy array of fixed size, split into buckets of
+BUCKET_SIZE entries.  A key is only ever stored in the bucket selected by its
+low bits, and when that bucket is full the ReplacementPolicy picks the entry
+to overwrite.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from azulsummer.models.enums import ReplacementPolicy
+
+# Entries per bucket, probed in order on every lookup and store
+BUCKET_SIZE: int = 4
+
+# Packed record of a single entry.  Empty entries have a depth of -1.
+ENTRY_DTYPE = np.dtype(
+    [
+        ("key", "<u8"),
+        ("value", "<f4"),
+        ("visits", "<u4"),
+        ("depth", "<i2"),
+        ("best_action", "<i2"),
+    ]
+)
+ENTRY_BYTES: int = ENTRY_DTYPE.itemsize
+
+# best_action stored when an entry has no best action
+NO_ACTION: int = -1
+
+_EMPTY_DEPTH: int = -1
+_DEPTH: int = ENTRY_DTYPE.names.index("depth")
+
+
+class ReadOnlyTableError(Exception):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class TableEntry:
+    """A search result held by a TranspositionTable"""
+
+    key: int
+    value: float
+    visits: int
+    depth: int
+    best_action: int
+
+
+class TranspositionTable:
+    """Fixed size table of search results keyed by State.hash_key.
+
+    The table never grows.  Its entry array is the largest power of two
+    number of buckets fitting in max_bytes, allocated once, so the memory
+    taken is known up front.
+
+    hits and misses count lookups.  collisions counts stores finding their
+    bucket full of other keys, and rejections the stores among those that
+    the ReplacementPolicy dropped.
+
+    Sharing between processes:  lookups only read the entry array, so a
+    table filled before forking worker processes is shared by them through
+    copy-on-write without its pages being copied.  Call freeze() before
+    forking so a worker storing into the shared table raises rather than
+    silently copying the pages it writes.  The counters are plain attributes
+    and are counted separately by each process.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        policy: ReplacementPolicy = ReplacementPolicy.depth_preferred,
+    ) -> None:
+        """Initialize an empty table.
+
+        Args:
+            max_bytes:  Hard cap on the bytes taken by the entry array
+            policy:  The ReplacementPolicy applied when a bucket is full
+
+        Raises:
+            ValueError if max_bytes cannot hold a single bucket
+        """
+        n_buckets = max_bytes // (ENTRY_BYTES * BUCKET_SIZE)
+        if n_buckets < 1:
+            raise ValueError(
+                f"{max_bytes} bytes cannot hold a bucket of"
+                f" {ENTRY_BYTES * BUCKET_SIZE} bytes."
+            )
+        n_buckets = 1 << (n_buckets.bit_length() - 1)
+        self.max_bytes: int = max_bytes
+        self.policy: ReplacementPolicy = policy
+        self.capacity: int = n_buckets * BUCKET_SIZE
+        self._bucket_mask: int = n_buckets - 1
+        self._entries: np.ndarray = np.zeros(self.capacity, ENTRY_DTYPE)
+        self._entries["depth"] = _EMPTY_DEPTH
+        self.reset_counters()
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(capacity={self.capacity}, "
+            f"nbytes={self.nbytes}, policy={self.policy.name})"
+        )
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self._entries["depth"] != _EMPTY_DEPTH))
+
+    @property
+    def nbytes(self) -> int:
+        """Get the bytes taken by the entry array"""
+        return self._entries.nbytes
+
+    @property
+    def read_only(self) -> bool:
+        return not self._entries.flags.writeable
+
+    @property
+    def counters(self) -> dict[str, int]:
+        """Get the lookup and store counters by name"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "collisions": self.collisions,
+            "rejections": self.rejections,
+        }
+
+    @property
+    def hit_rate(self) -> float:
+        """Get the fraction of lookups that found their key"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def reset_counters(self) -> None:
+        self.hits: int = 0
+        self.misses: int = 0
+        self.collisions: int = 0
+        self.rejections: int = 0
+
+    def _bucket_start(self, key: int) -> int:
+        return (key & self._bucket_mask) * BUCKET_SIZE
+
+    def lookup(self, key: int) -> Optional[TableEntry]:
+        """Find the entry stored for a key.
+
+        Args:
+            key:  The 64-bit State.hash_key
+
+        Returns:
+            The TableEntry, or None if the key is not in the table
+        """
+        start = self._bucket_start(key)
+        for entry in self._entries[start : start + BUCKET_SIZE].tolist():
+            if entry[0] == key and entry[_DEPTH] != _EMPTY_DEPTH:
+                self.hits += 1
+                return TableEntry(*entry)
+        self.misses += 1
+        return None
+
+    def store(
+        self,
+        key: int,
+        value: float,
+        visits: int,
+        depth: int,
+        best_action: int = NO_ACTION,
+    ) -> bool:
+        """Store a search result, replacing any entry held for the same key.
+
+        Args:
+            key:  The 64-bit State.hash_key
+            value:  The value of the State for the searching player
+            visits:  The number of visits or simulations behind the value
+            depth:  The non-negative depth the State was searched to
+            best_action:  The integer action found best, or NO_ACTION
+
+        Returns:
+            True if the entry was stored, False if the ReplacementPolicy
+            kept the bucket's entries instead
+
+        Raises:
+            ReadOnlyTableError if the table was frozen
+        """
+        if self.read_only:
+            raise ReadOnlyTableError("Cannot store into a frozen table.")
+        start = self._bucket_start(key)
+        bucket = self._entries[start : start + BUCKET_SIZE].tolist()
+        slot = None
+        for i, entry in enumerate(bucket):
+            if entry[_DEPTH] == _EMPTY_DEPTH:
+                if slot is None:
+                    slot = i
+            elif entry[0] == key:
+                slot = i
+                break
+        else:
+            if slot is None:
+                self.collisions += 1
+                depths = [entry[_DEPTH] for entry in bucket]
+                slot = self._victim(key, depths, depth)
+                if slot is None:
+                    self.rejections += 1
+                    return False
+        self._entries[start + slot] = (key, value, visits, depth, best_action)
+        return True
+
+    def _victim(self, key: int, depths: list[int], depth: int) -> Optional[int]:
+        """Get the slot of a full bucket to overwrite with an entry of depth"""
+        if self.policy is ReplacementPolicy.always:
+            # The low bits of the key pick the bucket, the high bits the slot
+            return (key >> 32) % BUCKET_SIZE
+        if self.policy is ReplacementPolicy.depth_preferred:
+            shallowest = depths.index(min(depths))
+            return shallowest if depths[shallowest] <= depth else None
+        # two_tier:  the last slot takes whatever the depth preferred slots reject
+        preferred = depths[:-1]
+        shallowest = preferred.index(min(preferred))
+        return shallowest if preferred[shallowest] <= depth else BUCKET_SIZE - 1
+
+    def clear(self) -> None:
+        """Empty the table and reset its counters"""
+        if self.read_only:
+            raise ReadOnlyTableError("Cannot clear a frozen table.")
+        self._entries.fill(0)
+        self._entries["depth"] = _EMPTY_DEPTH
+        self.reset_counters()
+
+    def freeze(self) -> None:
+        """Make the table read-only, see the class docstring"""
+        self._entries.flags.writeable = False
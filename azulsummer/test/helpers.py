@@ -0,0 +1,42 @@
+"""Helpers shared by the tests that play or apply actions to a game
+
+run_until() is the benchmarks' fixture, so tests and benchmarks set up
+their games the same way.
+"""
+
+import numpy as np
+
+from azulsummer.benchmarks.fixtures import first_decision
+from azulsummer.benchmarks.fixtures import run_until
+from azulsummer.models.action_space import sample_action
+from azulsummer.models.enums import BoardBackend
+from azulsummer.models.enums import Phase
+from azulsummer.models.game import Game
+from azulsummer.models.logic.action_mask import legal_action_mask
+from azulsummer.players.actiononeplayer import ActionOnePlayer
+
+
+def game_at_first_turn(
+    n_players: int, seed: int, board_backend: BoardBackend = BoardBackend.array
+) -> Game:
+    """Run a game's setup actions up to the first player decision"""
+    players = [ActionOnePlayer() for _ in range(n_players)]
+    return first_decision(n_players, seed, board_backend, players)
+
+
+def snapshot(game: Game) -> tuple[bytes, list]:
+    state = game.state
+    return state._buffer.tobytes(), [
+        getattr(board, "bits", None) for board in state.boards
+    ]
+
+
+def random_line(game: Game, rng: np.random.Generator, max_plies: int = 200):
+    """Yield random legal actions until Phase Two ends"""
+    for _ in range(max_plies):
+        if game.phase == Phase.play_tiles and not game.active_players.any():
+            return
+        mask = legal_action_mask(game)
+        if not mask.any():
+            return
+        yield sample_action(mask, rng)
@@ -0,0 +1,218 @@
+"""Tests for the fixed integer action space"""
+
+import numpy as np
+import pytest
+
+from azulsummer.models import action_space
+from azulsummer.models.action_space import ACTION_KIND
+from azulsummer.models.action_space import ACTION_SPACE_SIZE
+from azulsummer.models.action_space import PASS_ACTION
+from azulsummer.models.action_space import TABLE_CENTER_SOURCE
+from azulsummer.models.action_space import InvalidActionError
+from azulsummer.models.action_space import board_position
+from azulsummer.models.action_space import decode
+from azulsummer.models.action_space import draw_position
+from azulsummer.models.action_space import encode_acquire
+from azulsummer.models.action_space import encode_board_placement
+from azulsummer.models.action_space import encode_draw
+from azulsummer.models.action_space import encode_keep
+from azulsummer.models.action_space import encode_placement
+from azulsummer.models.action_space import keep_tiles
+from azulsummer.models.action_space import placement_cost
+from azulsummer.models.action_space import sample_action
+from azulsummer.models.enums import ActionKind
+from azulsummer.models.enums import Phase
+from azulsummer.models.enums import StarColor
+from azulsummer.models.enums import TileColor
+from azulsummer.models.enums import TileIndex
+from azulsummer.models.enums import WildTiles
+from azulsummer.models.game import Game
+from azulsummer.models.logic.action_mask import legal_action_mask
+from azulsummer.models.logic.board import (
+    generate_available_player_tile_placement_actions,
+)
+from azulsummer.models.logic.board import generate_available_player_tile_placements
+from azulsummer.models.logic.tiles import generate_acquire_tile_draw_actions
+from azulsummer.models.logic.tiles import generate_acquire_tile_draws
+from azulsummer.players.actiononeplayer import ActionOnePlayer
+from azulsummer.players.randomplayer import RandomPlayer
+
+
+def random_game(n_players: int, seed: int) -> Game:
+    """Make a game with random displays, center, reserve and board for player 0"""
+    rng = np.random.default_rng(seed)
+    game = Game.new([None] * n_players)
+    game.make_state()
+    game.state.wild_tile = WildTiles(rng.integers(len(WildTiles)))
+    game.current_player_index = 0
+    tiles = game.tiles._tiles
+    layout = game.layout
+    for row in layout.factory_display_rows:
+        tiles[row] = rng.multinomial(4, [1 / 6] * 6) * (rng.random() < 0.8)
+    tiles[TileIndex.TableCenter] = rng.integers(0, 3, 6) * (rng.random(6) < 0.5)
+    tiles[layout.player_reserve_rows[0]] = rng.integers(0, 5, 6)
+
+    board = game.get_player_board(0)
+    board_row = layout.player_board_rows[0]
+    for cell in rng.choice(42, size=rng.integers(0, 30), replace=False):
+        star, tile_value = StarColor(cell // 6), cell % 6 + 1
+        if star == StarColor.Wild:
+            color = rng.integers(6)
+            if tiles[board_row + StarColor.Wild, color]:
+                continue
+            tiles[board_row + StarColor.Wild, color] = 1
+        board.place_tile(star, tile_value)
+    return game
+
+
+def test_action_space_blocks():
+    assert ACTION_SPACE_SIZE == 60 + 6 + 252 + 1 + 210
+    assert ACTION_SPACE_SIZE <= np.iinfo(np.uint16).max
+    for kind, (offset, size) in action_space.ACTION_BLOCKS.items():
+        assert (ACTION_KIND[offset : offset + size] == kind).all()
+    assert ACTION_KIND[PASS_ACTION] == ActionKind.Pass
+
+
+def test_decode_encode_round_trip():
+    for action in range(ACTION_SPACE_SIZE):
+        decoded = decode(action)
+        if decoded.kind == ActionKind.Acquire:
+            encoded = encode_acquire(decoded.source, decoded.color)
+        elif decoded.kind == ActionKind.Bonus:
+            encoded = action_space.encode_bonus(decoded.color)
+        elif decoded.kind == ActionKind.Place:
+            encoded = encode_placement(
+                decoded.star, decoded.color, decoded.tile_value, decoded.n_wild
+            )
+        elif decoded.kind == ActionKind.Keep:
+            encoded = encode_keep(decoded.tiles)
+        else:
+            encoded = PASS_ACTION
+        assert encoded == action
+
+
+@pytest.mark.parametrize("action", [-1, ACTION_SPACE_SIZE])
+def test_decode_out_of_range(action):
+    with pytest.raises(InvalidActionError):
+        decode(action)
+
+
+@pytest.mark.parametrize(
+    "star,color,tile_value,n_wild",
+    [
+        (StarColor.Red, TileColor.Blue, 1, 0),
+        (StarColor.Red, TileColor.Red, 3, 3),
+        (StarColor.Red, TileColor.Red, 7, 0),
+    ],
+)
+def test_encode_invalid_placement(star, color, tile_value, n_wild):
+    with pytest.raises(InvalidActionError):
+        encode_placement(star, color, tile_value, n_wild)
+
+
+def test_encode_invalid_keep():
+    with pytest.raises(InvalidActionError):
+        encode_keep([2, 0, 0, 3, 0, 0])
+
+
+def test_placement_reconstruction():
+    action = encode_placement(StarColor.Wild, TileColor.Blue, 4, 1)
+    assert board_position(action).star == StarColor.Wild
+    assert board_position(action).tile_value == 4
+    assert placement_cost(action, TileColor.Green) == (0, 0, 3, 0, 1, 0)
+    with pytest.raises(InvalidActionError):
+        keep_tiles(action)
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+@pytest.mark.parametrize("seed", range(10))
+def test_acquire_actions_match_draw_generator(n_players, seed):
+    game = random_game(n_players, seed)
+    wild_color = TileColor[game.wild_tile.name]
+    draws = list(generate_acquire_tile_draws(game.tiles, game.wild_tile))
+    actions = generate_acquire_tile_draw_actions(game.tiles, game.wild_tile)
+
+    assert [encode_draw(draw, wild_color) for draw in draws] == actions.tolist()
+    for draw, action in zip(draws, actions):
+        source = action_space.ACTION_SOURCE[action]
+        if source == TABLE_CENTER_SOURCE:
+            source_tiles = game.tiles.view_table_center()
+        else:
+            source_tiles = game.tiles.view_factory_display_n(source)
+        assert draw_position(action, source_tiles, wild_color) == draw
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+@pytest.mark.parametrize("seed", range(10))
+def test_placement_actions_match_placement_generator(n_players, seed):
+    game = random_game(n_players, seed)
+    wild_color = TileColor[game.wild_tile.name]
+    placements = {
+        (placement.board_position, placement.tile_cost)
+        for placement in generate_available_player_tile_placements(game)
+    }
+    actions = generate_available_player_tile_placement_actions(game)
+
+    assert len(actions) == len(placements)
+    assert {
+        (board_position(action), placement_cost(action, wild_color))
+        for action in actions
+    } == placements
+    assert {
+        encode_board_placement(position, cost, wild_color)
+        for position, cost in placements
+    } == set(actions.tolist())
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+@pytest.mark.parametrize("seed", range(10))
+def test_acquire_mask_matches_draw_generator(n_players, seed):
+    game = random_game(n_players, seed)
+    game.phase = Phase.acquire_tile
+    wild_color = TileColor[game.wild_tile.name]
+    draws = generate_acquire_tile_draws(game.tiles, game.wild_tile)
+
+    expected = [encode_draw(draw, wild_color) for draw in draws]
+    assert np.flatnonzero(legal_action_mask(game)).tolist() == expected
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+@pytest.mark.parametrize("seed", range(10))
+def test_placement_mask_matches_placement_generator(n_players, seed):
+    game = random_game(n_players, seed)
+    game.phase = Phase.play_tiles
+    wild_color = TileColor[game.wild_tile.name]
+    expected = {
+        encode_board_placement(
+            placement.board_position, placement.tile_cost, wild_color
+        )
+        for placement in generate_available_player_tile_placements(game)
+    }
+    expected.add(PASS_ACTION)
+    assert set(np.flatnonzero(legal_action_mask(game)).tolist()) == expected
+
+
+def test_mask_is_empty_between_phases():
+    game = random_game(2, 0)
+    game.phase = Phase.prepare_next_round
+    assert not legal_action_mask(game).any()
+
+
+def test_sample_action_only_draws_legal_actions():
+    mask = np.zeros(ACTION_SPACE_SIZE, dtype=bool)
+    mask[[3, 70, PASS_ACTION]] = True
+    rng = np.random.default_rng(0)
+    assert {sample_action(mask, rng) for _ in range(100)} == {3, 70, PASS_ACTION}
+    with pytest.raises(InvalidActionError):
+        sample_action(np.zeros(ACTION_SPACE_SIZE, dtype=bool), rng)
+
+
+def test_players_select_from_mask():
+    game = random_game(3, 4)
+    game.phase = Phase.acquire_tile
+    mask = legal_action_mask(game)
+    assert ActionOnePlayer().select_action(mask) == np.flatnonzero(mask)[0]
+    assert mask[RandomPlayer(seed=5).select_action(mask)]
+    assert RandomPlayer(seed=5).select_action(mask) == RandomPlayer(
+        seed=5
+    ).select_action(mask)
@@ -0,0 +1,126 @@
+"""Tests for the GameArena class"""
+
+import numpy as np
+import pytest
+
+from azulsummer.models.arena import ArenaFullError
+from azulsummer.models.arena import GameArena
+from azulsummer.models.arena import InvalidGameHandleError
+from azulsummer.models.board import BitBoard
+from azulsummer.models.enums import BoardBackend
+from azulsummer.models.enums import Phase
+from azulsummer.models.enums import StarColor
+from azulsummer.models.enums import TileColor
+from azulsummer.models.state import State
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+def test_allocated_state_matches_new_state(n_players):
+    """Test that a new arena slot holds the same data as State.new()."""
+    arena = GameArena(n_players, capacity=3)
+    state = arena.state(arena.allocate())
+    new_state = State.new(n_players)
+
+    assert np.array_equal(state.tiles._tiles, new_state.tiles._tiles)
+    assert np.array_equal(state.score, new_state.score)
+    assert state.turn == new_state.turn == 1
+    assert state.phase_turn == new_state.phase_turn == 1
+    assert state.phase is None
+    assert state.wild_tile is None
+    assert state.current_player_index is None
+    assert state.active_players is None
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+def test_state_writes_through_to_arena(n_players):
+    """Test that mutating an arena State mutates the arena arrays."""
+    arena = GameArena(n_players, capacity=2)
+    handle = arena.allocate()
+    state = arena.state(handle)
+
+    state.tiles.move_tiles(
+        state.tiles.bag_index, state.tiles.supply_index, np.array([1, 0, 0, 0, 0, 0])
+    )
+    state.score.update(n_players - 1, 3)
+    state.boards[1].place_tile(StarColor.Blue, 2)
+    state.turn += 1
+    state.phase = Phase.acquire_tile
+    state.current_player_index = 1
+    state.reset_active_players()
+
+    assert arena.tiles[handle, state.tiles.supply_index, TileColor.Orange] == 1
+    assert arena.scores[handle, n_players - 1] == 8
+    assert arena.boards[handle, 1, StarColor.Blue, 1] == 1
+    assert arena.state(handle).turn == 2
+    assert arena.state(handle).phase is Phase.acquire_tile
+    assert arena.state(handle).current_player_index == 1
+    assert list(arena.state(handle).active_players) == [1] * n_players
+
+
+def test_games_do_not_share_slots():
+    arena = GameArena(2, capacity=2)
+    first, second = arena.allocate(), arena.allocate()
+    arena.state(first).score.update(0, 10)
+    assert arena.scores[first, 0] == 15
+    assert arena.scores[second, 0] == 5
+
+
+def test_released_handles_are_reused_and_reset():
+    arena = GameArena(2, capacity=1)
+    handle = arena.allocate()
+    arena.state(handle).turn = 7
+    arena.release(handle)
+    assert arena.n_live == 0
+
+    assert arena.allocate() == handle
+    assert arena.state(handle).turn == 1
+
+
+def test_full_arena_raises():
+    arena = GameArena(2, capacity=1)
+    arena.allocate()
+    with pytest.raises(ArenaFullError):
+        arena.allocate()
+
+
+def test_released_handle_is_invalid():
+    arena = GameArena(2, capacity=1)
+    handle = arena.allocate()
+    arena.release(handle)
+    with pytest.raises(InvalidGameHandleError):
+        arena.state(handle)
+
+
+def test_bonus_spaces_view_arena():
+    arena = GameArena(2, capacity=1)
+    handle = arena.allocate()
+    state = arena.state(handle)
+    board, bonus_space = state.boards[0], state.bonus_spaces[0]
+    for position in [(StarColor.Orange, 5), (StarColor.Orange, 6)]:
+        board.place_tile(*position)
+
+    (window,) = bonus_space.surrounded_spaces(board)
+    bonus_space.remove_space(window)
+    assert arena.bonus_spaces[handle, 0].sum() == len(bonus_space.available) - 1
+    assert not list(arena.state(handle).bonus_spaces[0].surrounded_spaces(board))
+
+
+def test_bitboard_backend_writes_through_to_arena():
+    arena = GameArena(2, capacity=1, board_backend=BoardBackend.bitboard)
+    handle = arena.allocate()
+    board = arena.state(handle).boards[1]
+    assert isinstance(board, BitBoard)
+    assert board.place_tile(StarColor.Green, 4) == 1
+    assert arena.boards[handle, 1, StarColor.Green, 3] == 1
+
+
+def test_arena_finds_surrounded_bonus_spaces_for_all_games():
+    arena = GameArena(2, capacity=3)
+    first, second = arena.allocate(), arena.allocate()
+    for position in [(StarColor.Orange, 5), (StarColor.Orange, 6)]:
+        arena.state(second).boards[1].place_tile(*position)
+
+    surrounded = arena.surrounded_bonus_spaces()
+    assert not surrounded[first].any()
+    assert surrounded[second, 1].sum() == 1
+    assert arena.state(second).boards[1].remaining.min() == 0
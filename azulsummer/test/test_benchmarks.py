@@ -0,0 +1,72 @@
+"""Tests for the seeded benchmark suite"""
+
+import json
+
+import pytest
+
+from azulsummer.benchmarks.suite import compare
+from azulsummer.benchmarks.suite import main
+from azulsummer.benchmarks.suite import run
+
+
+def results(**benchmarks) -> dict:
+    return {
+        "benchmarks": {
+            name: {"ops_per_sec": ops_per_sec, "peak_bytes": peak_bytes}
+            for name, (ops_per_sec, peak_bytes) in benchmarks.items()
+        }
+    }
+
+
+def test_compare_flags_changes_beyond_the_threshold(tmp_path):
+    baseline = results(
+        slower=(1000, 999), faster=(1000, 999), larger=(1000, 999), same=(1000, 999)
+    )
+    current = results(
+        slower=(890, 999),
+        faster=(910, 1089),
+        larger=(1000, 1109),
+        same=(1000, 999),
+        new=(1, 10**9),
+    )
+    compared = compare(baseline, current, threshold=0.1)
+    # Benchmarks missing from the baseline are not compared
+    assert set(compared) == {"slower", "faster", "larger", "same"}
+    assert {name: change["regressed"] for name, change in compared.items()} == {
+        "slower": 1,
+        "faster": 0,
+        "larger": 1,
+        "same": 0,
+    }
+    assert compared["slower"]["speed"] == pytest.approx(0.89)
+    assert compared["larger"]["memory"] == pytest.approx(1.11)
+
+    # compare exits with status 1 on a regression
+    runs = {
+        "baseline": baseline,
+        "ok": results(same=(1000, 999)),
+        "regressed": results(slower=(890, 999)),
+    }
+    paths = {name: str(tmp_path / f"{name}.json") for name in runs}
+    for name, data in runs.items():
+        with open(paths[name], "w") as file:
+            json.dump(data, file)
+    main(["compare", paths["baseline"], paths["ok"]])
+    with pytest.raises(SystemExit) as exited:
+        main(["compare", paths["baseline"], paths["regressed"]])
+    assert exited.value.code == 1
+
+
+def test_run_measures_the_named_benchmarks():
+    names = ["Tiles.move_tiles", "BonusSpace.surrounded_spaces"]
+    measured = run(seconds=0.01, names=names)
+    assert measured["environment"]["seconds"] == 0.01
+    assert list(measured["benchmarks"]) == names
+    for result in measured["benchmarks"].values():
+        assert result["ops_per_sec"] > 0
+        assert 0 < result["p50_ns"] <= result["p99_ns"]
+        assert result["peak_bytes"] >= 0
+        assert result["samples"] >= 20
+    assert json.loads(json.dumps(measured)) == measured
+    with pytest.raises(KeyError):
+        run(seconds=0.01, names=["missing"])
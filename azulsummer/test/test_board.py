@@ -1,11 +1,17 @@
+import numpy as np
 import pytest
 
-from azulsummer.models.board import Board, InvalidTilePlacement
+from azulsummer.models.board import BitBoard, Board, InvalidTilePlacement
 from azulsummer.models.enums import StarColor
 
 
-def test_board_place_tile():
-    board = Board()
+@pytest.fixture(params=[Board, BitBoard])
+def board_class(request):
+    return request.param
+
+
+def test_board_place_tile(board_class):
+    board = board_class()
     board.place_tile(StarColor.Orange, 1)
     assert board.board[0, 0] == 1
 
@@ -15,15 +21,15 @@ def test_board_place_tile():
 
 @pytest.mark.parametrize("position", [-1, 0, 7])
 @pytest.mark.parametrize("star", iter(StarColor))
-def test_invalid_bord_locations(star, position):
-    board = Board()
+def test_invalid_bord_locations(board_class, star, position):
+    board = board_class()
 
     with pytest.raises(InvalidTilePlacement):
         board.place_tile(star, position)
 
 
-def test_score_tile_placement_scores_placement_correctly():
-    b = Board()
+def test_score_tile_placement_scores_placement_correctly(board_class):
+    b = board_class()
     score = b.place_tile(StarColor.Orange, 1)
     assert score == 1
 
@@ -43,9 +49,9 @@ def test_score_tile_placement_scores_placement_correctly():
     assert score == 6
 
 
-def test_score_count_circles_around_the_star_edge():
+def test_score_count_circles_around_the_star_edge(board_class):
     # check that [1, 0, 0, 0, 0, 1] includes both edges in the calculation
-    b = Board()
+    b = board_class()
     score = b.place_tile(StarColor.Red, 6)
     assert score == 1
 
@@ -56,10 +62,30 @@ def test_score_count_circles_around_the_star_edge():
     assert score == 3
 
 
-def test_score_doesnt_cross_star_boundaries():
-    b = Board()
+def test_score_doesnt_cross_star_boundaries(board_class):
+    b = board_class()
     score = b.place_tile(StarColor.Orange, 6)
     assert score == 1
 
     score = b.place_tile(StarColor.Red, 1)
     assert score == 1
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_bitboard_matches_board_on_random_placements(seed):
+    rng = np.random.default_rng(seed)
+    board, bitboard = Board(), BitBoard()
+    for cell in rng.permutation(len(StarColor) * Board.n_tile_spaces):
+        star, tile_value = StarColor(cell // 6), cell % 6 + 1
+        assert board.place_tile(star, tile_value) == bitboard.place_tile(
+            star, tile_value
+        )
+        assert np.array_equal(board.board, bitboard.board)
+
+
+def test_bitboard_reads_existing_cells():
+    cells = Board.empty_board()
+    cells[StarColor.Red, [0, 1]] = 1
+    bitboard = BitBoard(cells)
+    assert not bitboard.is_placement_location_open(StarColor.Red, 2)
+    assert bitboard.place_tile(StarColor.Red, 3) == 3
@@ -1,11 +1,19 @@
+import numpy as np
+import pytest
+
 from azulsummer.models.board import Board
 from azulsummer.models.bonus_spaces import (
     _PILLAR_POSITIONS,
     _WINDOW_POSITIONS,
+    N_BOARD_CELLS,
+    N_BONUS_SPACES,
     BonusSpace,
     Pillar,
     Window,
+    get_bonus_space,
+    surrounded_space_matrix,
 )
+from azulsummer.models.enums import StarColor
 
 
 def test_single_bonus_space_is_surrounded():
@@ -31,3 +39,54 @@ def test_multiple_bonus_spaces_are_surrounded():
         windows.add(Window(tuple(positions)))
     found = set(bs.surrounded_spaces(b))
     assert found == windows
+
+
+def _rescan_surrounded(board):
+    """Surrounded spaces found by checking every space's adjacent cells"""
+    cells = board.board.flatten()
+    return {
+        i
+        for i in range(N_BONUS_SPACES)
+        if all(cells.take(get_bonus_space(i).adjacent))
+    }
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_placement_reports_newly_surrounded_spaces(seed):
+    rng = np.random.default_rng(seed)
+    b = Board()
+    surrounded = set()
+    for cell in rng.permutation(N_BOARD_CELLS):
+        star, tile_value = StarColor(cell // 6), cell % 6 + 1
+        b.place_tile(star, tile_value)
+        newly_surrounded = set(b.surrounded_spaces_at(star, tile_value))
+        assert newly_surrounded == _rescan_surrounded(b) - surrounded
+        surrounded |= newly_surrounded
+    assert surrounded == set(range(N_BONUS_SPACES))
+
+
+def test_board_counters_are_rebuilt_from_cells():
+    b = Board()
+    for position in _PILLAR_POSITIONS[2]:
+        b.place_tile(*position)
+    assert np.array_equal(Board(b.board.copy()).remaining, b.remaining)
+
+
+def test_surrounded_space_matrix_checks_all_boards_at_once():
+    rng = np.random.default_rng(0)
+    boards = (rng.random((5, 4, 7, 6)) < 0.6).astype("B")
+    matrix = surrounded_space_matrix(boards)
+    assert matrix.shape == (5, 4, N_BONUS_SPACES)
+    for game, player in np.ndindex(5, 4):
+        expected = _rescan_surrounded(Board(boards[game, player]))
+        assert set(np.flatnonzero(matrix[game, player])) == expected
+
+
+def test_removed_spaces_are_not_surrounded():
+    b = Board()
+    bs = BonusSpace()
+    for position in _PILLAR_POSITIONS[0]:
+        b.place_tile(*position)
+    (found,) = bs.surrounded_spaces(b)
+    bs.remove_space(found)
+    assert not list(bs.surrounded_spaces(b))
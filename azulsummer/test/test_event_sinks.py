@@ -0,0 +1,133 @@
+"""Tests for the event sinks"""
+
+import json
+import threading
+
+import pytest
+
+from azulsummer.adapters.event_sinks import AbstractEventSink
+from azulsummer.adapters.event_sinks import JsonLinesSink
+from azulsummer.adapters.event_sinks import ListSink
+from azulsummer.adapters.event_sinks import NullSink
+from azulsummer.adapters.event_sinks import SamplingSink
+from azulsummer.adapters.event_sinks import ThreadedSink
+from azulsummer.adapters.event_sinks import resolve_event_handlers
+from azulsummer.models.events import Event
+from azulsummer.models.events import PhaseAdvanced
+from azulsummer.models.events import TilesMoved
+from azulsummer.models.events import event_types
+from azulsummer.models.game import Game
+from azulsummer.models.game_handler import GameHandler
+from azulsummer.players.actiononeplayer import ActionOnePlayer
+
+
+class BlockedSink(AbstractEventSink):
+    """Sink whose consumer waits until released"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.release = threading.Event()
+        self.received = []
+
+    def _handle(self, event: Event) -> None:
+        self.release.wait()
+        self.received.append(event)
+
+
+def play(n_players: int, sinks) -> Game:
+    game = Game.new([ActionOnePlayer() for _ in range(n_players)], 4)
+    GameHandler(game, sinks=sinks).play()
+    return game
+
+
+def all_events(n_players: int) -> list[Event]:
+    sink = ListSink()
+    play(n_players, [sink])
+    return sink.received
+
+
+def payloads(events: list[Event]) -> list[str]:
+    """The events without their game_id, which differs between games"""
+    return [str(event) for event in events]
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+def test_null_sink_game_creates_no_events(monkeypatch, n_players):
+    created = []
+    for event_type in event_types():
+        monkeypatch.setattr(
+            event_type, "__init__", lambda self, *a, **k: created.append(self)
+        )
+    game = play(n_players, [NullSink()])
+    assert not created
+    assert not game.event_queue
+
+
+def test_event_types_are_resolved_at_registration():
+    moves, everything = ListSink([TilesMoved]), ListSink()
+    handlers = resolve_event_handlers([moves, everything])
+    assert set(handlers) == set(event_types())
+    assert handlers[PhaseAdvanced] == everything.handle
+    assert handlers[TilesMoved] != everything.handle
+
+    assert resolve_event_handlers([NullSink()]) == {}
+    assert set(resolve_event_handlers([moves])) == {TilesMoved}
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+def test_filtered_sink_receives_only_its_types(n_players):
+    moves, everything = ListSink([TilesMoved]), ListSink()
+    play(n_players, [moves, everything])
+    assert moves.received
+    assert moves.received == [
+        event for event in everything.received if isinstance(event, TilesMoved)
+    ]
+    assert payloads(everything.received) == payloads(all_events(n_players))
+
+
+def test_sampling_sink_passes_one_in_n():
+    events = all_events(2)
+    sampled = ListSink()
+    play(2, [SamplingSink(sampled, 7)])
+    assert payloads(sampled.received) == payloads(events[::7])
+
+    with pytest.raises(ValueError):
+        SamplingSink(sampled, 0)
+
+
+@pytest.mark.parametrize("batch_size", [1, 10, 100000])
+def test_json_lines_sink_writes_every_event(tmp_path, batch_size):
+    events = all_events(2)
+    path = tmp_path / "events.jsonl"
+    with JsonLinesSink(path, batch_size=batch_size) as sink:
+        play(2, [sink])
+        written = len(path.read_text().splitlines()) if path.exists() else 0
+        assert written == len(events) - len(events) % batch_size
+    lines = path.read_text().splitlines()
+    game_id = json.loads(lines[0])["game_id"]
+    assert [json.loads(line) for line in lines] == [
+        json.loads(json.dumps({**event.to_dict(), "game_id": game_id}))
+        for event in events
+    ]
+    assert json.loads(lines[0])["event"] == type(events[0]).__name__
+
+
+def test_threaded_sink_delivers_in_order():
+    events = all_events(3)
+    inner = ListSink()
+    with ThreadedSink(inner, maxsize=8, block=True) as sink:
+        play(3, [sink])
+    assert payloads(inner.received) == payloads(events)
+    assert sink.dropped == 0
+
+
+def test_threaded_sink_drops_rather_than_block():
+    events = all_events(2)
+    inner = BlockedSink()
+    sink = ThreadedSink(inner, maxsize=16)
+    play(2, [sink])
+    inner.release.set()
+    sink.close()
+    assert sink.dropped
+    assert len(inner.received) + sink.dropped == len(events)
+    assert payloads(inner.received) == payloads(events[: len(inner.received)])
@@ -0,0 +1,70 @@
+"""Tests for the game events"""
+
+import gc
+import weakref
+from dataclasses import fields
+
+import pytest
+
+from azulsummer.adapters.event_sinks import ListSink
+from azulsummer.models.enums import Phase
+from azulsummer.models.enums import TileTarget
+from azulsummer.models.events import Event
+from azulsummer.models.events import PhaseAdvanced
+from azulsummer.models.events import TilesMoved
+from azulsummer.models.game import Game
+from azulsummer.models.game_handler import GameHandler
+from azulsummer.models.position import TilePosition
+from azulsummer.models.tile_array import TileArray
+from azulsummer.players.actiononeplayer import ActionOnePlayer
+
+
+def played_events(n_players: int) -> tuple[Game, list[Event]]:
+    game = Game.new([ActionOnePlayer() for _ in range(n_players)], 2)
+    sink = ListSink()
+    GameHandler(game, sinks=[sink]).play()
+    return game, sink.received
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+def test_events_do_not_reference_the_game(n_players):
+    game, received = played_events(n_players)
+    assert received
+    for event in received:
+        assert event.game_id == game.game_id
+        for field in fields(event):
+            assert not isinstance(getattr(event, field.name), Game)
+
+
+def test_queued_events_do_not_keep_the_game_alive():
+    game, received = played_events(2)
+    reference = weakref.ref(game)
+    del game
+    gc.collect()
+    assert reference() is None
+    assert all(isinstance(str(event), str) for event in received)
+
+
+def test_event_payloads_are_structured():
+    event = TilesMoved(
+        "id",
+        TilePosition(TileTarget.Bag),
+        TilePosition(TileTarget.PlayerReserve, 1),
+        TileArray([1, 0, 0, 0, 0, 2]),
+    )
+    assert event.tiles == (1, 0, 0, 0, 0, 2)
+    assert str(event) == (
+        "TilesMoved(source=Bag, destination=Player Reserve-1, "
+        "tiles={'Orange': 1, 'Purple': 2})"
+    )
+    phase_advanced = PhaseAdvanced("id", Phase.play_tiles)
+    assert str(phase_advanced) == "PhaseAdvanced(phase=play_tiles)"
+
+
+def test_tiles_moved_copies_the_moved_tiles():
+    _, received = played_events(2)
+    moves = [event for event in received if isinstance(event, TilesMoved)]
+    assert moves
+    for event in moves:
+        assert type(event.tiles) is TileArray
+        assert all(type(count) is int for count in event.tiles)
@@ -0,0 +1,238 @@
+"""Tests for the GameHandler class"""
+
+import pickle
+
+import numpy as np
+import pytest
+
+from azulsummer.adapters.event_sinks import ListSink
+from azulsummer.models import actions
+from azulsummer.models.actions import Action
+from azulsummer.models.actions import PlayPhaseOneTurn
+from azulsummer.models.enums import Instrumentation
+from azulsummer.models.enums import Phase
+from azulsummer.models.events import Event
+from azulsummer.models.events import PhaseAdvanced
+from azulsummer.models.events import TurnIncremented
+from azulsummer.models.events import event_types
+from azulsummer.models.game import Game
+from azulsummer.models.game_handler import GameHandler
+from azulsummer.models.random import RandomTileDraw
+from azulsummer.players.actiononeplayer import ActionOnePlayer
+from azulsummer.players.randomplayer import RandomPlayer
+from azulsummer.test.helpers import run_until
+
+
+def play(n_players: int, seed: int, headless: bool) -> Game:
+    game = Game.new([ActionOnePlayer() for _ in range(n_players)], seed)
+    GameHandler(game, headless=headless).play()
+    return game
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+def test_headless_game_matches_evented_game(n_players):
+    evented = play(n_players, 5, headless=False)
+    headless = play(n_players, 5, headless=True)
+    assert np.array_equal(evented.tiles._tiles, headless.tiles._tiles)
+    assert np.array_equal(evented.score, headless.score)
+    assert evented.turn == headless.turn
+
+
+def test_headless_game_creates_no_events(monkeypatch):
+    created = []
+    for event_type in Event.__subclasses__():
+        monkeypatch.setattr(
+            event_type, "__init__", lambda self, *a, **k: created.append(self)
+        )
+    game = Game.new([ActionOnePlayer(), ActionOnePlayer()], 1)
+    GameHandler(game, headless=True).play()
+    assert not created
+    assert not game.event_queue
+
+
+def test_messages_are_slotted():
+    action_types = [
+        value
+        for value in vars(actions).values()
+        if isinstance(value, type) and issubclass(value, Action)
+    ]
+    message_types = [*action_types, *event_types()]
+    assert len(message_types) > 80
+    for message_type in message_types:
+        assert "__dict__" not in dir(message_type), message_type
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+def test_reused_messages_match_new_messages(n_players):
+    played = []
+    for reuses_messages in [False, True]:
+        game = Game.new([ActionOnePlayer() for _ in range(n_players)], 6)
+        game.reuses_messages = reuses_messages
+        sink = ListSink()
+        GameHandler(game, sinks=[sink]).play()
+        played.append((game, [str(event) for event in sink.received]))
+    (new, new_events), (reused, reused_events) = played
+    assert new_events == reused_events
+    assert np.array_equal(new.tiles._tiles, reused.tiles._tiles)
+    assert not new._messages
+
+
+def test_parameterless_messages_are_created_once_per_game():
+    game = Game.new([ActionOnePlayer(), ActionOnePlayer()], 1)
+    for _ in range(2):
+        game.enqueue(PlayPhaseOneTurn)
+        game.emit(TurnIncremented)
+        game.emit(PhaseAdvanced, phase=Phase.acquire_tile)
+    first, second = game.action_queue
+    assert first is second and first.game is game
+    first, _, second, _ = game.event_queue
+    assert first is second and first.game_id == game.game_id
+    assert game.event_queue[1] is not game.event_queue[3]
+
+    other = Game.new([ActionOnePlayer(), ActionOnePlayer()], 1)
+    other.enqueue(PlayPhaseOneTurn)
+    assert other.action_queue[0] is not first
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+def test_fork_copies_state_with_own_stream(n_players):
+    game = play(n_players, 7, headless=True)
+    game.enqueue(PlayPhaseOneTurn)
+    fork = game.fork()
+    assert fork.game_id != game.game_id
+    assert fork.players is game.players
+    assert fork.layout is game.layout
+    assert not fork.action_queue and not fork.event_queue
+    assert not fork._messages
+    assert fork.random != game.random
+    assert np.array_equal(fork.tiles._tiles, game.tiles._tiles)
+    assert np.array_equal(fork.score, game.score)
+    assert fork.turn == game.turn
+
+    fork.state.score.update(0, 1)
+    fork.state.tiles._tiles[:] = 0
+    assert not np.array_equal(fork.score, game.score)
+    assert game.tiles._tiles.any()
+
+
+def test_forks_are_reproducible():
+    first, second = play(2, 8, headless=True), play(2, 8, headless=True)
+    assert first.fork().random == second.fork().random
+    assert first.fork().random != first.fork().random
+    assert first.fork(seed=3).random == RandomTileDraw(3)
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+def test_copies_play_on_like_the_game(n_players):
+    game = Game.new([ActionOnePlayer() for _ in range(n_players)], 6)
+    game.emits_events = False
+    game.enqueue(actions.StartGame)
+    run_until(game, actions.PlayPhaseTwoTurn)
+    copy = game.copy()
+    assert copy.game_id == game.game_id and copy.players is game.players
+    assert [type(action) for action in copy.action_queue] == [
+        type(action) for action in game.action_queue
+    ]
+    assert all(action.game is copy for action in copy.action_queue)
+    assert copy.action_history == game.action_history
+
+    run_until(game)
+    run_until(copy)
+    assert np.array_equal(copy.state._buffer, game.state._buffer)
+    assert copy.action_history == game.action_history
+    assert copy.random.uniforms(3) == game.random.uniforms(3)
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+def test_pickled_games_play_on_like_the_game(n_players):
+    game = Game.new([RandomPlayer(n) for n in range(n_players)], 6)
+    game.emits_events = False
+    game.enqueue(actions.StartGame)
+    run_until(game, actions.PlayPhaseTwoTurn)
+    data = pickle.dumps(game)
+    assert len(data) < 3000
+    unpickled = pickle.loads(data)
+    assert unpickled.game_id == game.game_id
+    assert unpickled.random == game.random
+    assert unpickled.layout is game.layout
+    assert unpickled.hash_key == game.hash_key
+    assert unpickled.action_queue
+    assert all(action.game is unpickled for action in unpickled.action_queue)
+
+    run_until(game)
+    run_until(unpickled)
+    assert unpickled.state.to_bytes() == game.state.to_bytes()
+    assert unpickled.action_history == game.action_history
+    assert len(pickle.dumps(Game.new())) < 1000
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+@pytest.mark.parametrize("headless", [False, True])
+def test_instrumented_games_count_every_handler_call(n_players, headless, capsys):
+    handler = GameHandler(
+        Game.new([ActionOnePlayer() for _ in range(n_players)], 5),
+        headless=headless,
+        instrument=Instrumentation.timing,
+    )
+    dispatched = []
+
+    def recording(action_handler):
+        def record(action):
+            dispatched.append(action)
+            action_handler(action)
+
+        return record
+
+    handler.action_handlers = {
+        action_type: recording(action_handler)
+        for action_type, action_handler in handler.action_handlers.items()
+    }
+    handler.play()
+    capsys.readouterr()
+    game = handler.game
+    assert np.array_equal(game.score, play(n_players, 5, headless).score)
+
+    stats = handler.stats()
+    action_calls = {
+        name: counters["calls"]
+        for name, counters in stats.items()
+        if hasattr(actions, name)
+    }
+    assert sum(action_calls.values()) == len(dispatched)
+    assert action_calls["PlayPhaseOneTurn"] == sum(
+        isinstance(action, PlayPhaseOneTurn) for action in dispatched
+    )
+    assert any(not hasattr(actions, name) for name in stats) != headless
+    for counters in stats.values():
+        assert counters["max_us"] >= counters["mean_us"] - 1e-9
+        assert "blocks" not in counters
+    totals = [counters["total_seconds"] for counters in stats.values()]
+    assert totals == sorted(totals, reverse=True)
+
+
+def test_instrumentation_counts_allocations_and_reports():
+    handler = GameHandler(
+        Game.new([ActionOnePlayer(), ActionOnePlayer()], 2),
+        headless=True,
+        instrument=Instrumentation.allocations,
+    )
+    handler.play()
+    stats = handler.stats()
+    assert all("blocks" in counters for counters in stats.values())
+    report = handler.report(limit=3).splitlines()
+    assert len(report) == 5
+    assert report[0].split()[-1] == "blocks"
+    assert report[1].split()[0] == next(iter(stats))
+    assert report[-1].split()[1] == f"{sum(c['calls'] for c in stats.values()):,}"
+
+    handler.handler_stats.reset()
+    assert handler.stats() == {}
+
+
+def test_uninstrumented_handler_has_no_stats():
+    handler = GameHandler(Game.new([ActionOnePlayer(), ActionOnePlayer()], 2))
+    assert handler.handler_stats is None
+    with pytest.raises(RuntimeError):
+        handler.stats()
+    with pytest.raises(RuntimeError):
+        handler.report()
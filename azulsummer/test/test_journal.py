@@ -0,0 +1,121 @@
+"""Tests for applying and undoing actions in place"""
+
+import numpy as np
+import pytest
+
+from azulsummer.models.action_space import ACTION_KIND
+from azulsummer.models.action_space import ACTION_STAR
+from azulsummer.models.action_space import PASS_ACTION
+from azulsummer.models.action_space import InvalidActionError
+from azulsummer.models.action_space import encode_acquire
+from azulsummer.models.action_space import placement_cost
+from azulsummer.models.action_space import sample_action
+from azulsummer.models.enums import ActionKind
+from azulsummer.models.enums import BoardBackend
+from azulsummer.models.enums import Phase
+from azulsummer.models.enums import StarColor
+from azulsummer.models.enums import TileColor
+from azulsummer.models.enums import TileIndex
+from azulsummer.models.logic.action_mask import legal_action_mask
+from azulsummer.test.helpers import game_at_first_turn
+from azulsummer.test.helpers import random_line
+from azulsummer.test.helpers import snapshot
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+@pytest.mark.parametrize("board_backend", list(BoardBackend))
+def test_undo_restores_identical_state(n_players, board_backend):
+    for seed in range(5):
+        game = game_at_first_turn(n_players, seed, board_backend)
+        rng = np.random.default_rng(seed)
+        start = snapshot(game)
+        tokens, snapshots, kinds = [], [], set()
+        for action in random_line(game, rng):
+            before = snapshot(game)
+            game.undo(game.apply(action))
+            assert snapshot(game) == before
+            snapshots.append(before)
+            tokens.append(game.apply(action))
+            kinds.add(ACTION_KIND[action])
+        assert kinds == {ActionKind.Acquire, ActionKind.Place, ActionKind.Pass}
+
+        for token, before in zip(reversed(tokens), reversed(snapshots)):
+            game.undo(token)
+            assert snapshot(game) == before
+        assert snapshot(game) == start
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+def test_replaying_undone_actions_reaches_same_state(n_players):
+    """Undoing part of a line and replaying it reaches the same state"""
+    game = game_at_first_turn(n_players, 11)
+    fork = game.fork()
+    line = []
+    for action in random_line(fork, np.random.default_rng(11)):
+        fork.apply(action)
+        line.append(action)
+    tokens = [game.apply(action) for action in line]
+    end = snapshot(game)
+    for token in reversed(tokens[len(tokens) // 2 :]):
+        game.undo(token)
+    for action in line[len(tokens) // 2 :]:
+        game.apply(action)
+    assert snapshot(game) == end
+
+
+def test_illegal_action_raises_and_leaves_state():
+    game = game_at_first_turn(2, 3)
+    before = snapshot(game)
+    with pytest.raises(InvalidActionError):
+        game.apply(PASS_ACTION)
+    with pytest.raises(InvalidActionError):
+        game.apply(-1)
+    assert snapshot(game) == before
+
+
+def test_apply_emits_no_events():
+    game = game_at_first_turn(3, 4)
+    game.emits_events = True
+    game.apply(int(np.flatnonzero(legal_action_mask(game))[0]))
+    assert not game.event_queue and not game.action_queue
+    assert game.emits_events
+
+
+def test_first_center_draw_penalty_stops_at_zero():
+    game = game_at_first_turn(2, 5)
+    tiles = game.tiles._tiles
+    tiles[TileIndex.TableCenter] = [3, 0, 0, 0, 0, 0]
+    tiles[TileIndex.Bag, TileColor.Orange] -= 3
+    game.score[0] = 2
+    token = game.apply(encode_acquire(9, TileColor.Orange))
+    assert game.score[0] == 0
+    assert game.start_player_index == 0
+    assert tiles[game.layout.player_reserve_rows[0], TileColor.Orange] == 3
+    assert tiles[game.layout.factory_display_rows].sum() == 20
+    game.undo(token)
+    assert game.score[0] == 2
+    assert game.start_player_index is None
+
+
+def test_placement_pays_cost_and_scores():
+    game = game_at_first_turn(2, 6)
+    rng = np.random.default_rng(6)
+    while game.phase != Phase.play_tiles:
+        game.apply(sample_action(legal_action_mask(game), rng))
+    player = game.current_player_index
+    mask = legal_action_mask(game)
+    action = int(np.flatnonzero(mask)[0])
+    cost = placement_cost(action, TileColor[game.wild_tile.name])
+    tiles = game.tiles._tiles.astype(int)
+    score = int(game.score[player])
+
+    game.apply(action)
+    reserve = game.layout.player_reserve_rows[player]
+    star = StarColor(int(ACTION_STAR[action]))
+    after = game.tiles._tiles.astype(int)
+    assert np.array_equal(tiles[reserve] - after[reserve], cost)
+    board_row = game.layout.player_board_rows[player] + star
+    assert after[board_row].sum() - tiles[board_row].sum() == 1
+    assert after[TileIndex.Tower].sum() - tiles[TileIndex.Tower].sum() == sum(cost) - 1
+    assert game.score[player] == score + 1
+    assert game.current_player_index != player
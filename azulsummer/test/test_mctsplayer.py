@@ -0,0 +1,139 @@
+"""Tests for the Monte Carlo Tree Search player"""
+
+import numpy as np
+import pytest
+
+from azulsummer.models import logic_handler
+from azulsummer.models.action_space import PASS_ACTION
+from azulsummer.models.actions import PlayPhaseTwoTurn
+from azulsummer.models.actions import SelectTilePlacement
+from azulsummer.models.actions import StartGame
+from azulsummer.models.game import Game
+from azulsummer.models.game_handler import GameHandler
+from azulsummer.models.logic.action_mask import legal_action_mask
+from azulsummer.models.logic.board import generate_available_player_tile_placements
+from azulsummer.players.actiononeplayer import ActionOnePlayer
+from azulsummer.players.mctsplayer import MCTSPlayer
+from azulsummer.players.mctsplayer import _Tree
+from azulsummer.test.helpers import game_at_first_turn
+from azulsummer.test.helpers import run_until
+from azulsummer.test.helpers import snapshot
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+def test_search_returns_legal_action_and_leaves_game(n_players):
+    game = game_at_first_turn(n_players, 3)
+    before, key = snapshot(game), game.hash_key
+    player = MCTSPlayer(iterations=200, seed=3)
+    action = player.search(game)
+    assert legal_action_mask(game)[action]
+    assert snapshot(game) == before and game.hash_key == key
+
+    result = player.last_search
+    assert result.iterations == 200
+    assert sum(result.visits.values()) == 200
+    assert result.best_action == action
+    assert result.visits[action] == max(result.visits.values())
+
+
+def test_seeded_searches_repeat():
+    game = game_at_first_turn(3, 8)
+    searches = [MCTSPlayer(iterations=150, seed=8) for _ in range(2)]
+    for player in searches:
+        player.search(game)
+        player.search(game)
+    assert searches[0].last_search.visits == searches[1].last_search.visits
+
+
+def test_time_budget():
+    game = game_at_first_turn(2, 1)
+    player = MCTSPlayer(iterations=None, time_limit=0.2, seed=1)
+    player.search(game)
+    assert player.last_search.iterations > 0
+    assert 0.2 <= player.last_search.seconds < 1.0
+    assert player.last_search.iterations_per_second > 0
+
+    player = MCTSPlayer(iterations=5, time_limit=60, seed=1)
+    player.search(game)
+    assert player.last_search.iterations == 5
+
+
+def test_budget_and_workers_are_validated():
+    with pytest.raises(ValueError):
+        MCTSPlayer(iterations=None, time_limit=None)
+    with pytest.raises(ValueError):
+        MCTSPlayer(n_workers=0)
+
+
+def test_root_parallel_search_merges_visits():
+    game = game_at_first_turn(2, 4)
+    before = snapshot(game)
+    with MCTSPlayer(iterations=101, n_workers=2, seed=4) as player:
+        action = player.search(game)
+        assert player._pool is not None
+        player.search(game)
+    assert player._pool is None
+    result = player.last_search
+    assert result.n_workers == 2
+    # Each worker runs half the iterations, rounded up
+    assert result.iterations == 102
+    assert sum(result.visits.values()) == 102
+    assert legal_action_mask(game)[action]
+    assert snapshot(game) == before
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+def test_plays_through_game_handler(n_players):
+    players = [MCTSPlayer(iterations=20, seed=n) for n in range(n_players)]
+    game = Game.new(players, n_players)
+    GameHandler(game, headless=True).play()
+    assert all(player.last_search is not None for player in players)
+    assert game.turn > 1
+
+
+def test_searched_pass_is_played_as_a_pass(monkeypatch):
+    game = Game.new([ActionOnePlayer(), ActionOnePlayer()], 2)
+    game.emits_events = False
+    game.enqueue(StartGame)
+    run_until(game, PlayPhaseTwoTurn)
+    placements = [*generate_available_player_tile_placements(game)]
+    assert placements
+
+    monkeypatch.setattr(MCTSPlayer, "search", lambda self, game: PASS_ACTION)
+    player = MCTSPlayer(iterations=1, seed=2)
+    game.players = [player, player]
+    assert player._assess(SelectTilePlacement(game, placements)) is None
+    assert player._assess(SelectTilePlacement(game, [])) is None
+    reserves = game.tiles._tiles[game.layout.player_reserves].copy()
+    turn = game.action_queue.popleft()
+    logic_handler.ACTION_HANDLERS[type(turn)](turn)
+    assert game.action_history[-1] == PASS_ACTION
+    assert np.array_equal(game.tiles._tiles[game.layout.player_reserves], reserves)
+
+
+def test_random_outcomes_grow_chance_nodes(monkeypatch):
+    """An action drawing from the bag has an outcome per sampled draw"""
+    apply, undo = Game.apply, Game.undo
+
+    def apply_and_draw(self, action, check=True):
+        token = apply(self, action, check)
+        drawn = np.array(self.random.random_tile_distribution(self.bag_tiles, 1), "B")
+        self.tiles.move_tiles(self.bag_index, self.tower_index, drawn)
+        return token, drawn
+
+    def undo_draw(self, token):
+        token, drawn = token
+        self.tiles.move_tiles(self.tower_index, self.bag_index, drawn)
+        undo(self, token)
+
+    monkeypatch.setattr(Game, "apply", apply_and_draw)
+    monkeypatch.setattr(Game, "undo", undo_draw)
+    game = game_at_first_turn(2, 6)
+    before = snapshot(game)
+    tree = _Tree(game, 1.0, 200, np.random.default_rng(6))
+    for _ in range(300):
+        tree.iterate()
+    assert snapshot(game) == before
+    outcomes = [len(edge.outcomes) for edge in tree.root.edges.values()]
+    assert max(outcomes) > 1
+    assert sum(edge.visits for edge in tree.root.edges.values()) == 300
@@ -0,0 +1,105 @@
+"""Tests for the RandomTileDraw class"""
+
+import copy
+import pickle
+from array import array
+
+import numpy as np
+import pytest
+
+from azulsummer.models.game import Game
+from azulsummer.models.random import RandomTileDraw
+from azulsummer.models.random import game_seeds
+from azulsummer.models.tiles import Tiles
+
+BAG = np.array([22, 22, 22, 22, 22, 22], dtype="B")
+
+
+def draws(random: RandomTileDraw, n: int = 50) -> list[tuple]:
+    return [tuple(random.random_tile_distribution(BAG, 4)) for _ in range(n)]
+
+
+def test_same_seed_gives_same_draws():
+    assert draws(RandomTileDraw(7)) == draws(RandomTileDraw(7))
+
+
+def test_seed_zero_is_not_unseeded():
+    """Seed 0 is a seed like any other, and no seed draws fresh entropy."""
+    assert draws(RandomTileDraw(0)) == draws(RandomTileDraw(0))
+    assert draws(RandomTileDraw(None)) != draws(RandomTileDraw(None))
+    assert Game.new(seed=0).random == RandomTileDraw(0)
+
+
+def test_unseeded_stream_can_be_reproduced():
+    random = RandomTileDraw()
+    assert draws(RandomTileDraw(random.seed)) == draws(random)
+
+
+@pytest.mark.parametrize("buffer_size", [1, 3, 5, 4096])
+def test_draws_do_not_depend_on_buffer_size(buffer_size):
+    assert draws(RandomTileDraw(3, buffer_size)) == draws(RandomTileDraw(3))
+
+
+@pytest.mark.parametrize("buffer_size", [1, 5, 1024])
+@pytest.mark.parametrize("n_drawn", [0, 1, 7, 40])
+def test_pickled_streams_continue(buffer_size, n_drawn):
+    random = RandomTileDraw(3, buffer_size)
+    random.draw_log = array("B")
+    draws(random, n_drawn)
+    data = pickle.dumps(random)
+    assert len(data) < 600 + len(random.draw_log)
+    restored, copied = pickle.loads(data), copy.deepcopy(random)
+    assert restored == copied == random
+    assert restored.draw_log == copied.draw_log == random.draw_log
+    assert draws(restored) == draws(copied) == draws(random)
+    assert restored.draw_log == random.draw_log
+
+
+def test_game_seeds_are_reproducible_and_independent():
+    first, second = game_seeds(11, 4), game_seeds(11, 4)
+    streams = [draws(RandomTileDraw(seed)) for seed in first]
+    assert streams == [draws(RandomTileDraw(seed)) for seed in second]
+    assert len(set(map(tuple, streams))) == 4
+    assert draws(RandomTileDraw(first[0])) != draws(RandomTileDraw(11))
+
+
+def test_nested_worker_seeds():
+    (worker_a, worker_b) = game_seeds(5, 2)
+    games_a = [draws(RandomTileDraw(seed)) for seed in game_seeds(worker_a, 3)]
+    games_b = [draws(RandomTileDraw(seed)) for seed in game_seeds(worker_b, 3)]
+    assert not set(map(tuple, games_a)) & set(map(tuple, games_b))
+
+
+def test_spawn_matches_game_seeds():
+    children = RandomTileDraw(9).spawn(3)
+    assert [draws(child) for child in children] == [
+        draws(RandomTileDraw(seed)) for seed in game_seeds(9, 3)
+    ]
+
+
+@pytest.mark.parametrize("n_tiles_to_draw", [0, 1, 4, 10, 36, 132])
+def test_draws_are_taken_from_the_tiles(n_tiles_to_draw):
+    random = RandomTileDraw(1)
+    tiles = np.array([0, 5, 22, 1, 0, 104], dtype="B")
+    for _ in range(20):
+        drawn = np.array(random.random_tile_distribution(tiles, n_tiles_to_draw))
+        assert drawn.sum() == n_tiles_to_draw
+        assert (drawn <= tiles).all()
+
+
+def test_drawing_more_tiles_than_available_raises():
+    with pytest.raises(ValueError):
+        RandomTileDraw(1).random_tile_distribution(np.array([1, 0, 0, 0, 0, 1]), 3)
+
+
+def test_bag_draws_move_tiles():
+    """Test that the draws can be moved out of the bag by Tiles.move_tiles"""
+    tiles = Tiles.new(2)
+    random = RandomTileDraw(2)
+    for _ in range(30):
+        tiles.move_tiles(
+            tiles.bag_index,
+            tiles.supply_index,
+            random.random_tile_distribution(tiles.view_bag(), 4),
+        )
+    assert tiles.get_supply_quantity() == 120
@@ -0,0 +1,120 @@
+"""Tests for the binary game records"""
+
+import io
+from array import array
+
+import numpy as np
+import pytest
+
+from azulsummer.adapters.records import GameRecord
+from azulsummer.adapters.records import GameRecordWriter
+from azulsummer.adapters.records import InvalidRecordError
+from azulsummer.adapters.records import read_records
+from azulsummer.models.action_space import ACTION_KIND
+from azulsummer.models.action_space import encode_board_placement
+from azulsummer.models.action_space import encode_draw
+from azulsummer.models.action_space import wild_color_of
+from azulsummer.models.actions import AssessPhaseOneTileDrawAction
+from azulsummer.models.enums import ActionKind
+from azulsummer.models.game import Game
+from azulsummer.models.game_handler import GameHandler
+from azulsummer.models.random import game_seeds
+from azulsummer.players.randomplayer import RandomPlayer
+
+
+class ChoiceRecordingPlayer(RandomPlayer):
+    def __init__(self, seed, chosen: list):
+        super().__init__(seed)
+        self.chosen = chosen
+
+    def _assess(self, action):
+        chosen = super()._assess(action)
+        wild_color = wild_color_of(action.game.wild_tile)
+        if isinstance(action, AssessPhaseOneTileDrawAction):
+            self.chosen.append(encode_draw(chosen, wild_color))
+        else:
+            self.chosen.append(
+                encode_board_placement(
+                    chosen.board_position, chosen.tile_cost, wild_color
+                )
+            )
+        return chosen
+
+
+def play(n_players: int, seed) -> Game:
+    game = Game.new([RandomPlayer(n + 1) for n in range(n_players)], seed)
+    GameHandler(game, headless=True).play()
+    return game
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+def test_action_history_records_each_decision(n_players):
+    chosen = []
+    players = [ChoiceRecordingPlayer(n + 1, chosen) for n in range(n_players)]
+    game = Game.new(players, 4)
+    GameHandler(game, headless=True).play()
+    history = game.action_history
+    assert isinstance(history, array) and history.typecode == "H"
+    assert history.tolist() == chosen
+    assert ACTION_KIND[history[0]] == ActionKind.Acquire
+    assert ACTION_KIND[history[-1]] == ActionKind.Place
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+def test_records_round_trip(n_players):
+    game = play(n_players, game_seeds(9, 3)[2])
+    record = GameRecord.from_game(game)
+    assert record.n_players == n_players
+    assert record.players == ("RandomPlayer",) * n_players
+    assert record.actions == game.action_history
+    assert record.seed.entropy == 9 and record.seed.spawn_key == (2,)
+
+    data = record.to_bytes()
+    assert len(data) < 200
+    assert GameRecord.read(io.BytesIO(data)) == record
+
+    # The seed reproduces the game's tile draws
+    replayed = play(n_players, record.seed)
+    assert np.array_equal(replayed.tiles._tiles, game.tiles._tiles)
+
+
+def test_large_entropy_and_long_ids():
+    game = play(2, None)
+    record = GameRecord.from_game(game, ["mcts:iterations=50", "random"])
+    assert record.entropy == game.random.seed_sequence.entropy
+    assert GameRecord.read(io.BytesIO(record.to_bytes())) == record
+    with pytest.raises(ValueError):
+        GameRecord.from_game(game, ["x" * 256, "random"]).to_bytes()
+
+
+def test_writer_appends_and_reader_streams(tmp_path):
+    path = tmp_path / "games.bin"
+    games = [play(3, seed) for seed in game_seeds(1, 5)]
+    with GameRecordWriter(path) as writer:
+        for game in games[:3]:
+            writer.write(game)
+    with GameRecordWriter(path) as writer:
+        for game in games[3:]:
+            writer.write(GameRecord.from_game(game))
+    assert path.stat().st_size == sum(
+        len(GameRecord.from_game(game).to_bytes()) for game in games
+    )
+    assert list(read_records(path)) == [GameRecord.from_game(game) for game in games]
+
+    # Records are read one at a time, so the records before a bad one are read
+    with open(path, "ab") as file:
+        file.write(b"XX" + bytes(30))
+    records = read_records(path)
+    assert [next(records) for _ in games]
+    with pytest.raises(InvalidRecordError):
+        next(records)
+
+
+def test_truncated_and_unknown_records():
+    data = GameRecord.from_game(play(2, 1)).to_bytes()
+    for end in [5, len(data) - 1]:
+        with pytest.raises(InvalidRecordError):
+            GameRecord.read(io.BytesIO(data[:end]))
+    with pytest.raises(InvalidRecordError):
+        GameRecord.read(io.BytesIO(data[:2] + bytes([99]) + data[3:]))
+    assert GameRecord.read(io.BytesIO(b"")) is None
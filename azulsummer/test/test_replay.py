@@ -0,0 +1,122 @@
+"""Tests for replaying recorded games"""
+
+import io
+from array import array
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from azulsummer.adapters.records import GameRecord
+from azulsummer.models.action_space import PASS_ACTION
+from azulsummer.models.game import Game
+from azulsummer.models.game_handler import GameHandler
+from azulsummer.models.replay import Replay
+from azulsummer.models.replay import ReplayDivergedError
+from azulsummer.models.replay import play_on
+from azulsummer.models.replay import verify_record
+from azulsummer.players.randomplayer import RandomPlayer
+
+
+class StateRecordingPlayer(RandomPlayer):
+    """Keeps the game's state at each of the game's decisions"""
+
+    def __init__(self, seed, states: list):
+        super().__init__(seed)
+        self.states = states
+
+    def _assess(self, action):
+        self.states.append(action.game.state._buffer.tobytes())
+        return super()._assess(action)
+
+
+def recorded_game(n_players: int, seed: int) -> tuple[Game, GameRecord, list]:
+    states = []
+    players = [StateRecordingPlayer(seed + n, states) for n in range(n_players)]
+    game = Game.new(players, seed)
+    game.random.draw_log = array("B")
+    GameHandler(game, headless=True).play()
+    return game, GameRecord.from_game(game), states
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+def test_seek_rebuilds_every_decision(n_players):
+    game, record, states = recorded_game(n_players, 11)
+    replay = Replay(record, snapshot_interval=4)
+    decisions = list(range(replay.n_decisions))
+    np.random.default_rng(11).shuffle(decisions)
+    for decision in decisions:
+        replayed = replay.seek(decision)
+        assert replayed.state._buffer.tobytes() == states[decision]
+        assert replayed.action_history == record.actions[:decision]
+        assert replayed.players == [None] * n_players
+
+    final = replay.seek(replay.n_decisions)
+    assert np.array_equal(final.state._buffer, game.state._buffer)
+    assert not final.action_queue
+
+
+def test_seek_replays_at_most_the_snapshot_interval():
+    _, record, _ = recorded_game(4, 3)
+    replay = Replay(record, snapshot_interval=3)
+    replay.seek(replay.n_decisions)
+    for decision in [13, 2, 7, 7, 0, 14, 12]:
+        before = replay.n_replayed
+        replay.seek(decision)
+        assert replay.n_replayed - before <= 3
+
+
+def test_seeked_games_are_independent():
+    _, record, states = recorded_game(3, 5)
+    replay = Replay(record, snapshot_interval=2)
+    game = replay.seek(4, [RandomPlayer(n + 1) for n in range(3)])
+    play_on(game)
+    assert not game.action_queue
+    assert len(game.action_history) > 4
+    assert replay.seek(4).state._buffer.tobytes() == states[4]
+    assert replay.seek(5).state._buffer.tobytes() == states[5]
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+def test_verify_record(n_players):
+    game, record, _ = recorded_game(n_players, 8)
+    assert record.draws
+    verified = verify_record(record, snapshot_interval=5)
+    assert np.array_equal(verified.state._buffer, game.state._buffer)
+
+    parsed = GameRecord.read(io.BytesIO(record.to_bytes()))
+    assert parsed.draws == record.draws
+    verify_record(parsed)
+
+
+def test_verify_finds_the_first_different_draw():
+    _, record, _ = recorded_game(3, 2)
+    draws = array("B", record.draws)
+    draws[14] += 1
+    tampered = replace(record, draws=draws)
+    with pytest.raises(ReplayDivergedError, match="Draw 2 before decision 0"):
+        verify_record(tampered)
+
+    extra = replace(record, draws=record.draws + array("B", [1, 0, 0, 0, 0, 0]))
+    with pytest.raises(ReplayDivergedError, match="drew 8 of the 9"):
+        verify_record(extra)
+
+    with pytest.raises(ValueError):
+        Replay(replace(record, draws=None), verify=True)
+
+
+def test_unavailable_and_missing_actions_diverge():
+    _, record, _ = recorded_game(2, 4)
+    actions = array("H", record.actions)
+    actions[3] = PASS_ACTION
+    replay = Replay(replace(record, actions=actions))
+    replay.seek(3)
+    with pytest.raises(ReplayDivergedError, match="decision 3"):
+        replay.seek(4)
+
+    longer = replace(record, actions=record.actions + array("H", [0]))
+    replay = Replay(longer)
+    with pytest.raises(ReplayDivergedError, match="ended"):
+        replay.seek(replay.n_decisions)
+    with pytest.raises(IndexError):
+        replay.seek(replay.n_decisions + 1)
@@ -0,0 +1,129 @@
+"""Tests for the small tile draw samplers"""
+
+import math
+from collections import Counter
+from itertools import product
+
+import numpy as np
+import pytest
+
+from azulsummer.models.random import RandomTileDraw
+from azulsummer.models.sampling import draw_small
+from azulsummer.models.sampling import draw_split
+
+N_SAMPLES = 20000
+
+
+def hypergeometric_pmf(counts, n) -> dict[tuple, float]:
+    """Exact multivariate hypergeometric probability of every outcome"""
+    total = math.comb(sum(counts), n)
+    return {
+        outcome: math.prod(math.comb(c, k) for c, k in zip(counts, outcome)) / total
+        for outcome in product(*(range(min(c, n) + 1) for c in counts))
+        if sum(outcome) == n
+    }
+
+
+def chi_square_critical_value(dof: int, z: float = 3.719) -> float:
+    """Upper chi-square quantile by the Wilson-Hilferty approximation.
+
+    The default z gives a significance level of 0.0001.
+    """
+    h = 2 / (9 * dof)
+    return dof * (1 - h + z * math.sqrt(h)) ** 3
+
+
+def assert_matches_pmf(samples: Counter, pmf: dict[tuple, float]) -> None:
+    """Chi-square goodness of fit, pooling outcomes expected less than 5 times"""
+    assert set(samples) <= set(pmf)
+    n = sum(samples.values())
+    statistic, dof = 0.0, -1
+    pooled_observed, pooled_expected = 0, 0.0
+    for outcome, p in pmf.items():
+        expected = n * p
+        if expected < 5:
+            pooled_observed += samples[outcome]
+            pooled_expected += expected
+            continue
+        statistic += (samples[outcome] - expected) ** 2 / expected
+        dof += 1
+    if pooled_expected:
+        statistic += (pooled_observed - pooled_expected) ** 2 / pooled_expected
+        dof += 1
+    if dof < 1:
+        # A single possible outcome, which the subset check covers
+        return
+    assert statistic < chi_square_critical_value(dof)
+
+
+@pytest.mark.parametrize(
+    "counts,n",
+    [
+        ([22, 22, 22, 22, 22, 22], 1),
+        ([22, 22, 22, 22, 22, 22], 4),
+        ([1, 0, 7, 2, 13, 4], 3),
+        ([0, 0, 2, 1, 0, 3], 4),
+        ([5, 0, 0, 0, 0, 0], 2),
+        ([3, 9, 1, 0, 6, 2], 10),
+    ],
+)
+def test_draw_small_matches_hypergeometric(counts, n):
+    random = RandomTileDraw(17)
+    samples = Counter(
+        tuple(random.random_tile_distribution(np.array(counts), n))
+        for _ in range(N_SAMPLES)
+    )
+    assert_matches_pmf(samples, hypergeometric_pmf(counts, n))
+
+
+def test_draw_small_matches_numpy():
+    """Chi-square test of homogeneity against numpy's sampler"""
+    counts = np.array([4, 8, 15, 16, 23, 42])
+    rng = np.random.default_rng(3)
+    random = RandomTileDraw(3)
+    ours = Counter(
+        tuple(random.random_tile_distribution(counts, 4)) for _ in range(N_SAMPLES)
+    )
+    theirs = Counter(
+        tuple(rng.multivariate_hypergeometric(counts, 4).tolist())
+        for _ in range(N_SAMPLES)
+    )
+    outcomes = [o for o in ours.keys() | theirs.keys() if ours[o] + theirs[o] >= 10]
+    statistic = sum(
+        (ours[o] - theirs[o]) ** 2 / (ours[o] + theirs[o]) for o in outcomes
+    )
+    assert statistic < chi_square_critical_value(len(outcomes) - 1)
+
+
+def test_draw_split_matches_consecutive_draws():
+    uniforms = RandomTileDraw(8).uniforms(36)
+    split_counts = [22, 22, 22, 22, 22, 22]
+    groups = draw_split(split_counts, [4] * 9, uniforms)
+
+    counts = [22, 22, 22, 22, 22, 22]
+    expected = [draw_small(counts, 4, uniforms[i * 4 :]) for i in range(9)]
+    assert groups == expected
+    assert split_counts == counts
+
+
+def test_draw_split_group_is_hypergeometric():
+    """The last display drawn is distributed like a single draw"""
+    random = RandomTileDraw(21)
+    counts = [2, 6, 1, 3, 0, 8]
+    samples = Counter(
+        tuple(draw_split(list(counts), [4, 4, 4], random.uniforms(12))[-1])
+        for _ in range(N_SAMPLES)
+    )
+    assert_matches_pmf(samples, hypergeometric_pmf(counts, 4))
+
+
+def test_draws_update_counts_in_place():
+    counts = [1, 2, 3, 0, 0, 0]
+    drawn = draw_small(counts, 6, [0.99] * 6)
+    assert drawn == [1, 2, 3, 0, 0, 0]
+    assert counts == [0, 0, 0, 0, 0, 0]
+
+
+def test_overdraw_raises():
+    with pytest.raises(ValueError):
+        draw_split([1, 1, 0, 0, 0, 0], [1, 2], [0.5] * 3)
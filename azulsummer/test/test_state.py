@@ -1,8 +1,46 @@
+import copy
+import pickle
+
+import numpy as np
 import pytest
 
+from azulsummer.models.arena import GameArena
+from azulsummer.models.board import BitBoard
+from azulsummer.models.enums import BoardBackend
+from azulsummer.models.enums import Phase
+from azulsummer.models.enums import StarColor
+from azulsummer.models.enums import WildTiles
 from azulsummer.models.state import State
 
 
+def play_some(state: State) -> State:
+    """Change every array of a state"""
+    state.tiles.move_tiles(
+        state.tiles.bag_index, state.tiles.supply_index, np.array([1, 0, 2, 0, 0, 1])
+    )
+    state.score.update(state.n_players - 1, 3)
+    state.boards[1].place_tile(StarColor.Blue, 2)
+    state.bonus_spaces[0].available[3] = 0
+    state.turn += 4
+    state.phase = Phase.acquire_tile
+    state.wild_tile = WildTiles.Red
+    state.current_player_index = 1
+    state.reset_active_players()
+    return state
+
+
+def assert_states_equal(state: State, other: State) -> None:
+    assert np.array_equal(state.tiles._tiles, other.tiles._tiles)
+    assert np.array_equal(state.score, other.score)
+    assert np.array_equal(state._counters, other._counters)
+    for board, other_board in zip(state.boards, other.boards):
+        assert type(board) is type(other_board)
+        assert np.array_equal(board.board, other_board.board)
+        assert np.array_equal(board.remaining, other_board.remaining)
+    for spaces, other_spaces in zip(state.bonus_spaces, other.bonus_spaces):
+        assert np.array_equal(spaces.available, other_spaces.available)
+
+
 @pytest.mark.parametrize("n_players", [2, 3, 4])
 def test_advance_round_method(n_players):
     """Test advancing the round with the State method."""
@@ -134,4 +172,108 @@ def test_play_tile_to_board_and_trigger_window_supply_draw():
 
 def test_purge_available_actions():
     # TODO
-    pass
\ No newline at end of file
+    pass
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+@pytest.mark.parametrize("board_backend", list(BoardBackend))
+def test_clone_matches_state(n_players, board_backend):
+    state = play_some(State.new(n_players, board_backend=board_backend))
+    clone = state.clone()
+    assert_states_equal(clone, state)
+    assert clone.phase is Phase.acquire_tile
+    assert clone.wild_tile is WildTiles.Red
+    assert clone.tiles.layout is state.tiles.layout
+    if board_backend is BoardBackend.bitboard:
+        assert [board.bits for board in clone.boards] == [
+            board.bits for board in state.boards
+        ]
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+def test_clone_is_independent(n_players):
+    state = State.new(n_players)
+    clone = state.clone()
+    play_some(clone)
+    assert_states_equal(state, State.new(n_players))
+    assert not np.shares_memory(clone._buffer, state._buffer)
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+def test_clone_of_arena_state(n_players):
+    arena = GameArena(n_players, capacity=1)
+    state = play_some(arena.state(arena.allocate()))
+    clone = state.clone()
+    assert_states_equal(clone, state)
+    clone.score.update(n_players - 1, 3)
+    clone.boards[0].place_tile(StarColor.Red, 1)
+    assert arena.scores[0, n_players - 1] == 8
+    assert not arena.boards[0, 0].any()
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+def test_new_state_is_one_buffer(n_players):
+    state = State.new(n_players)
+    _, nbytes = State.buffer_layout(n_players)
+    assert state._buffer.nbytes == nbytes
+    for array in [
+        state.tiles._tiles,
+        state.score,
+        state._counters,
+        *(board.board for board in state.boards),
+        *(spaces.available for spaces in state.bonus_spaces),
+    ]:
+        assert np.shares_memory(array, state._buffer)
+    arena_state = GameArena(n_players, capacity=1)
+    assert_states_equal(state, arena_state.state(arena_state.allocate()))
+
+
+def test_deepcopy_keeps_one_buffer():
+    state = play_some(State.new(3))
+    copied = copy.deepcopy(state)
+    assert_states_equal(copied, state)
+    assert np.shares_memory(copied.score, copied._buffer)
+    assert not np.shares_memory(copied._buffer, state._buffer)
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+@pytest.mark.parametrize("board_backend", list(BoardBackend))
+def test_bytes_round_trip(n_players, board_backend):
+    state = play_some(State.new(n_players, board_backend=board_backend))
+    data = state.to_bytes()
+    assert len(data) == 8 * (n_players + 2) + State.buffer_layout(n_players)[1]
+    for unpacked in [State.from_bytes(data), pickle.loads(pickle.dumps(state))]:
+        assert_states_equal(unpacked, state)
+        assert unpacked.board_backend is board_backend
+        assert unpacked.tiles.validation is state.tiles.validation
+        assert unpacked.hash_key == state.hash_key == unpacked.compute_hash_key()
+    assert len(pickle.dumps(state)) < len(data) + 100
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+def test_from_bytes_views_writable_buffers(n_players):
+    state = play_some(State.new(n_players))
+    data = bytearray(state.to_bytes())
+    unpacked = State.from_bytes(memoryview(data))
+    unpacked.score.update(0, 2)
+    assert State.from_bytes(data).score[0] == state.score[0] + 2
+
+    # Read-only bytes are copied
+    frozen = bytes(data)
+    unpacked = State.from_bytes(frozen)
+    unpacked.score.update(0, 2)
+    assert frozen == data
+
+
+def test_arena_state_packs_like_its_clone():
+    arena = GameArena(3, capacity=1)
+    state = play_some(arena.state(arena.allocate()))
+    assert state.to_bytes() == state.clone().to_bytes()
+
+
+def test_invalid_bytes_raise():
+    data = State.new(2).to_bytes()
+    for invalid in [data[:5], data[:-1], data + b"\0", b"XX" + data[2:]]:
+        with pytest.raises(ValueError):
+            State.from_bytes(invalid)
+    with pytest.raises(ValueError):
+        State.from_bytes(data[:2] + bytes([99]) + data[3:])
@@ -6,6 +6,13 @@ import pytest
 from azulsummer.models.enums import PLAYER_TO_DISPLAY_RATIO
 from azulsummer.models.enums import StarColor
 from azulsummer.models.enums import TileColor
+from azulsummer.models.enums import TileTarget
+from azulsummer.models.enums import TileValidation
+from azulsummer.models.game import Game
+from azulsummer.models.game_handler import GameHandler
+from azulsummer.models.logic.tiles import fill_factory_display
+from azulsummer.models.logic.tiles import fill_factory_displays
+from azulsummer.models.tile_layout import TILE_LAYOUTS
 from azulsummer.models.tiles import Tiles
 from azulsummer.models.tiles import _VALID_TILE_DISTRIBUTION
 
@@ -382,3 +389,188 @@ def test_discard_from_reserve_to_tower(n_players):
         # equal to the to_copy array
         assert t.view_player_reserve_n(player).sum() == 0
         assert np.array_equal(t.view_tower(), to_copy)
+
+
+@pytest.mark.parametrize("validation", list(TileValidation))
+def test_valid_moves_pass_every_validation_mode(validation):
+    t = Tiles.new(2, validation)
+    t.move_tiles(t.bag_index, t.supply_index, np.array([1, 2, 3, 4, 0, 0], "B"))
+    t.move_tiles(t.supply_index, t.player_reserve_index, t.view_supply())
+    t.play_tile(0, 3, TileColor.Blue, StarColor.Blue)
+    assert t.view_player_board_n(0)[2][TileColor.Blue] == 1
+    assert t.view_player_reserve_n(0).sum() == 9
+
+
+def test_delta_validation_rejects_move_before_mutating():
+    """Test that a delta-validated move exceeding the source leaves the tiles
+    unchanged."""
+    t = Tiles.new(2, TileValidation.delta)
+    before = t._tiles.copy()
+    with pytest.raises(ValueError):
+        t.move_tiles(t.supply_index, t.tower_index, np.array([1, 0, 0, 0, 0, 0], "B"))
+    assert np.array_equal(t._tiles, before)
+
+
+def test_delta_validation_rejects_playing_missing_tile():
+    t = Tiles.new(2, TileValidation.delta)
+    with pytest.raises(ValueError):
+        t.play_tile(0, 1, TileColor.Orange, StarColor.Orange)
+
+
+def test_off_validation_does_not_check_moves():
+    t = Tiles.new(2, TileValidation.off)
+    t.move_tiles(t.supply_index, t.tower_index, np.array([1, 0, 0, 0, 0, 0], "B"))
+    with pytest.raises(ValueError):
+        t._check_tile_integrity()
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+@pytest.mark.parametrize("seed", range(5))
+def test_delta_validation_catches_same_corruptions_as_full(n_players, seed):
+    """Fuzz random moves between random rows and check that delta validation
+    rejects exactly the moves that full validation rejects."""
+    rng = np.random.default_rng(seed)
+    full = Tiles.new(n_players, TileValidation.full)
+    delta = Tiles.new(n_players, TileValidation.delta)
+    n_rows = len(full._tiles)
+    for _ in range(500):
+        source, destination = rng.integers(n_rows, size=2)
+        available = full._tiles[source].astype(int)
+        # Mostly valid moves with the occasional move of one tile too many
+        tiles = rng.integers(0, available + 1)
+        if rng.random() < 0.1:
+            tiles[rng.integers(len(tiles))] += 1
+        tiles = tiles.astype("B")
+
+        full_error = delta_error = None
+        try:
+            full.move_tiles(source, destination, tiles)
+        except ValueError as e:
+            full_error = e
+        try:
+            delta.move_tiles(source, destination, tiles)
+        except ValueError as e:
+            delta_error = e
+
+        assert (full_error is None) == (delta_error is None)
+        if full_error is not None:
+            # Full validation corrupts the array before raising so restore it
+            full._tiles[:] = delta._tiles
+        assert np.array_equal(full._tiles, delta._tiles)
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+def test_games_are_identical_under_full_and_delta_validation(n_players):
+    from azulsummer.players.actiononeplayer import ActionOnePlayer
+
+    final_tiles = []
+    for validation in [TileValidation.full, TileValidation.delta]:
+        game = Game.new([ActionOnePlayer() for _ in range(n_players)], 1, validation)
+        GameHandler(game).play()
+        final_tiles.append(game.tiles._tiles)
+    assert np.array_equal(*final_tiles)
+
+
+@pytest.mark.parametrize(
+    "n_players,player_board_index,player_reserve_index",
+    [(2, 9, 23), (3, 11, 32), (4, 13, 41)],
+)
+def test_tile_layout_rows(n_players, player_board_index, player_reserve_index):
+    layout = TILE_LAYOUTS[n_players]
+    assert layout.player_board_index == player_board_index
+    assert layout.player_reserve_index == player_reserve_index
+    assert layout.n_rows == player_reserve_index + n_players
+    assert layout.row(TileTarget.Supply) == 3
+    assert layout.row(TileTarget.FactoryDisplay, 2) == 6
+    assert layout.row(TileTarget.PlayerBoard, 1) == player_board_index + 7
+    assert layout.row(TileTarget.PlayerReserve, 1) == player_reserve_index + 1
+    assert list(layout.player_board_rows) == [
+        player_board_index + 7 * p for p in range(n_players)
+    ]
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+def test_tile_layout_is_shared(n_players):
+    assert Tiles.new(n_players).layout is Tiles.new(n_players).layout
+    with pytest.raises(ValueError):
+        TILE_LAYOUTS[n_players].player_reserve_rows[0] = 0
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+def test_cached_views_track_tile_array(n_players):
+    """Test that the views cached at construction see in-place changes."""
+    t = Tiles.new(n_players)
+    t._tiles[t.player_reserve_index + n_players - 1] = 1
+    t._tiles[t.player_board_index + 7 * (n_players - 1) + StarColor.Wild] = 2
+    t._tiles[t.factory_display_index + 1] = 3
+    assert t.view_player_reserve_n(n_players - 1).sum() == 6
+    assert t.view_player_board_n(n_players - 1)[StarColor.Wild].sum() == 12
+    assert t.view_factory_display_n(1).sum() == 18
+
+
+def game_with_bag(n_players, bag, tower, seed=None) -> Game:
+    """Make a game holding only the given bag and tower tiles"""
+    game = Game.new([None] * n_players, seed)
+    game.make_state()
+    tiles = game.tiles
+    tiles.move_tiles(tiles.bag_index, tiles.supply_index, tiles.view_bag().copy())
+    tiles.move_tiles(tiles.supply_index, tiles.bag_index, np.array(bag))
+    tiles.move_tiles(tiles.supply_index, tiles.tower_index, np.array(tower))
+    return game
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+def test_fill_factory_displays_from_full_bag(n_players):
+    game = Game.new([None] * n_players, 3)
+    game.make_state()
+    fill_factory_displays(game)
+    assert (game.tiles.view_factory_displays().sum(axis=1) == 4).all()
+    assert game.bag_quantity == 132 - 4 * game.n_factory_displays
+    assert len(game.event_queue) == 1
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+def test_fill_factory_displays_refills_bag_from_tower(n_players):
+    game = game_with_bag(n_players, [2, 0, 3, 1, 0, 4], [5, 5, 5, 5, 5, 5], 4)
+    fill_factory_displays(game)
+    displays = game.tiles.view_factory_displays()
+    assert (displays.sum(axis=1) == 4).all()
+    assert game.tower_quantity == 0
+    assert game.bag_quantity == 40 - 4 * game.n_factory_displays
+    # The 10 bag tiles are dealt to the first 3 displays before any tower tile
+    assert (displays[:3].sum(axis=0) >= [2, 0, 3, 1, 0, 4]).all()
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+def test_fill_factory_displays_with_too_few_tiles(n_players):
+    game = game_with_bag(n_players, [1, 1, 1, 0, 0, 0], [0, 0, 0, 2, 2, 0])
+    fill_factory_displays(game)
+    assert game.tiles.view_factory_displays().sum(axis=1).tolist() == [
+        4,
+        3,
+        *[0] * (game.n_factory_displays - 2),
+    ]
+    assert game.bag_quantity == game.tower_quantity == 0
+
+
+def test_bulk_fill_matches_filling_displays_in_turn():
+    """Chi-square test of homogeneity for the display filled across the
+    bag to tower boundary"""
+    bag, tower = [3, 0, 2, 0, 1, 4], [1, 6, 2, 3, 0, 2]
+    outcomes = {}
+    for name in ["bulk", "in_turn"]:
+        counts = np.zeros(5, dtype=int)
+        for seed in range(3000):
+            game = game_with_bag(2, bag, tower, seed)
+            if name == "bulk":
+                fill_factory_displays(game)
+            else:
+                for nth in range(game.n_factory_displays):
+                    fill_factory_display(game, nth)
+            counts[game.tiles.view_factory_display_n(2)[TileColor.Red]] += 1
+        outcomes[name] = counts
+    observed = np.array([outcomes["bulk"], outcomes["in_turn"]])
+    observed = observed[:, observed.sum(axis=0) >= 10]
+    statistic = ((observed[0] - observed[1]) ** 2 / observed.sum(axis=0)).sum()
+    # 0.0001 upper quantile of chi-square with 4 degrees of freedom
+    assert statistic < 23.51
@@ -0,0 +1,108 @@
+"""Tests for the self-play tournament runner"""
+
+import csv
+from dataclasses import replace
+
+import pytest
+
+from azulsummer.adapters.records import read_records
+from azulsummer.models.replay import verify_record
+from azulsummer.players.mctsplayer import MCTSPlayer
+from azulsummer.players.randomplayer import RandomPlayer
+from azulsummer.tournament import GameResult
+from azulsummer.tournament import PlayerSpec
+from azulsummer.tournament import main
+from azulsummer.tournament import run_tournament
+from azulsummer.tournament import seat_specs
+from azulsummer.tournament import summarize
+
+SPECS = [PlayerSpec.parse("random"), PlayerSpec.parse("actionone")]
+
+
+def test_parse_player_specs():
+    spec = PlayerSpec.parse("mcts:iterations=50,exploration=1.0")
+    assert spec == PlayerSpec("mcts", (("iterations", 50), ("exploration", 1.0)))
+    assert str(spec) == "mcts:iterations=50,exploration=1.0"
+    assert PlayerSpec.parse(str(spec)) == spec
+
+    player = spec.build(3)
+    assert isinstance(player, MCTSPlayer)
+    assert (player.iterations, player.exploration) == (50, 1.0)
+    assert isinstance(PlayerSpec.parse("random").build(3), RandomPlayer)
+
+    for text in ["alphazero", "mcts:iterations", "mcts:iterations=fifty"]:
+        with pytest.raises(ValueError):
+            PlayerSpec.parse(text)
+
+
+def test_seats_rotate():
+    a, b, c = map(PlayerSpec, "abc")
+    assert seat_specs([a, b, c], 2, 0) == (a, b)
+    assert seat_specs([a, b, c], 2, 1) == (b, c)
+    assert seat_specs([a, b], 4, 1) == (b, a, b, a)
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+def test_results_do_not_depend_on_workers(n_players):
+    def play(n_workers, chunksize=None):
+        results = run_tournament(SPECS, n_players, 12, 7, n_workers, chunksize)
+        return [replace(result, seconds=0.0) for result in results]
+
+    serial = play(1)
+    assert [result.game for result in serial] == list(range(12))
+    assert serial == play(2) == play(3, chunksize=5)
+    assert serial == play(1)
+    other_seed = run_tournament(SPECS, n_players, 12, 8)
+    assert serial != [replace(result, seconds=0.0) for result in other_seed]
+    for result in serial:
+        assert len(result.scores) == len(result.seats) == n_players
+        assert result.moves >= result.turns > 0
+        assert result.record is None
+
+
+def test_records_verify():
+    results = list(run_tournament(SPECS, 3, 4, 2, record=True))
+    for result in results:
+        assert result.record.draws
+        verify_record(result.record)
+    unrecorded = run_tournament(SPECS, 3, 4, 2)
+    assert [replace(result, record=None) for result in results] == [
+        replace(result, seconds=results[result.game].seconds)
+        for result in unrecorded
+    ]
+
+
+def test_summary_splits_tied_wins():
+    results = [
+        GameResult(0, ("a", "b"), 0, (5, 3), 10, 12, 0.5),
+        GameResult(1, ("b", "a"), None, (4, 4), 10, 12, 0.5),
+    ]
+    summary = summarize(results, 2.0)
+    assert summary["games_per_second"] == 1.0
+    assert summary["moves_per_second"] == 12.0
+    assert summary["spec_win_rates"] == {"a": 0.75, "b": 0.25}
+    assert summary["seat_win_rates"] == {0: 0.75, 1: 0.25}
+
+
+def test_main_writes_a_row_per_game(tmp_path, capsys):
+    output, records = tmp_path / "results.csv", tmp_path / "records.bin"
+    main(
+        ["random", "actionone", "--players", "3", "--games", "6", "--seed", "1"]
+        + ["--workers", "2", "--output", str(output), "--records", str(records)]
+    )
+    with open(output, newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert [int(row["game"]) for row in rows] == list(range(6))
+    assert rows[0]["seats"] == "random|actionone|random"
+    assert all(len(row["scores"].split()) == 3 for row in rows)
+    recorded = list(read_records(records))
+    assert [record.players for record in recorded] == [
+        tuple(row["seats"].split("|")) for row in rows
+    ]
+    assert all(record.actions for record in recorded)
+    for record in recorded:
+        game = verify_record(record)
+        assert len(game.action_history) == len(record.actions)
+    printed = capsys.readouterr().out
+    assert "games/sec" in printed and "moves/sec" in printed
+    assert "random" in printed and "actionone" in printed
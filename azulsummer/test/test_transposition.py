@@ -0,0 +1,177 @@
+"""Tests for the transposition table used by search players"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from azulsummer.models.enums import ReplacementPolicy
+from azulsummer.players.transposition import BUCKET_SIZE
+from azulsummer.players.transposition import ENTRY_BYTES
+from azulsummer.players.transposition import NO_ACTION
+from azulsummer.players.transposition import ReadOnlyTableError
+from azulsummer.players.transposition import TableEntry
+from azulsummer.players.transposition import TranspositionTable
+from azulsummer.test.helpers import game_at_first_turn
+from azulsummer.test.helpers import random_line
+
+# Table inherited by the forked workers of test_forked_workers_share_the_table
+_SHARED_TABLE = None
+
+
+def _shared_lookup(key: int):
+    entry = _SHARED_TABLE.lookup(key)
+    return None if entry is None else (entry.value, entry.visits, entry.best_action)
+
+
+def _shared_store(key: int) -> None:
+    _SHARED_TABLE.store(key, 1.0, 1, 1)
+
+
+def same_bucket_keys(table: TranspositionTable, n: int) -> list[int]:
+    """Distinct keys all stored in the first bucket"""
+    n_buckets = table.capacity // BUCKET_SIZE
+    return [n_buckets * (i + 1) for i in range(n)]
+
+
+@pytest.mark.parametrize("max_bytes", [ENTRY_BYTES * BUCKET_SIZE, 1000, 2**20, 10**7])
+def test_memory_cap_is_never_exceeded(max_bytes):
+    table = TranspositionTable(max_bytes)
+    assert table.nbytes <= max_bytes
+    assert table.nbytes > max_bytes // 2
+    n_buckets = table.capacity // BUCKET_SIZE
+    assert n_buckets & (n_buckets - 1) == 0
+
+    with pytest.raises(ValueError):
+        TranspositionTable(ENTRY_BYTES * BUCKET_SIZE - 1)
+
+
+def test_store_and_lookup():
+    table = TranspositionTable(2**16)
+    assert table.lookup(12345) is None
+    assert table.store(12345, 0.5, 10, 3, 42)
+    assert table.lookup(12345) == TableEntry(12345, 0.5, 10, 3, 42)
+    assert table.lookup(12345 + table.capacity) is None
+    assert table.store(2**64 - 1, -1.25, 1, 0)
+    assert table.lookup(2**64 - 1) == TableEntry(2**64 - 1, -1.25, 1, 0, NO_ACTION)
+
+    # Storing the same key again updates its entry in place
+    table.store(12345, 0.75, 20, 1, 7)
+    assert table.lookup(12345) == TableEntry(12345, 0.75, 20, 1, 7)
+    assert len(table) == 2
+    assert table.counters == {"hits": 3, "misses": 2, "collisions": 0, "rejections": 0}
+    assert table.hit_rate == 0.6
+
+
+@pytest.mark.parametrize("policy", list(ReplacementPolicy))
+def test_a_bucket_holds_bucket_size_keys(policy):
+    table = TranspositionTable(2**12, policy)
+    keys = same_bucket_keys(table, BUCKET_SIZE)
+    for depth, key in enumerate(keys):
+        assert table.store(key, 0.0, 1, depth)
+    assert all(table.lookup(key) for key in keys)
+    assert table.collisions == 0
+    assert len(table) == BUCKET_SIZE
+
+
+def test_always_replace_spreads_over_the_bucket():
+    table = TranspositionTable(2**12, ReplacementPolicy.always)
+    keys = same_bucket_keys(table, BUCKET_SIZE)
+    for key in keys:
+        table.store(key, 0.0, 1, 10)
+    # Keys in the same bucket, each with high bits picking another slot
+    new_keys = [keys[0] + ((BUCKET_SIZE + slot) << 32) for slot in range(BUCKET_SIZE)]
+    for n, new in enumerate(new_keys, 1):
+        assert table.store(new, 0.0, 1, 0)
+        assert table.lookup(new) is not None
+        assert sum(table.lookup(key) is None for key in keys) == n
+    assert all(table.lookup(new) for new in new_keys)
+    assert table.collisions == BUCKET_SIZE and table.rejections == 0
+
+
+def test_depth_preferred_keeps_deeper_entries():
+    table = TranspositionTable(2**12, ReplacementPolicy.depth_preferred)
+    *keys, shallow, deep = same_bucket_keys(table, BUCKET_SIZE + 2)
+    for depth, key in zip([5, 2, 7, 3], keys):
+        table.store(key, 0.0, 1, depth)
+
+    assert not table.store(shallow, 0.0, 1, 1)
+    assert table.lookup(shallow) is None
+    assert table.store(deep, 0.0, 1, 2)
+    assert table.lookup(keys[1]) is None
+    assert all(table.lookup(key) for key in [keys[0], keys[2], keys[3], deep])
+    assert table.collisions == 2 and table.rejections == 1
+
+
+def test_two_tier_always_stores():
+    table = TranspositionTable(2**12, ReplacementPolicy.two_tier)
+    *keys, shallow, deep = same_bucket_keys(table, BUCKET_SIZE + 2)
+    for depth, key in zip([5, 2, 7, 3], keys):
+        table.store(key, 0.0, 1, depth)
+
+    # Too shallow for the depth preferred tier, so it takes the last slot
+    assert table.store(shallow, 0.0, 1, 1)
+    assert table.lookup(shallow) is not None
+    assert table.lookup(keys[3]) is None
+    # Deep enough for the depth preferred tier
+    assert table.store(deep, 0.0, 1, 4)
+    assert table.lookup(keys[1]) is None
+    assert all(table.lookup(key) for key in [keys[0], keys[2], shallow, deep])
+    assert table.rejections == 0
+
+
+def test_clear_and_freeze():
+    table = TranspositionTable(2**12)
+    table.store(99, 1.0, 1, 1)
+    table.lookup(99)
+    table.clear()
+    assert len(table) == 0 and table.lookup(99) is None
+    assert table.counters["hits"] == 0
+
+    table.store(99, 1.0, 1, 1)
+    table.freeze()
+    assert table.read_only
+    assert table.lookup(99).value == 1.0
+    with pytest.raises(ReadOnlyTableError):
+        table.store(100, 1.0, 1, 1)
+    with pytest.raises(ReadOnlyTableError):
+        table.clear()
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+def test_stores_search_results_by_state_key(n_players):
+    game = game_at_first_turn(n_players, 2)
+    table = TranspositionTable(2**20)
+    results = {}
+    for ply, action in enumerate(random_line(game, np.random.default_rng(2))):
+        results[game.hash_key] = (float(ply), action)
+        table.store(game.hash_key, float(ply), 1, ply % 8, action)
+        game.apply(action)
+    for key, (value, action) in results.items():
+        entry = table.lookup(key)
+        assert (entry.value, entry.best_action) == (value, action)
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="needs fork"
+)
+def test_forked_workers_share_the_table():
+    global _SHARED_TABLE
+    table = TranspositionTable(2**16)
+    keys = list(range(1, 200, 7))
+    for key in keys:
+        table.store(key, key / 2, key, 1, key % 100)
+    table.freeze()
+    _SHARED_TABLE = table
+    try:
+        context = multiprocessing.get_context("fork")
+        with ProcessPoolExecutor(2, mp_context=context) as pool:
+            found = list(pool.map(_shared_lookup, keys + [2]))
+            with pytest.raises(ReadOnlyTableError):
+                pool.submit(_shared_store, 3).result()
+    finally:
+        _SHARED_TABLE = None
+    assert found == [(key / 2, key, key % 100) for key in keys] + [None]
+    # Lookups in the workers are counted by the workers
+    assert table.hits == 0
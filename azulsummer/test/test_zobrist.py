@@ -0,0 +1,161 @@
+"""Tests for the incremental Zobrist hash of a State"""
+
+import numpy as np
+import pytest
+
+from azulsummer.models.arena import GameArena
+from azulsummer.models.enums import BoardBackend
+from azulsummer.models.enums import StarColor
+from azulsummer.models.enums import TileColor
+from azulsummer.models.enums import TileIndex
+from azulsummer.models.enums import TileValidation
+from azulsummer.models.game import Game
+from azulsummer.models.game_handler import GameHandler
+from azulsummer.models.state import State
+from azulsummer.models.zobrist import tiles_key
+from azulsummer.players.actiononeplayer import ActionOnePlayer
+from azulsummer.test.helpers import game_at_first_turn
+from azulsummer.test.helpers import random_line
+
+
+def _checking(handler, game: Game, keys: list):
+    def check(action):
+        handler(action)
+        if game.state is None:
+            return
+        assert game.hash_key == game.state.compute_hash_key()
+        keys.append(game.hash_key)
+
+    return check
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+@pytest.mark.parametrize("board_backend", list(BoardBackend))
+@pytest.mark.parametrize("validation", list(TileValidation))
+def test_key_matches_recomputation_after_every_action(
+    n_players, board_backend, validation
+):
+    game = Game.new(
+        [ActionOnePlayer() for _ in range(n_players)],
+        n_players,
+        validation=validation,
+        board_backend=board_backend,
+    )
+    handler = GameHandler(game, headless=True)
+    keys = []
+    handler.action_handlers = {
+        action_type: _checking(action_handler, game, keys)
+        for action_type, action_handler in handler.action_handlers.items()
+    }
+    handler.play()
+    assert len(set(keys)) > 1
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+@pytest.mark.parametrize("board_backend", list(BoardBackend))
+def test_key_follows_apply_and_undo(n_players, board_backend):
+    for seed in range(3):
+        game = game_at_first_turn(n_players, seed, board_backend)
+        rng = np.random.default_rng(seed)
+        tokens, keys = [], []
+        for action in random_line(game, rng):
+            keys.append(game.hash_key)
+            tokens.append(game.apply(action))
+            assert game.hash_key == game.state.compute_hash_key()
+        for token, key in zip(reversed(tokens), reversed(keys)):
+            game.undo(token)
+            assert game.hash_key == key == game.state.compute_hash_key()
+
+
+def test_transposed_moves_share_a_key():
+    """Two different move orders reaching the same State hash the same"""
+    state, other = State.new(3), State.new(3)
+    bag, supply, tower = TileIndex.Bag, TileIndex.Supply, TileIndex.Tower
+    state.tiles.move_tiles(bag, supply, np.array([2, 0, 1, 0, 0, 0]))
+    state.tiles.move_tiles(supply, tower, np.array([1, 0, 0, 0, 0, 0]))
+    state.boards[2].place_tile(StarColor.Red, 4)
+    state.boards[2].place_tile(StarColor.Wild, 1)
+
+    other.boards[2].place_tile(StarColor.Wild, 1)
+    other.tiles.move_tiles(bag, tower, np.array([1, 0, 0, 0, 0, 0]))
+    other.boards[2].place_tile(StarColor.Red, 4)
+    other.tiles.move_tiles(bag, supply, np.array([1, 0, 1, 0, 0, 0]))
+    assert state.hash_key == other.hash_key == other.compute_hash_key()
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+def test_every_feature_changes_the_key(n_players):
+    state = State.new(n_players)
+    seen = {state.hash_key}
+
+    state.tiles.move_tiles(
+        state.tiles.bag_index, state.tiles.supply_index, np.array([0, 1, 0, 0, 0, 0])
+    )
+    seen.add(state.hash_key)
+    state.boards[n_players - 1].place_tile(StarColor.Orange, 6)
+    seen.add(state.hash_key)
+    state.wild_tile = TileColor.Purple
+    seen.add(state.hash_key)
+    state.phase = 0
+    seen.add(state.hash_key)
+    state.current_player_index = 0
+    seen.add(state.hash_key)
+    state.start_player_index = 0
+    seen.add(state.hash_key)
+    state.reset_active_players()
+    seen.add(state.hash_key)
+    state.active_players[0] = 0
+    seen.add(state.hash_key)
+    assert len(seen) == 9
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+def test_boards_of_different_players_hash_differently(n_players):
+    state, other = State.new(n_players), State.new(n_players)
+    state.boards[0].place_tile(StarColor.Orange, 6)
+    other.boards[n_players - 1].place_tile(StarColor.Orange, 6)
+    assert state.hash_key != other.hash_key
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+def test_moving_tiles_back_restores_the_key(n_players):
+    state = State.new(n_players)
+    key = state.hash_key
+    tiles = state.tiles
+    moved = np.array([3, 1, 0, 0, 2, 0])
+    tiles.move_tiles(tiles.bag_index, tiles.tower_index, moved)
+    assert state.hash_key != key
+    tiles.move_tiles(tiles.tower_index, tiles.bag_index, moved)
+    assert state.hash_key == key
+    tiles.move_tiles(tiles.bag_index, tiles.bag_index, moved)
+    assert state.hash_key == key
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+def test_copies_share_the_key(n_players):
+    game = Game.new([ActionOnePlayer() for _ in range(n_players)], 7)
+    GameHandler(game, headless=True).play()
+    assert game.state.clone().hash_key == game.hash_key
+    assert game.fork().hash_key == game.hash_key
+
+    arena = GameArena(n_players, 2)
+    handle = arena.allocate()
+    tiles = arena.state(handle).tiles
+    tiles.move_tiles(tiles.bag_index, tiles.supply_index, np.ones(6, "B"))
+    assert arena.state(handle).hash_key == arena.state(handle).compute_hash_key()
+
+
+def test_rehash_after_direct_writes():
+    state = State.new(2)
+    state.tiles._tiles[state.tiles.tower_index, TileColor.Red] = 4
+    state.tiles._tiles[state.tiles.bag_index, TileColor.Red] -= 4
+    state.boards[1].board[StarColor.Blue, 0] = 1
+    assert state.hash_key != state.compute_hash_key()
+    assert state.rehash() == state.compute_hash_key()
+
+
+def test_new_states_hash_alike():
+    """Keys are drawn from a fixed seed"""
+    state = State.new(2)
+    assert state.tiles.key == tiles_key(state.tiles._tiles)
+    assert state.hash_key == State.new(2).hash_key
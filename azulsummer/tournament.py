@@ -0,0 +1,349 @@
+"""Self-play tournament runner.
+
+Plays n games between players given by spec, fanning the games out over a
+process pool, and streams one line per game to a CSV results file before
+printing the throughput and win rates.  With --records the game records,
+see adapters.records, are appended to a binary file as well.  The records
+include the tile draws, so models.replay.verify_record() can check a replay
+of any recorded game.
+
+    python -m azulsummer.tournament random actionone [--players P]
+        [--games N] [--seed S] [--workers W] [--chunksize C] [--output PATH]
+        [--records PATH]
+
+A player spec is a name from PLAYER_TYPES followed by optional keyword
+arguments, e.g. mcts:iterations=50,exploration=1.0.  With fewer specs than
+players the specs are repeated, and the seats rotate by one spec each game
+so every spec plays from every seat.
+
+Every game and seeded player draws from a seed spawned from the master seed
+by game number, so a tournament gives the same games for a given seed no
+matter how many workers play it.
+"""
+from __future__ import annotations
+
+import argparse
+import ast
+import csv
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Iterator
+from typing import Optional
+from typing import Sequence
+
+import numpy as np
+
+from azulsummer.adapters.records import GameRecord
+from azulsummer.adapters.records import GameRecordWriter
+from azulsummer.models import actions
+from azulsummer.models.game import Game
+from azulsummer.models.game_handler import GameHandler
+from azulsummer.models.random import Seed
+from azulsummer.models.random import game_seeds
+from azulsummer.players.actiononeplayer import ActionOnePlayer
+from azulsummer.players.mctsplayer import MCTSPlayer
+from azulsummer.players.player import Player
+from azulsummer.players.randomplayer import RandomPlayer
+
+PLAYER_TYPES: dict[str, type[Player]] = {
+    "actionone": ActionOnePlayer,
+    "random": RandomPlayer,
+    "mcts": MCTSPlayer,
+}
+# Player types taking a seed keyword, seeded from the game's seed
+SEEDED_PLAYER_TYPES: frozenset[type[Player]] = frozenset({RandomPlayer, MCTSPlayer})
+
+RESULT_FIELDS: tuple[str, ...] = (
+    "game",
+    "seats",
+    "winner",
+    "scores",
+    "turns",
+    "moves",
+    "seconds",
+)
+
+# Actions asking the current player for a decision, counted as moves
+_MOVE_ACTIONS: tuple[type, ...] = (actions.PlayPhaseOneTurn, actions.PlayPhaseTwoTurn)
+
+
+@dataclass(frozen=True)
+class PlayerSpec:
+    """A player type and the keyword arguments it is created with"""
+
+    name: str
+    kwargs: tuple[tuple[str, object], ...] = ()
+
+    @classmethod
+    def parse(cls, text: str) -> PlayerSpec:
+        """Parse a name[:key=value,...] spec.
+
+        Raises:
+            ValueError if the name is not in PLAYER_TYPES or an argument is
+            not a key=literal pair
+        """
+        name, _, arguments = text.partition(":")
+        if name not in PLAYER_TYPES:
+            raise ValueError(
+                f"{name} is not a player type.  Choose from {', '.join(PLAYER_TYPES)}."
+            )
+        kwargs = []
+        for argument in filter(None, arguments.split(",")):
+            key, equals, value = argument.partition("=")
+            if not equals:
+                raise ValueError(f"{argument} is not a key=value argument.")
+            try:
+                kwargs.append((key.strip(), ast.literal_eval(value.strip())))
+            except (ValueError, SyntaxError):
+                raise ValueError(f"{value} is not a literal value.") from None
+        return cls(name, tuple(kwargs))
+
+    def __str__(self):
+        arguments = ",".join(f"{key}={value!r}" for key, value in self.kwargs)
+        return f"{self.name}:{arguments}" if arguments else self.name
+
+    def build(self, seed: Optional[Seed] = None) -> Player:
+        """Create the player, seeded with seed if its type takes a seed"""
+        player_type = PLAYER_TYPES[self.name]
+        kwargs = dict(self.kwargs)
+        if player_type in SEEDED_PLAYER_TYPES:
+            kwargs.setdefault("seed", seed)
+        return player_type(**kwargs)
+
+
+@dataclass(frozen=True)
+class GameResult:
+    """The outcome of one tournament game"""
+
+    game: int
+    # The spec of the player in each seat
+    seats: tuple[str, ...]
+    # Seat with the highest score, None when several seats share it
+    winner: Optional[int]
+    scores: tuple[int, ...]
+    turns: int
+    moves: int
+    seconds: float
+    record: Optional[GameRecord] = None
+
+    def to_row(self) -> dict[str, object]:
+        """Get the result as a RESULT_FIELDS row of the results file"""
+        return {
+            "game": self.game,
+            "seats": "|".join(self.seats),
+            "winner": "" if self.winner is None else self.winner,
+            "scores": " ".join(map(str, self.scores)),
+            "turns": self.turns,
+            "moves": self.moves,
+            "seconds": f"{self.seconds:.6f}",
+        }
+
+    def shares(self) -> list[float]:
+        """Get each seat's share of the win, split evenly between ties"""
+        best = max(self.scores)
+        n_best = self.scores.count(best)
+        return [1 / n_best if score == best else 0.0 for score in self.scores]
+
+
+def seat_specs(
+    specs: Sequence[PlayerSpec], n_players: int, game: int
+) -> tuple[PlayerSpec, ...]:
+    """Get the spec seated in each seat for a game"""
+    return tuple(specs[(game + seat) % len(specs)] for seat in range(n_players))
+
+
+def _counting(handler, counts: list[int]):
+    def count(action):
+        counts[0] += 1
+        handler(action)
+
+    return count
+
+
+def play_game(
+    game_n: int,
+    seed: np.random.SeedSequence,
+    seats: tuple[PlayerSpec, ...],
+    record: bool = False,
+) -> GameResult:
+    """Play one headless tournament game.
+
+    Args:
+        game_n:  The game number in the tournament
+        seed:  The game's seed.  The game and each player are seeded from a
+            child of it.
+        seats:  The spec of the player in each seat
+        record:  Record the game, its tile draws included, in the result's
+            record.  The record is None otherwise.
+
+    Returns:
+        The GameResult
+    """
+    start = time.perf_counter()
+    game_seed, *player_seeds = seed.spawn(len(seats) + 1)
+    players = [spec.build(child) for spec, child in zip(seats, player_seeds)]
+    game = Game.new(players, game_seed)
+    if record:
+        game.random.draw_log = array("B")
+    handler = GameHandler(game, headless=True)
+    moves = [0]
+    handler.action_handlers = {
+        **handler.action_handlers,
+        **{
+            action_type: _counting(handler.action_handlers[action_type], moves)
+            for action_type in _MOVE_ACTIONS
+        },
+    }
+    try:
+        handler.play()
+    finally:
+        for player in players:
+            if isinstance(player, MCTSPlayer):
+                player.close()
+    scores = tuple(game.score.tolist())
+    best = max(scores)
+    return GameResult(
+        game=game_n,
+        seats=tuple(str(spec) for spec in seats),
+        winner=scores.index(best) if scores.count(best) == 1 else None,
+        scores=scores,
+        turns=game.turn,
+        moves=moves[0],
+        seconds=time.perf_counter() - start,
+        record=(
+            GameRecord.from_game(game, [str(spec) for spec in seats])
+            if record
+            else None
+        ),
+    )
+
+
+def _play_game_task(task: tuple) -> GameResult:
+    return play_game(*task)
+
+
+def run_tournament(
+    specs: Sequence[PlayerSpec],
+    n_players: int,
+    n_games: int,
+    seed: Optional[Seed] = None,
+    n_workers: int = 1,
+    chunksize: Optional[int] = None,
+    record: bool = False,
+) -> Iterator[GameResult]:
+    """Play the games of a tournament.
+
+    Args:
+        specs:  The player specs, seated in rotation, see seat_specs()
+        n_players:  The number of players per game
+        n_games:  The number of games
+        seed:  The master int seed or SeedSequence
+        n_workers:  The number of processes playing games.  1 plays the
+            games in this process.
+        chunksize:  The number of games sent to a worker at a time.  None
+            gives each worker about 4 chunks.
+        record:  Record each game, see play_game()
+
+    Yields:
+        The GameResult of each game, in game order
+    """
+    tasks = (
+        (game_n, game_seed, seat_specs(specs, n_players, game_n), record)
+        for game_n, game_seed in enumerate(game_seeds(seed, n_games))
+    )
+    if n_workers == 1:
+        yield from map(_play_game_task, tasks)
+        return
+    if chunksize is None:
+        chunksize = max(1, n_games // (n_workers * 4))
+    with ProcessPoolExecutor(n_workers) as pool:
+        yield from pool.map(_play_game_task, tasks, chunksize=chunksize)
+
+
+def summarize(results: Sequence[GameResult], seconds: float) -> dict[str, object]:
+    """Aggregate the throughput and win rates of a tournament.
+
+    Returns:
+        Dict of games, moves, games_per_second, moves_per_second and the
+        win_rates of each spec and seat
+    """
+    moves = sum(result.moves for result in results)
+    spec_wins: dict[str, float] = {}
+    spec_games: dict[str, int] = {}
+    seat_wins: dict[int, float] = {}
+    for result in results:
+        for seat, (spec, share) in enumerate(zip(result.seats, result.shares())):
+            spec_wins[spec] = spec_wins.get(spec, 0.0) + share
+            spec_games[spec] = spec_games.get(spec, 0) + 1
+            seat_wins[seat] = seat_wins.get(seat, 0.0) + share
+    return {
+        "games": len(results),
+        "moves": moves,
+        "games_per_second": len(results) / seconds if seconds else 0.0,
+        "moves_per_second": moves / seconds if seconds else 0.0,
+        "spec_win_rates": {
+            spec: wins / spec_games[spec] for spec, wins in spec_wins.items()
+        },
+        "seat_win_rates": {
+            seat: wins / len(results) for seat, wins in seat_wins.items()
+        },
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "specs", nargs="+", type=PlayerSpec.parse, metavar="SPEC", help="player specs"
+    )
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--chunksize", type=int, default=None)
+    parser.add_argument("--output", default="tournament.csv")
+    parser.add_argument("--records", default=None)
+    args = parser.parse_args(argv)
+
+    results = []
+    start = time.perf_counter()
+    with open(args.output, "w", newline="") as file, (
+        nullcontext() if args.records is None else GameRecordWriter(args.records)
+    ) as records:
+        writer = csv.DictWriter(file, RESULT_FIELDS)
+        writer.writeheader()
+        for result in run_tournament(
+            args.specs,
+            args.players,
+            args.games,
+            args.seed,
+            args.workers,
+            args.chunksize,
+            record=records is not None,
+        ):
+            writer.writerow(result.to_row())
+            if records is not None:
+                records.write(result.record)
+            results.append(result)
+    elapsed = time.perf_counter() - start
+    summary = summarize(results, elapsed)
+
+    print(
+        f"{summary['games']:,} games, {summary['moves']:,} moves in"
+        f" {elapsed:.2f}s:"
+        f" {summary['games_per_second']:,.1f} games/sec,"
+        f" {summary['moves_per_second']:,.0f} moves/sec"
+    )
+    for spec, rate in summary["spec_win_rates"].items():
+        print(f"{spec:>24}: {rate:6.1%} wins")
+    for seat, rate in summary["seat_win_rates"].items():
+        print(f"{'seat ' + str(seat):>24}: {rate:6.1%} wins")
+    print(f"results written to {args.output}")
+    if records is not None:
+        print(f"{records.n_records:,} records appended to {args.records}")
+
+
+if __name__ == "__main__":
+    main()